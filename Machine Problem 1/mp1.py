@@ -1,6 +1,8 @@
 import random
 import time
 
+from eventsim import EventKernel
+
 # Initialize resources and users
 num_resources = random.randint(1, 5)
 print(f"Random Resources: {num_resources}")
@@ -23,60 +25,58 @@ user_resource_time = {
 print(f"{user_resource_time}")
 
 # Initialize tracking dictionaries
-resource_status = {resource: [] for resource in resources}  # Active users on resource
+resource_status = {resource: [] for resource in resources}  # Active users on resource (user, finish time)
 resource_waiting = {resource: [] for resource in resources}  # Waiting queue
+freed_resources = set()  # Resources that had a user finish at the current instant
+
+kernel = EventKernel()
+
+
+def finish_use(resource, user):
+    print(f"✅ {user} finished using {resource}")
+    resource_status[resource] = [info for info in resource_status[resource] if info[0] != user]
+    freed_resources.add(resource)
+
+
+def start_use(resource, user, usage_time, start_time):
+    # A user holding a slot at the end of tick t with time_left T finishes at tick t + T
+    resource_status[resource].append((user, start_time + usage_time))
+    kernel.schedule(start_time + usage_time, finish_use, resource, user)
+
 
-# Populate initial resource status
+# Populate initial resource status (these users already hold a slot before time 0)
 for user, assigned_resources in user_resource_time.items():
     for resource, time_left in assigned_resources:
         if len(resource_status[resource]) < 3:  # Limit 2 users per resource
-            resource_status[resource].append((user, time_left))
+            start_use(resource, user, time_left, -1)
         else:
             resource_waiting[resource].append((user, time_left))
 
-# Simulation loop
-current_time = 0
-while any(resource_status.values()) or any(resource_waiting.values()):  # Run until all resources are free
-    print(f"\n⏳ Time: {current_time} sec")
 
-    # Decrement time for users currently using resources
-    for resource, users_info in list(resource_status.items()):
-        new_users_info = []
-        for user, time_left in users_info:
-            if time_left > 1:
-                new_users_info.append((user, time_left - 1))
-            else:
-                print(f"✅ {user} finished using {resource}")
-        
-        resource_status[resource] = new_users_info  # Update resource status
+def show_status(current_time):
+    print(f"\n⏳ Time: {current_time} sec")
 
     # Move waiting users to active users if space is available
-    for resource, waiting_list in list(resource_waiting.items()):
-        ongoing_users = sorted(resource_status[resource], key=lambda x: x[1])  # Sort by time left
-
+    for resource in sorted(freed_resources, key=resources.index):
+        waiting_list = resource_waiting[resource]
         while len(resource_status[resource]) < 3 and waiting_list:
             next_user, usage_time = waiting_list.pop(0)
-            if ongoing_users:   # Earliest free slot
-              available_in = ongoing_users[0][1]  # Get the time of the first user
-            else:
-              available_in = 0  # If no users, set to 0
-
             print(f"➡️ {next_user} starts using {resource} in {usage_time} sec")
-            
+
             # Add new user to the resource
-            resource_status[resource].append((next_user, usage_time))
-            # resource_status[resource].append((next_user, usage_time))
+            start_use(resource, next_user, usage_time, current_time)
 
             # Keep the list sorted
             resource_status[resource].sort(key=lambda x: x[1])
+    freed_resources.clear()
 
     # Display resource status
     print("\n📌 Resource Status:")
     for resource, users_info in resource_status.items():
         if users_info:
             print(f"{resource}:")
-            for user, time_left in users_info:
-                print(f"  - Used by {user}, Time Left: {time_left} sec")
+            for user, finish_time in users_info:
+                print(f"  - Used by {user}, Time Left: {finish_time - current_time} sec")
 
     # Display waiting users
     print("\n⏳ Users in Waiting:")
@@ -85,7 +85,8 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
             print(f"{resource}:")
 
             # Get a sorted list of ongoing users based on their remaining time
-            ongoing_users = sorted(resource_status[resource], key=lambda x: x[1])  # Sort by time left
+            ongoing_users = [(user, finish_time - current_time) for user, finish_time in resource_status[resource]]
+            ongoing_users.sort(key=lambda x: x[1])  # Sort by time left
             available_in = 0  # When the first waiting user will start
 
             # Process waiting users in order
@@ -98,7 +99,6 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
 
                 # Add this user to the active list with their new time
                 ongoing_users.append((user, available_in + usage_time))
-                # ongoing_users.append((user, usage_time))
 
                 # Keep the ongoing list sorted for the next iteration
                 ongoing_users.sort(key=lambda x: x[1])  # Sort by new finish time
@@ -107,7 +107,7 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
     # Calculate when resources will be free
     resource_free_time = {}
     for resource, users_info in resource_status.items():
-        max_ongoing_time = max((time_left for _, time_left in users_info), default=0)
+        max_ongoing_time = max((finish_time - current_time for _, finish_time in users_info), default=0)
         max_waiting_time = max((wait_time for _, wait_time in resource_waiting.get(resource, [])), default=0)
         resource_free_time[resource] = max_ongoing_time + max_waiting_time
 
@@ -118,6 +118,11 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
 
     # Pause for realism
     time.sleep(1)
-    current_time += 1
+
+
+# Simulation: jump from one finish event to the next instead of ticking every second
+kernel.schedule(0, lambda: None)  # Show the starting state at time 0
+kernel.run(after_instant=show_status)
 
 print("\n🎉 All resources are now free!")
+print(f"Simulation kernel: {kernel.report()}")
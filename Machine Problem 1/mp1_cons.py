@@ -3,6 +3,8 @@ import time
 import colorama
 from colorama import Fore, Back, Style
 
+from eventsim import EventKernel
+
 colorama.init(autoreset=True)
 
 # Initialize resources and users
@@ -27,7 +29,7 @@ for user, requests in user_resource_time.items():
     print(f"{user}: {requests}")
 
 # Initialize tracking dictionaries
-resource_status = {resource: None for resource in resources}  # Active user on resource (user, time_left)
+resource_status = {resource: None for resource in resources}  # Active user on resource (user, finish_time)
 resource_waiting = {resource: [] for resource in resources}  # Waiting queue for each resource
 user_status = {user: None for user in users}  # Track which resource a user is currently using
 
@@ -36,43 +38,40 @@ for user, requests in user_resource_time.items():
     for resource, time_needed in requests:
         resource_waiting[resource].append((user, time_needed))
 
-# Simulation loop
-current_time = 0
-print(f"{Fore.RED}----------------------------------------------------------------------------------------------")
-while any(resource_status.values()) or any(resource_waiting.values()):  # Run until all resources are free
+kernel = EventKernel()
+
+
+def finish_use(resource, user):
+    print(f"✅ {user} finished using {resource}")
+    resource_status[resource] = None
+    user_status[user] = None  # User is no longer using any resource
+
+
+def show_status(current_time):
     print(f"{Fore.RED}----------------------------------------------------------------------------------------------")
     print(f"{Fore.WHITE}\n🕓 Time: {current_time} sec")
 
-    # Step 1: Decrement time for users currently using resources
-    for resource, user_info in list(resource_status.items()):
-        if user_info:
-            user, time_left = user_info
-            if time_left > 1:
-                resource_status[resource] = (user, time_left - 1)
-            else:
-                print(f"✅ {user} finished using {resource}")
-                resource_status[resource] = None
-                user_status[user] = None  # User is no longer using any resource
+    # Step 1: Users whose time ran out were released by their finish events
 
     # Step 2: Move waiting users to active users if space is available
-    for user in users: 
-        for resource, waiting_list in list(resource_waiting.items()):
-            if not resource_status[resource] and waiting_list:
-                # Find the next user in the waiting list who is not currently using any resource
-                for i, (next_user, usage_time) in enumerate(waiting_list):
-                    if user_status[next_user] is None:  # User is not using any resource
-                        waiting_list.pop(i)  # Remove the user from the waiting list
-                        print(f"➡️ {next_user} starts using {resource} for {usage_time} sec")
-                        resource_status[resource] = (next_user, usage_time)
-                        user_status[next_user] = resource  # Mark the user as using this resource
-                        break
+    for resource, waiting_list in resource_waiting.items():
+        if not resource_status[resource] and waiting_list:
+            # Find the next user in the waiting list who is not currently using any resource
+            for i, (next_user, usage_time) in enumerate(waiting_list):
+                if user_status[next_user] is None:  # User is not using any resource
+                    waiting_list.pop(i)  # Remove the user from the waiting list
+                    print(f"➡️ {next_user} starts using {resource} for {usage_time} sec")
+                    resource_status[resource] = (next_user, current_time + usage_time)
+                    user_status[next_user] = resource  # Mark the user as using this resource
+                    kernel.schedule(current_time + usage_time, finish_use, resource, next_user)
+                    break
 
     # Display resource status
     print(f"{Fore.BLUE}\n📌 Resource Status:{Back.RESET}")
     for resource, user_info in resource_status.items():
         if user_info:
-            user, time_left = user_info
-            print(f"{resource}: Used by {user}, Time Left: {time_left} sec")
+            user, finish_time = user_info
+            print(f"{resource}: Used by {user}, Time Left: {finish_time - current_time} sec")
         else:
             print(f"{resource}: Free")
 
@@ -84,7 +83,7 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
             for user, usage_time in waiting_list:
                 # Calculate when the user will start using the resource
                 if resource_status[resource]:
-                    start_time = resource_status[resource][1]  # Time left for the current user
+                    start_time = resource_status[resource][1] - current_time  # Time left for the current user
                 else:
                     start_time = 0  # Resource is free
                 print(f"- {user} is waiting, will start in {start_time} sec")
@@ -94,7 +93,7 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
     for resource, user_info in resource_status.items():
         if user_info:
             # Time left for the current user
-            time_left = user_info[1]
+            time_left = user_info[1] - current_time
             # Sum of usage times for all waiting users
             waiting_time = sum(time for _, time in resource_waiting[resource])
             # Total time until the resource is free
@@ -114,6 +113,12 @@ while any(resource_status.values()) or any(resource_waiting.values()):  # Run un
 
     # Pause for realism
     time.sleep(1)
-    current_time += 1
+
+
+# Simulation: jump from one finish event to the next instead of ticking every second
+print(f"{Fore.RED}----------------------------------------------------------------------------------------------")
+kernel.schedule(0, lambda: None)  # First assignments happen at time 0
+kernel.run(after_instant=show_status)
 
 print("\n🎉 All resources are now free!")
+print(f"Simulation kernel: {kernel.report()}")
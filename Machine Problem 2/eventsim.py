@@ -0,0 +1 @@
+../eventsim.py
\ No newline at end of file
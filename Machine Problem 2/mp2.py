@@ -1,7 +1,13 @@
 import csv
+import gzip
+import heapq
+import json
 import os
+import pickle
 import sys
+import time
 from collections import deque
+from itertools import islice
 from tabulate import tabulate
 from colorama import init, Fore, Style
 
@@ -36,12 +42,19 @@ class Process:
 
 
 class Scheduler:
+    RESULT_HEADERS = ["Process", "Arrival", "Burst", "Priority", "Waiting Time", "Turnaround Time"]
+
     def __init__(self):
         self.processes = []
         self.timeline = []
         self.current_time = 0
         self.total_waiting_time = 0
         self.total_turnaround_time = 0
+        self.checkpoint_file = None
+        self.checkpoint_interval = 0
+        self.steps = 0
+        self.checkpoint_stats = {'count': 0, 'seconds': 0.0, 'bytes': 0}
+        self.run_started = time.perf_counter()
 
     def load_from_file(self, filename):
         self.processes = []
@@ -86,6 +99,84 @@ class Scheduler:
         self.current_time = 0
         self.total_waiting_time = 0
         self.total_turnaround_time = 0
+        self.steps = 0
+        self.checkpoint_stats = {'count': 0, 'seconds': 0.0, 'bytes': 0}
+        self.run_started = time.perf_counter()
+
+    def enable_checkpoints(self, filename, interval=100000):
+        """Save the run state to filename every `interval` scheduling steps (0 disables)."""
+        self.checkpoint_file = filename
+        self.checkpoint_interval = interval
+
+    def checkpoint_step(self, algorithm, state):
+        """Count one scheduling step and checkpoint when the interval is reached.
+
+        `state` is a callable so the algorithm's state is only gathered when a
+        checkpoint is actually written.
+        """
+        self.steps += 1
+        if self.checkpoint_interval and self.steps % self.checkpoint_interval == 0:
+            self.save_checkpoint(algorithm, state())
+
+    def save_checkpoint(self, algorithm, state):
+        started = time.perf_counter()
+        snapshot = {
+            'algorithm': algorithm,
+            'steps': self.steps,
+            # One plain tuple per process / segment keeps the pickle small
+            'processes': [
+                (p.pid, p.arrival_time, p.burst_time, p.priority, p.remaining_time,
+                 p.start_time, p.finish_time, p.waiting_time, p.turnaround_time)
+                for p in self.processes
+            ],
+            'timeline': [(segment['pid'], segment['start'], segment['end']) for segment in self.timeline],
+            'state': state
+        }
+
+        # Write to a temporary file first so a crash never leaves a torn checkpoint
+        temp_filename = self.checkpoint_file + ".tmp"
+        with gzip.open(temp_filename, 'wb', compresslevel=1) as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_filename, self.checkpoint_file)
+
+        self.checkpoint_stats['count'] += 1
+        self.checkpoint_stats['seconds'] += time.perf_counter() - started
+        self.checkpoint_stats['bytes'] = os.path.getsize(self.checkpoint_file)
+
+    def resume_from_checkpoint(self, filename):
+        """Restore processes and timeline from a checkpoint and finish the interrupted run.
+
+        Returns the name of the algorithm that was resumed.
+        """
+        with gzip.open(filename, 'rb') as file:
+            snapshot = pickle.load(file)
+
+        self.processes = []
+        for (pid, arrival_time, burst_time, priority, remaining_time,
+             start_time, finish_time, waiting_time, turnaround_time) in snapshot['processes']:
+            process = Process(pid, arrival_time, burst_time, priority)
+            process.remaining_time = remaining_time
+            process.start_time = start_time
+            process.finish_time = finish_time
+            process.waiting_time = waiting_time
+            process.turnaround_time = turnaround_time
+            self.processes.append(process)
+        self.timeline = [{'pid': pid, 'start': start, 'end': end} for pid, start, end in snapshot['timeline']]
+        self.steps = snapshot['steps']
+        self.run_started = time.perf_counter()
+
+        algorithm = snapshot['algorithm']
+        getattr(self, algorithm)(resume_state=snapshot['state'])
+        return algorithm
+
+    def display_checkpoint_overhead(self):
+        stats = self.checkpoint_stats
+        if not stats['count']:
+            return
+        run_seconds = time.perf_counter() - self.run_started
+        share = stats['seconds'] / run_seconds * 100 if run_seconds > 0 else 0
+        print(f"{Fore.YELLOW}Checkpoints: {stats['count']} written, {stats['seconds']:.3f} s "
+              f"({share:.1f}% of run time), last size {stats['bytes']} bytes{Style.RESET_ALL}")
 
     def calculate_statistics(self):
         self.total_waiting_time = sum(process.waiting_time for process in self.processes)
@@ -107,32 +198,86 @@ class Scheduler:
         print(f"{job_order_str}")
 
 
-    def display_results(self, algorithm_name):
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}{algorithm_name} Scheduling Results:{Style.RESET_ALL}")
-        
-        # Display job execution order
-        self.display_job_order()
-        
-        # Display process statistics in a table
-        table_data = []
-        for p in self.processes:
-            table_data.append([
+    def process_rows(self, processes=None):
+        """Yield one result row per process without building the whole table."""
+        for p in (self.processes if processes is None else processes):
+            yield [
                 f"P{p.pid}", p.arrival_time, p.burst_time, p.priority,
                 p.waiting_time, p.turnaround_time
-            ])
+            ]
+
+    def top_waiting_processes(self, k):
+        """Return the k processes with the longest waiting time using a bounded heap."""
+        return heapq.nlargest(k, self.processes, key=lambda p: p.waiting_time)
+
+    def print_paged(self, rows, headers, tablefmt="grid", page_size=None):
+        """Print rows page by page so a huge table is never formatted in one go."""
+        rows = iter(rows)
+        page_number = 1
+        while True:
+            page = list(islice(rows, page_size)) if page_size else list(rows)
+            if not page:
+                break
+            print(tabulate(page, headers=headers, tablefmt=tablefmt))
+            if not page_size or len(page) < page_size:
+                break
+            answer = input(f"{Fore.YELLOW}-- page {page_number} -- Enter for more, q to stop: {Style.RESET_ALL}")
+            if answer.strip().lower() == 'q':
+                break
+            page_number += 1
+
+    def export_results(self, filename):
+        """Stream the per-process table to a .csv or .jsonl file one row at a time."""
+        extension = os.path.splitext(filename)[1].lower()
+        keys = ["process", "arrival", "burst", "priority", "waiting_time", "turnaround_time"]
+
+        if extension == '.csv':
+            with open(filename, 'w', newline='') as file:
+                csv_writer = csv.writer(file)
+                csv_writer.writerow(self.RESULT_HEADERS)
+                for row in self.process_rows():
+                    csv_writer.writerow(row)
+        elif extension == '.jsonl':
+            with open(filename, 'w') as file:
+                for row in self.process_rows():
+                    file.write(json.dumps(dict(zip(keys, row))) + "\n")
+        else:
+            print(f"Unsupported file format: {extension}")
+            return False
+
+        print(f"Exported {len(self.processes)} process results to {filename}")
+        return True
+
+    def display_results(self, algorithm_name, summary_only=False, top_k=None, page_size=None, export_file=None):
+        print(f"\n{Fore.CYAN}{Style.BRIGHT}{algorithm_name} Scheduling Results:{Style.RESET_ALL}")
+        self.display_checkpoint_overhead()
         
-        headers = ["Process", "Arrival", "Burst", "Priority", "Waiting Time", "Turnaround Time"]
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        if export_file:
+            self.export_results(export_file)
+
+        if not summary_only:
+            # Display job execution order (one line, so only in the full view)
+            if not top_k and not page_size:
+                self.display_job_order()
+
+            # Display process statistics in a table (only the worst waiters for top-k)
+            if top_k:
+                print(f"\n{Fore.YELLOW}Top {top_k} processes by waiting time:{Style.RESET_ALL}")
+                rows = self.process_rows(self.top_waiting_processes(top_k))
+            else:
+                rows = self.process_rows()
+            self.print_paged(rows, self.RESULT_HEADERS, "grid", page_size)
         
         # Calculate and display average metrics
         avg_waiting_time, avg_turnaround_time = self.calculate_statistics()
         print(f"{Fore.GREEN}Average Waiting Time: {avg_waiting_time:.2f} ms")
         print(f"{Fore.GREEN}Average Turnaround Time: {avg_turnaround_time:.2f} ms")
         
-        # Display Gantt chart
-        self.display_gantt_chart()
+        # Display Gantt chart (skipped for summary and top-k views)
+        if not summary_only and not top_k:
+            self.display_gantt_chart(page_size)
 
-    def display_gantt_chart(self):
+    def display_gantt_chart(self, page_size=None):
         if not self.timeline:
             print("No processes were scheduled.")
             return
@@ -161,7 +306,10 @@ class Scheduler:
         idle_char = "·"
         process_char = "█"
         
-        for i, segment in enumerate(self.timeline):
+        # When paging, only chart the first page of segments
+        chart_segments = self.timeline[:page_size] if page_size else self.timeline
+
+        for i, segment in enumerate(chart_segments):
             # Assign color to process if not already assigned
             pid = segment['pid']
             if pid not in process_colors:
@@ -185,7 +333,7 @@ class Scheduler:
             print(f"P{pid:<2}  |{bar}")
             
             # Add small gap between processes for readability
-            if i < len(self.timeline) - 1:
+            if i < len(chart_segments) - 1:
                 next_start = int(self.timeline[i+1]['start'] * scale_factor)
                 if next_start > end_pos:
                     # Show idle time between processes
@@ -196,125 +344,144 @@ class Scheduler:
         
         # Display time intervals in a more structured format
         print(f"\n{Fore.YELLOW}{Style.BRIGHT}Time Intervals:{Style.RESET_ALL}")
-        interval_data = []
-        for segment in self.timeline:
-            interval_data.append([
-                f"P{segment['pid']}",
-                segment['start'],
-                segment['end'],
-                segment['end'] - segment['start']
-            ])
+        interval_data = (
+            [f"P{segment['pid']}", segment['start'], segment['end'], segment['end'] - segment['start']]
+            for segment in self.timeline
+        )
         
         interval_headers = ["Process", "Start Time", "End Time", "Duration"]
-        print(tabulate(interval_data, headers=interval_headers, tablefmt="simple"))
+        self.print_paged(interval_data, interval_headers, "simple", page_size)
+
+    def fcfs(self, resume_state=None):
+        if resume_state is None:
+            self.reset_processes()
+            current_time = 0
+            position = 0
+        else:
+            current_time = resume_state['current_time']
+            position = resume_state['position']
+
+        # Processes are served in the order they were loaded
+        for position in range(position, len(self.processes)):
+            process = self.processes[position]
+            self.checkpoint_step('fcfs', lambda: {'current_time': current_time, 'position': position})
 
-    def fcfs(self):
-        self.reset_processes()
-        
-        # Sort by arrival time
-        current_time = 0
-        
-        for process in self.processes:
             # If the process hasn't arrived yet, advance time
             if current_time < process.arrival_time:
                 current_time = process.arrival_time
-            
+
             process.start_time = current_time
             process.finish_time = current_time + process.burst_time
-            
+
             # Update timeline for Gantt chart
             self.timeline.append({
                 'pid': process.pid,
                 'start': current_time,
                 'end': process.finish_time
             })
-            
+
             # Update waiting time (time spent waiting after arrival)
             # process.waiting_time = process.start_time - process.arrival_time
-            process.waiting_time = process.start_time 
+            process.waiting_time = process.start_time
 
             # Update turnaround time (finish time - arrival time)
             # process.turnaround_time = process.finish_time - process.arrival_time
             process.turnaround_time = process.finish_time
-            
+
             current_time = process.finish_time
 
-    def sjf(self):
-        self.reset_processes()
-        
+    def sjf(self, resume_state=None):
+        if resume_state is None:
+            self.reset_processes()
+            current_time = 0
+            position = 0
+        else:
+            current_time = resume_state['current_time']
+            position = resume_state['position']
+
         # For SJF, assume all processes arrive at time 0 in the given order
         # Sort the processes by burst time
         sorted_processes = sorted(self.processes, key=lambda p: p.burst_time)
-        
-        current_time = 0
-        
-        for process in sorted_processes:
+
+        for position in range(position, len(sorted_processes)):
+            process = sorted_processes[position]
+            self.checkpoint_step('sjf', lambda: {'current_time': current_time, 'position': position})
+
             # All processes are assumed to be available at time 0
             process.start_time = current_time
             process.finish_time = current_time + process.burst_time
-            
+
             # Update timeline for Gantt chart
             self.timeline.append({
                 'pid': process.pid,
                 'start': current_time,
                 'end': process.finish_time
             })
-            
+
             # Waiting time is simply the start time (since arrival time is 0)
             # process.waiting_time = process.start_time - process.arrival_time
-            process.waiting_time = process.start_time 
-            
+            process.waiting_time = process.start_time
+
             # Turnaround time is finish time (since arrival time is 0)
             # process.turnaround_time = process.finish_time - process.arrival_time
-            process.turnaround_time = process.finish_time 
-            
+            process.turnaround_time = process.finish_time
+
             current_time = process.finish_time
 
-    def srpt(self):
-        self.reset_processes()
-        
-        # Create copies of processes manually
-        remaining_processes = []
-        for p in self.processes:
-            new_process = Process(
-                pid=p.pid,
-                arrival_time=p.arrival_time,
-                burst_time=p.burst_time
-            )
-            new_process.remaining_time = p.burst_time
-            new_process.start_time = -1  # Initialize to -1 (not started)
-            remaining_processes.append(new_process)
-        
-        # Sort by arrival time initially
-        remaining_processes.sort(key=lambda p: p.arrival_time)
-        
-        current_time = 0
-        completed_processes = 0
-        ready_queue = []
-        last_process_id = -1  # For Gantt chart
-        
+    def srpt(self, resume_state=None):
+        # Processes in arrival order; next_arrival indexes the next one to arrive
+        arrival_order = sorted(self.processes, key=lambda p: p.arrival_time)
+
+        if resume_state is None:
+            self.reset_processes()
+            for p in self.processes:
+                p.start_time = -1  # Initialize to -1 (not started)
+            current_time = 0
+            completed_processes = 0
+            next_arrival = 0
+            ready_queue = []
+            last_process_id = -1  # For Gantt chart
+        else:
+            current_time = resume_state['current_time']
+            completed_processes = resume_state['completed_processes']
+            next_arrival = resume_state['next_arrival']
+            ready_queue = [self.processes[i] for i in resume_state['ready_queue']]
+            last_process_id = resume_state['last_process_id']
+
+        def snapshot():
+            positions = {id(p): i for i, p in enumerate(self.processes)}
+            return {
+                'current_time': current_time,
+                'completed_processes': completed_processes,
+                'next_arrival': next_arrival,
+                'ready_queue': [positions[id(p)] for p in ready_queue],
+                'last_process_id': last_process_id
+            }
+
         while completed_processes < len(self.processes):
+            self.checkpoint_step('srpt', snapshot)
+
             # Add newly arrived processes to the ready queue
-            while remaining_processes and remaining_processes[0].arrival_time <= current_time:
-                process = remaining_processes.pop(0)
-                ready_queue.append(process)
-            
+            while next_arrival < len(arrival_order) and arrival_order[next_arrival].arrival_time <= current_time:
+                ready_queue.append(arrival_order[next_arrival])
+                next_arrival += 1
+
             if not ready_queue:
                 # If no process is ready, advance time to the next arrival
-                if remaining_processes:
-                    current_time = remaining_processes[0].arrival_time
+                if next_arrival < len(arrival_order):
+                    current_time = arrival_order[next_arrival].arrival_time
                     continue
                 else:
                     break  # No more processes
-            
+
             # Sort the ready queue by remaining time, get the process with the shortest remaining time
             ready_queue.sort(key=lambda p: p.remaining_time)
             current_process = ready_queue[0]
-            
+
             # Record start time if this is the first time the process runs
             if current_process.start_time == -1:
                 current_process.start_time = current_time
-            
+
             # Check if we need to start a new segment in the Gantt chart
             #If a new process starts or preempts the old one, start a new segment in the chart.
             if last_process_id != current_process.pid:
@@ -324,129 +491,182 @@ class Scheduler:
                     'end': current_time  # Will be updated later
                 })
                 last_process_id = current_process.pid
-            
+
             # Determine time slice (until completion or next arrival)
             time_slice = current_process.remaining_time
-            if remaining_processes:
-                next_arrival = remaining_processes[0].arrival_time
+            if next_arrival < len(arrival_order):
                 #Adjust the time slice if a new process is about to arrive
-                time_slice = min(time_slice, next_arrival - current_time)
-            
+                time_slice = min(time_slice, arrival_order[next_arrival].arrival_time - current_time)
+
             # Execute the process for the time slice
             current_process.remaining_time -= time_slice
             current_time += time_slice
-            
+
             # Update the end time of the current Gantt chart segment
             self.timeline[-1]['end'] = current_time
-            
+
             # If the process is complete, calculate its metrics
             if current_process.remaining_time == 0:
                 current_process.finish_time = current_time
-                current_process.turnaround_time = current_process.finish_time 
+                current_process.turnaround_time = current_process.finish_time
                 current_process.waiting_time = (current_process.turnaround_time - current_process.burst_time) - current_process.arrival_time
-                
-                # Update the original process with the results
-                for original_p in self.processes:
-                    if original_p.pid == current_process.pid:
-                        original_p.start_time = current_process.start_time
-                        original_p.finish_time = current_process.finish_time
-                        original_p.turnaround_time = current_process.turnaround_time
-                        original_p.waiting_time = current_process.waiting_time
-                        break
-                
+
                 ready_queue.pop(0)
                 completed_processes += 1
                 last_process_id = -1
-    
-    def priority(self):
-        self.reset_processes()
-        
+
+    def priority(self, resume_state=None):
+        if resume_state is None:
+            self.reset_processes()
+            current_time = 0
+            completed_processes = 0
+        else:
+            current_time = resume_state['current_time']
+            completed_processes = resume_state['completed_processes']
+
         # a copy of processes and sort by priority (lower number = higher priority)
         remaining_processes = sorted(self.processes.copy(), key=lambda p: p.priority)
-        
-        current_time = 0
-        completed_processes = 0
-        
+
         while completed_processes < len(self.processes):
-            if not remaining_processes:
+            self.checkpoint_step('priority', lambda: {'current_time': current_time, 'completed_processes': completed_processes})
+
+            if completed_processes >= len(remaining_processes):
                 break  # No more processes
-            
-            # Get the highest priority process (first in the sorted list)
-            current_process = remaining_processes.pop(0)
-            
+
+            # Get the highest priority process (next in the sorted list)
+            current_process = remaining_processes[completed_processes]
+
             # Set start time (since arrival time is ignored)
             current_process.start_time = current_time
-            
+
             # Execute the entire process (non-preemptive)
             execution_time = current_process.burst_time
-            
+
             # Update timeline
             self.timeline.append({
                 'pid': current_process.pid,
                 'start': current_time,
                 'end': current_time + execution_time
             })
-            
+
             current_time += execution_time
-            
+
             # Update process completion details
             current_process.finish_time = current_time
             current_process.remaining_time = 0
-            
+
             # Waiting time = start_time (since arrival_time is ignored)
             current_process.waiting_time = current_process.start_time
-            
+
             # Turnaround time = finish_time (since arrival_time is ignored)
             current_process.turnaround_time = current_process.finish_time
-            
+
             completed_processes += 1
-        
 
-    def round_robin(self, quantum):
-        self.reset_processes()
-        
-        # Create a queue of processes (ignoring arrival time)
-        ready_queue = deque(self.processes.copy())
-        current_time = 0
-        completed_processes = 0
-        
+
+    def round_robin(self, quantum=None, resume_state=None):
+        if resume_state is None:
+            self.reset_processes()
+            # Create a queue of processes (ignoring arrival time)
+            ready_queue = deque(self.processes.copy())
+            current_time = 0
+            completed_processes = 0
+        else:
+            quantum = resume_state['quantum']
+            ready_queue = deque(self.processes[i] for i in resume_state['ready_queue'])
+            current_time = resume_state['current_time']
+            completed_processes = resume_state['completed_processes']
+
+        def snapshot():
+            positions = {id(p): i for i, p in enumerate(self.processes)}
+            return {
+                'quantum': quantum,
+                'current_time': current_time,
+                'completed_processes': completed_processes,
+                'ready_queue': [positions[id(p)] for p in ready_queue]
+            }
+
         while completed_processes < len(self.processes):
+            self.checkpoint_step('round_robin', snapshot)
+
             if not ready_queue:
                 break  # No more processes to execute
-            
+
             current_process = ready_queue.popleft()
-            
+
             # Set start time if this is the first execution
             if current_process.start_time == -1:  # Assuming reset sets to -1
                 current_process.start_time = current_time
-            
+
             # Execute for the quantum time or remaining time (whichever is smaller)
             execution_time = min(quantum, current_process.remaining_time)
-            
+
             # Record in timeline
             self.timeline.append({
                 'pid': current_process.pid,
                 'start': current_time,
                 'end': current_time + execution_time
             })
-            
+
             # Update process and time
             current_process.remaining_time -= execution_time
             current_time += execution_time
-            
+
             # Check if process completed
             if current_process.remaining_time == 0:
                 current_process.finish_time = current_time
-                current_process.turnaround_time = current_process.finish_time  
+                current_process.turnaround_time = current_process.finish_time
                 current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
                 completed_processes += 1
             else:
                 # Put back in queue if not finished
                 ready_queue.append(current_process)
 
+LARGE_TABLE_THRESHOLD = 50
+
+
+def select_display_options():
+    print(f"\n{Fore.CYAN}Select Results View:{Style.RESET_ALL}")
+    print("1. Full table")
+    print("2. Summary only")
+    print("3. Top-k longest waiting processes")
+    print("4. Paged table")
+    print("5. Summary + export table to CSV/JSONL")
+    
+    view_choice = input(f"{Fore.GREEN}Enter your choice (1-5): {Style.RESET_ALL}")
+    
+    if view_choice == '2':
+        return {'summary_only': True}
+    elif view_choice == '3':
+        return {'top_k': int(input("Number of processes (k): "))}
+    elif view_choice == '4':
+        return {'page_size': int(input("Rows per page: "))}
+    elif view_choice == '5':
+        return {'summary_only': True, 'export_file': input("Export filename (.csv or .jsonl): ")}
+    return {}
+
+
+ALGORITHM_NAMES = {
+    'fcfs': "First-Come, First-Served (FCFS)",
+    'sjf': "Shortest Job First (SJF)",
+    'srpt': "Shortest Remaining Processing Time (SRPT)",
+    'priority': "Priority Scheduling",
+    'round_robin': "Round-Robin"
+}
+
+
 def main():
     scheduler = Scheduler()
     
+    # Optional: mp2.py --checkpoint FILE [INTERVAL] | --resume FILE
+    if len(sys.argv) >= 3 and sys.argv[1] == '--checkpoint':
+        interval = int(sys.argv[3]) if len(sys.argv) >= 4 else 100000
+        scheduler.enable_checkpoints(sys.argv[2], interval)
+        print(f"{Fore.GREEN}Checkpointing to {sys.argv[2]} every {interval} steps{Style.RESET_ALL}")
+    elif len(sys.argv) >= 3 and sys.argv[1] == '--resume':
+        algorithm = scheduler.resume_from_checkpoint(sys.argv[2])
+        scheduler.display_results(ALGORITHM_NAMES[algorithm] + " (resumed)", summary_only=len(scheduler.processes) > LARGE_TABLE_THRESHOLD)
+    
     while True:
         print(f"\n{Fore.CYAN}{Style.BRIGHT}CPU Scheduling Simulator{Style.RESET_ALL}")
         print(f"{Fore.CYAN}========================{Style.RESET_ALL}")
@@ -477,6 +697,11 @@ def main():
         
         print(f"\n{Fore.GREEN}Loaded {len(scheduler.processes)} processes from {file_name}{Style.RESET_ALL}")
         
+        # Large batches get a choice of results view instead of the full table
+        display_options = {}
+        if len(scheduler.processes) > LARGE_TABLE_THRESHOLD:
+            display_options = select_display_options()
+        
         # Algorithm selection menu
         while True:
             print(f"\n{Fore.CYAN}Select Scheduling Algorithm:{Style.RESET_ALL}")
@@ -495,20 +720,20 @@ def main():
             # Run the selected algorithm
             if algo_choice == '1':
                 scheduler.fcfs()
-                scheduler.display_results("First-Come, First-Served (FCFS)")
+                scheduler.display_results("First-Come, First-Served (FCFS)", **display_options)
             elif algo_choice == '2':
                 scheduler.sjf()
-                scheduler.display_results("Shortest Job First (SJF)")
+                scheduler.display_results("Shortest Job First (SJF)", **display_options)
             elif algo_choice == '3':
                 scheduler.srpt()
-                scheduler.display_results("Shortest Remaining Processing Time (SRPT)")
+                scheduler.display_results("Shortest Remaining Processing Time (SRPT)", **display_options)
             elif algo_choice == '4':
                 scheduler.priority()
-                scheduler.display_results("Priority Scheduling")
+                scheduler.display_results("Priority Scheduling", **display_options)
             elif algo_choice == '5':
                 quantum_time = int(input("Quantum Time: "))
                 scheduler.round_robin(quantum_time)
-                scheduler.display_results("Round-Robin (quantum = 4ms)")
+                scheduler.display_results("Round-Robin (quantum = 4ms)", **display_options)
             else:
                 print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
 
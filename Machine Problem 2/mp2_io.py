@@ -0,0 +1,291 @@
+import heapq
+import os
+from collections import deque
+from tabulate import tabulate
+from colorama import init, Fore, Style
+
+from eventsim import EventKernel
+from mp2 import Process
+
+# Initialize colorama for cross-platform colored terminal output
+init(autoreset=True)
+
+# Event kinds, in the order they are handled when they share a timestamp
+IO_DONE = 0
+CPU_DONE = 1
+ARRIVAL = 2
+
+# Scheduling policies BurstScheduler.run accepts
+POLICIES = ('fcfs', 'sjf', 'priority', 'round_robin')
+
+
+class BurstProcess(Process):
+    """A process that alternates CPU bursts with I/O bursts on named devices.
+
+    `bursts` is a list such as [('cpu', 5), ('disk', 3), ('cpu', 2)]; it must
+    start and end with a CPU burst, every I/O burst must follow a CPU burst
+    and every length must be positive.  Anything else raises ValueError.
+    """
+    def __init__(self, pid, arrival_time, bursts, priority=0):
+        if not bursts:
+            raise ValueError(f"Process {pid} has no bursts")
+        for index, (device, length) in enumerate(bursts):
+            if length <= 0:
+                raise ValueError(f"Process {pid} has a {device} burst of length {length}")
+            if device != 'cpu' and (index == 0 or bursts[index - 1][0] != 'cpu'):
+                raise ValueError(f"Process {pid} has a {device} burst that does not follow a CPU burst")
+        if bursts[-1][0] != 'cpu':
+            raise ValueError(f"Process {pid} does not end with a CPU burst")
+        cpu_total = sum(length for device, length in bursts if device == 'cpu')
+        super().__init__(pid, arrival_time, cpu_total, priority)
+        self.bursts = bursts
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.burst_index = 0
+        self.burst_remaining = self.bursts[0][1]
+        self.io_time = 0
+        self.ready_since = 0
+
+    def __str__(self):
+        pattern = " ".join(f"{device}:{length}" for device, length in self.bursts)
+        return f"Process {self.pid}: Arrival={self.arrival_time}, Bursts=[{pattern}]"
+
+
+class IODevice:
+    """A device with its own FCFS queue; one request is serviced at a time."""
+    def __init__(self, name):
+        self.name = name
+        self.queue = deque()
+        self.current = None
+        self.busy_time = 0
+        self.requests = 0
+
+    def __str__(self):
+        return f"Device {self.name} (Queued: {len(self.queue)}, Busy: {self.busy_time})"
+
+
+class BurstScheduler:
+    """Discrete-event simulator for CPU/I-O burst workloads on a single CPU.
+
+    Time jumps straight from one event on the shared kernel's calendar to
+    the next; nothing is simulated between events.
+    """
+    def __init__(self):
+        self.processes = []
+        self.devices = {}
+        self.timeline = []
+        self.kernel = EventKernel()
+
+    def load_from_file(self, filename):
+        """Load a workload: `pid arrival priority cpu:5 disk:3 cpu:2 ...` per line, with a header.
+
+        A malformed line raises ValueError naming the file and line.
+        """
+        self.processes = []
+        with open(filename, 'r') as file:
+            # Skip the header line
+            lines = file.readlines()[1:]
+            for number, line in enumerate(lines, start=2):
+                values = line.strip().split()
+                if len(values) >= 4:
+                    try:
+                        bursts = []
+                        for burst in values[3:]:
+                            device, length = burst.split(':')
+                            bursts.append((device.lower(), int(length)))
+                        self.processes.append(BurstProcess(int(values[0]), int(values[1]), bursts, int(values[2])))
+                    except ValueError as error:
+                        raise ValueError(f"{filename}, line {number}: {error}") from None
+        return True
+
+    def reset(self):
+        self.devices = {}
+        for process in self.processes:
+            process.reset()
+            for device, length in process.bursts:
+                if device != 'cpu' and device not in self.devices:
+                    self.devices[device] = IODevice(device)
+        self.timeline = []
+        self.kernel = EventKernel()
+
+    def run(self, policy='fcfs', quantum=None):
+        """Simulate the workload; policy is 'fcfs', 'sjf', 'priority' or 'round_robin'.
+
+        Round robin needs a positive quantum; anything else, or an unknown
+        policy, raises ValueError.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy {policy!r}, expected one of {', '.join(POLICIES)}")
+        if policy == 'round_robin' and (quantum is None or quantum <= 0):
+            raise ValueError(f"Round robin needs a positive quantum, got {quantum}")
+        self.reset()
+
+        # Ready queue keyed by the policy; round-robin is a plain FIFO with a time slice
+        if policy == 'sjf':
+            ready_key = lambda p: p.burst_remaining
+        elif policy == 'priority':
+            ready_key = lambda p: p.priority
+        else:
+            ready_key = None
+        ready_queue = []
+        ready_count = 0
+        time_slice = quantum if policy == 'round_robin' else None
+
+        kernel = self.kernel
+        state = {'running': None, 'cpu_busy_time': 0}
+
+        def make_ready(process):
+            nonlocal ready_count
+            process.ready_since = kernel.now
+            key = ready_key(process) if ready_key else 0
+            heapq.heappush(ready_queue, (key, ready_count, process))
+            ready_count += 1
+
+        def start_io(device):
+            process = device.queue.popleft()
+            device.current = process
+            device.requests += 1
+            kernel.schedule_in(process.burst_remaining, io_done, device, process, priority=IO_DONE)
+
+        def next_burst(process):
+            # Move past the finished burst and route the process to its next queue
+            process.burst_index += 1
+            if process.burst_index == len(process.bursts):
+                process.finish_time = kernel.now
+                process.turnaround_time = process.finish_time - process.arrival_time
+                return
+            device_name, length = process.bursts[process.burst_index]
+            process.burst_remaining = length
+            if device_name == 'cpu':
+                make_ready(process)
+            else:
+                device = self.devices[device_name]
+                device.queue.append(process)
+                if device.current is None:
+                    start_io(device)
+
+        def io_done(device, process):
+            device.busy_time += process.burst_remaining
+            process.io_time += process.burst_remaining
+            device.current = None
+            if device.queue:
+                start_io(device)
+            next_burst(process)
+
+        def cpu_done(process, executed):
+            state['cpu_busy_time'] += executed
+            process.burst_remaining -= executed
+            state['running'] = None
+            if process.burst_remaining > 0:
+                make_ready(process)  # Quantum expired
+            else:
+                next_burst(process)
+
+        def dispatch(now):
+            # Runs once every event at this time is handled
+            if state['running'] is not None or not ready_queue:
+                return
+            _, _, running = heapq.heappop(ready_queue)
+            state['running'] = running
+            running.waiting_time += now - running.ready_since
+            if not running.executed:
+                running.start_time = now
+                running.executed = True
+            execution_time = running.burst_remaining
+            if time_slice is not None:
+                execution_time = min(time_slice, execution_time)
+            self.timeline.append({
+                'pid': running.pid,
+                'start': now,
+                'end': now + execution_time
+            })
+            kernel.schedule_in(execution_time, cpu_done, running, execution_time, priority=CPU_DONE)
+
+        for process in self.processes:
+            kernel.schedule(process.arrival_time, make_ready, process, priority=ARRIVAL)
+
+        makespan = kernel.run(after_instant=dispatch)
+        return self.report(state['cpu_busy_time'], makespan)
+
+    def report(self, cpu_busy_time, makespan):
+        finished = len(self.processes)
+        return {
+            'makespan': makespan,
+            'events': self.kernel.processed,
+            'cpu_utilisation': cpu_busy_time / makespan if makespan else 0,
+            'device_utilisation': {
+                name: device.busy_time / makespan if makespan else 0
+                for name, device in self.devices.items()
+            },
+            'throughput': finished / makespan if makespan else 0,
+            'avg_waiting_time': sum(p.waiting_time for p in self.processes) / finished if finished else 0,
+            'avg_turnaround_time': sum(p.turnaround_time for p in self.processes) / finished if finished else 0
+        }
+
+    def display_results(self, algorithm_name, report):
+        print(f"\n{Fore.CYAN}{Style.BRIGHT}{algorithm_name} CPU/I-O Simulation Results:{Style.RESET_ALL}")
+
+        table_data = [
+            [f"P{p.pid}", p.arrival_time, p.burst_time, p.io_time, p.waiting_time, p.turnaround_time]
+            for p in self.processes
+        ]
+        headers = ["Process", "Arrival", "CPU Time", "I/O Time", "Ready Wait", "Turnaround Time"]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+        print(f"{Fore.GREEN}Average Waiting Time: {report['avg_waiting_time']:.2f} ms")
+        print(f"{Fore.GREEN}Average Turnaround Time: {report['avg_turnaround_time']:.2f} ms")
+        print(f"{Fore.GREEN}Makespan: {report['makespan']} ms ({report['events']} events)")
+        print(f"{Fore.GREEN}Throughput: {report['throughput']:.4f} processes/ms")
+        print(f"{Fore.GREEN}CPU Utilisation: {report['cpu_utilisation'] * 100:.1f}%")
+        for name, utilisation in report['device_utilisation'].items():
+            print(f"{Fore.GREEN}{name} Utilisation: {utilisation * 100:.1f}%")
+
+
+def main():
+    scheduler = BurstScheduler()
+
+    file_name = input(f"{Fore.GREEN}Workload file (default io_batch.txt): {Style.RESET_ALL}") or "io_batch.txt"
+    try:
+        loaded = os.path.exists(file_name) and scheduler.load_from_file(file_name)
+    except ValueError as error:
+        print(f"{Fore.RED}{error}{Style.RESET_ALL}")
+        return
+    if not loaded:
+        print(f"{Fore.RED}Failed to load {file_name}{Style.RESET_ALL}")
+        return
+
+    print(f"\n{Fore.GREEN}Loaded {len(scheduler.processes)} processes from {file_name}{Style.RESET_ALL}")
+
+    while True:
+        print(f"\n{Fore.CYAN}Select CPU Scheduling Algorithm:{Style.RESET_ALL}")
+        print("1. First-Come, First-Served (FCFS)")
+        print("2. Shortest Next CPU Burst (SJF)")
+        print("3. Priority Scheduling")
+        print("4. Round-Robin")
+        print("5. Exit")
+
+        algo_choice = input(f"{Fore.GREEN}Enter your choice (1-5): {Style.RESET_ALL}")
+
+        if algo_choice == '5':
+            break
+        elif algo_choice == '1':
+            scheduler.display_results("First-Come, First-Served (FCFS)", scheduler.run('fcfs'))
+        elif algo_choice == '2':
+            scheduler.display_results("Shortest Next CPU Burst (SJF)", scheduler.run('sjf'))
+        elif algo_choice == '3':
+            scheduler.display_results("Priority Scheduling", scheduler.run('priority'))
+        elif algo_choice == '4':
+            quantum_time = int(input("Quantum Time: "))
+            try:
+                report = scheduler.run('round_robin', quantum_time)
+            except ValueError as error:
+                print(f"{Fore.RED}{error}{Style.RESET_ALL}")
+                continue
+            scheduler.display_results(f"Round-Robin (quantum = {quantum_time}ms)", report)
+        else:
+            print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
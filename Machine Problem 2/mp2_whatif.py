@@ -0,0 +1,448 @@
+import random
+import time
+from colorama import init, Fore, Style
+
+from mp2 import Process, Scheduler
+
+# Initialize colorama for cross-platform colored terminal output
+init(autoreset=True)
+
+
+class BurstTreap:
+    """Treap of (burst, load position) keys in SJF order with subtree counts and burst sums.
+
+    Random priorities keep the expected depth O(log n), so inserting or
+    removing a key and summing the keys before one are O(log n) whatever the
+    burst values. Nodes live in parallel lists; node 0 is the empty tree.
+    `visits` counts the nodes that edits and queries have walked through, so
+    their cost can be checked without timing them.
+    """
+    def __init__(self, keys=(), seed=0):
+        """Build from keys already in SJF order in O(n)."""
+        self.random = random.Random(seed)
+        self.burst = [0]
+        self.slot = [0]
+        self.priority = [0.0]
+        self.left = [0]
+        self.right = [0]
+        self.count = [0]
+        self.total = [0]
+        self.free = []  # Nodes of removed keys, reused by later inserts
+        self.visits = 0
+
+        # Cartesian tree on the random priorities: a node is finished once it leaves the stack
+        stack = []
+        for burst, slot in keys:
+            node = self._new(burst, slot)
+            last = 0
+            while stack and self.priority[stack[-1]] < self.priority[node]:
+                last = stack.pop()
+                self._pull(last)
+            self.left[node] = last
+            if stack:
+                self.right[stack[-1]] = node
+            stack.append(node)
+        for node in reversed(stack):
+            self._pull(node)
+        self.root = stack[0] if stack else 0
+
+    def _new(self, burst, slot):
+        if self.free:
+            node = self.free.pop()
+            self.burst[node], self.slot[node] = burst, slot
+            self.priority[node] = self.random.random()
+            self.left[node] = self.right[node] = 0
+        else:
+            node = len(self.burst)
+            self.burst.append(burst)
+            self.slot.append(slot)
+            self.priority.append(self.random.random())
+            self.left.append(0)
+            self.right.append(0)
+            self.count.append(0)
+            self.total.append(0)
+        self.count[node], self.total[node] = 1, burst
+        return node
+
+    def _pull(self, node):
+        left, right = self.left[node], self.right[node]
+        self.count[node] = self.count[left] + 1 + self.count[right]
+        self.total[node] = self.total[left] + self.burst[node] + self.total[right]
+
+    def _split(self, node, key):
+        """Split a subtree into (keys before `key`, the rest)."""
+        if not node:
+            return 0, 0
+        self.visits += 1
+        if (self.burst[node], self.slot[node]) < key:
+            before, rest = self._split(self.right[node], key)
+            self.right[node] = before
+            self._pull(node)
+            return node, rest
+        before, rest = self._split(self.left[node], key)
+        self.left[node] = rest
+        self._pull(node)
+        return before, node
+
+    def _merge(self, first, second):
+        """Join two subtrees whose keys are all in order."""
+        if not first or not second:
+            return first or second
+        self.visits += 1
+        if self.priority[first] > self.priority[second]:
+            self.right[first] = self._merge(self.right[first], second)
+            self._pull(first)
+            return first
+        self.left[second] = self._merge(first, self.left[second])
+        self._pull(second)
+        return second
+
+    def insert(self, burst, slot):
+        before, rest = self._split(self.root, (burst, slot))
+        self.root = self._merge(self._merge(before, self._new(burst, slot)), rest)
+
+    def remove(self, burst, slot):
+        before, rest = self._split(self.root, (burst, slot))
+        node, rest = self._split(rest, (burst, slot + 1))
+        self.free.append(node)
+        self.root = self._merge(before, rest)
+
+    def before(self, burst, slot):
+        """Return (count, burst sum) of the keys before (burst, slot)."""
+        key = (burst, slot)
+        node = self.root
+        count = total = 0
+        while node:
+            self.visits += 1
+            if (self.burst[node], self.slot[node]) < key:
+                left = self.left[node]
+                count += self.count[left] + 1
+                total += self.total[left] + self.burst[node]
+                node = self.right[node]
+            else:
+                node = self.left[node]
+        return count, total
+
+    def __len__(self):
+        return self.count[self.root]
+
+
+class GapTree:
+    """Segment tree over FCFS queue slots for start times with idle gaps.
+
+    Each node stores (count, burst sum, gap, right delay) where gap is the
+    largest `arrival - bursts before it in the node` among its processes. A
+    process then starts at prefix + max(0, prefix gap), matching
+    Scheduler.fcfs. Right delay is the idle delay of the right child's
+    processes given the left child's gap, so the total idle delay of the
+    queue is found in O(log n) and kept up to date in O(log^2 n) per edit.
+    """
+    EMPTY = (0, 0, float('-inf'), 0)
+
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.nodes = [self.EMPTY] * (2 * self.size)
+
+    @staticmethod
+    def combine(left, right):
+        return (left[0] + right[0], left[1] + right[1], max(left[2], right[2] - left[1]))
+
+    def pull(self, index):
+        """Recompute a node from its children."""
+        left, right = self.nodes[2 * index], self.nodes[2 * index + 1]
+        right_delay = 0
+        if left[0] and right[0]:
+            # The right child's processes see at least the left child's gap
+            right_delay = self.delay(2 * index + 1, left[2] + left[1]) - right[0] * left[1]
+        self.nodes[index] = self.combine(left, right) + (right_delay,)
+
+    def delay(self, index, floor):
+        """Return the sum over a node's processes of max(floor, prefix gap) in O(log n)."""
+        nodes = self.nodes
+        total = 0
+        while True:
+            count, _, gap, right_delay = nodes[index]
+            if floor >= gap:
+                return total + count * floor
+            if index >= self.size:
+                return total + gap
+            left = nodes[2 * index]
+            if floor >= left[2]:
+                # Every left process sees the floor; the right child sees it shifted by the left bursts
+                total += left[0] * floor - (count - left[0]) * left[1]
+                floor += left[1]
+                index = 2 * index + 1
+            else:
+                total += right_delay
+                index = 2 * index
+
+    def idle_delay(self):
+        """Return the total time processes start late because the CPU went idle."""
+        return self.delay(1, 0)
+
+    def set(self, slot, leaf):
+        if slot >= self.size:
+            self.grow(slot + 1)
+        index = slot + self.size
+        self.nodes[index] = leaf
+        index //= 2
+        while index:
+            self.pull(index)
+            index //= 2
+
+    def query(self, lo, hi):
+        """Combine slots [lo, hi) in queue order into (count, burst sum, gap)."""
+        left_result, right_result = self.EMPTY, self.EMPTY
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                left_result = self.combine(left_result, self.nodes[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_result = self.combine(self.nodes[hi], right_result)
+            lo //= 2
+            hi //= 2
+        return self.combine(left_result, right_result)
+
+    def build(self, leaves):
+        """Load leaves into slots 0.. in O(n), replacing the current contents."""
+        while self.size < len(leaves):
+            self.size *= 2
+        self.nodes = [self.EMPTY] * (2 * self.size)
+        self.nodes[self.size:self.size + len(leaves)] = leaves
+        for index in range(self.size - 1, 0, -1):
+            self.pull(index)
+
+    def grow(self, capacity):
+        leaves = self.nodes[self.size:]
+        while self.size < capacity:
+            self.size *= 2
+        self.build(leaves)
+
+    def root(self):
+        return self.nodes[1]
+
+
+class IncrementalScheduler:
+    """What-if view of an FCFS or SJF schedule that updates without rescheduling.
+
+    Start, finish, waiting and turnaround times follow the same rules as
+    Scheduler.fcfs and Scheduler.sjf, but inserting, removing or editing one
+    process only walks a few root-to-leaf paths instead of rescheduling:
+    expected O(log n) per edit under SJF and O(log^2 n) under FCFS, where
+    refreshing each of the O(log n) GapTree ancestors costs O(log n).
+
+    SJF keeps the processes in a BurstTreap ordered by burst time and then
+    load position, so processes with the same burst run in load order and
+    new or huge burst values cost no more than any other edit. FCFS keeps
+    the queue in a GapTree so idle time before late arrivals is accounted
+    for.
+    """
+    def __init__(self, processes, policy='fcfs'):
+        if policy not in ('fcfs', 'sjf'):
+            raise ValueError(f"Unsupported policy: {policy}")
+        self.policy = policy
+        self.processes = {}       # pid -> Process
+        self.slots = {}           # pid -> load position
+        self.next_slot = 0
+        self.total_burst = 0
+        self.total_start = 0      # Sum of start times when there is no idle time
+
+        for slot, process in enumerate(processes):
+            if process.pid in self.processes:
+                raise ValueError(f"Process {process.pid} is already scheduled")
+            self.processes[process.pid] = process
+            self.slots[process.pid] = slot
+            self.total_burst += process.burst_time
+        self.next_slot = len(processes)
+
+        # Bulk build in O(n log n) instead of n separate inserts
+        if policy == 'sjf':
+            keys = sorted((process.burst_time, slot) for slot, process in enumerate(processes))
+            self.order = BurstTreap(keys)
+            ordered_bursts = [burst for burst, _ in keys]
+        else:
+            self.queue = GapTree(len(processes))
+            self.queue.build([self._fcfs_leaf(p) for p in processes])
+            ordered_bursts = [p.burst_time for p in processes]
+
+        # Each burst delays every process scheduled after it
+        count = len(ordered_bursts)
+        self.total_start = sum(burst * (count - 1 - rank) for rank, burst in enumerate(ordered_bursts))
+
+    def __len__(self):
+        return len(self.processes)
+
+    # SJF helpers
+
+    def _sjf_before(self, burst, slot):
+        """Return (count, burst sum) of processes scheduled before (burst, slot)."""
+        return self.order.before(burst, slot)
+
+    def _sjf_add(self, burst, slot, sign):
+        rank, before = self.order.before(burst, slot)
+        # The process is already counted in self.processes here
+        after = len(self.processes) - 1 - rank
+        if sign > 0:
+            self.order.insert(burst, slot)
+        else:
+            self.order.remove(burst, slot)
+        # Everyone before gains (or loses) one process behind them, and the
+        # process itself waits for everyone before it
+        self.total_start += sign * (before + burst * after)
+
+    # FCFS helpers
+
+    def _fcfs_leaf(self, process):
+        return (1, process.burst_time, process.arrival_time, 0)
+
+    def _fcfs_add(self, process, slot, sign):
+        before = self.queue.query(0, slot)
+        after = self.queue.query(slot + 1, self.next_slot)[0]
+        self.total_start += sign * (before[1] + process.burst_time * after)
+        self.queue.set(slot, self._fcfs_leaf(process) if sign > 0 else GapTree.EMPTY)
+
+    # Edits
+
+    def insert(self, process):
+        """Add a process; under FCFS it joins the back of the queue."""
+        if process.pid in self.processes:
+            raise ValueError(f"Process {process.pid} is already scheduled")
+        slot = self.next_slot
+        self.next_slot += 1
+        self.processes[process.pid] = process
+        self.slots[process.pid] = slot
+        self.total_burst += process.burst_time
+        if self.policy == 'sjf':
+            self._sjf_add(process.burst_time, slot, 1)
+        else:
+            self._fcfs_add(process, slot, 1)
+
+    def remove(self, pid):
+        process = self.processes[pid]
+        slot = self.slots[pid]
+        if self.policy == 'sjf':
+            self._sjf_add(process.burst_time, slot, -1)
+        else:
+            self._fcfs_add(process, slot, -1)
+        self.total_burst -= process.burst_time
+        del self.processes[pid]
+        del self.slots[pid]
+        return process
+
+    def update(self, pid, burst_time=None, priority=None):
+        """Change a process's burst time and/or priority, keeping its queue position."""
+        process = self.processes[pid]
+        if priority is not None:
+            process.priority = priority  # Neither FCFS nor SJF order depends on it
+        if burst_time is None or burst_time == process.burst_time:
+            return
+        slot = self.slots[pid]
+        if self.policy == 'sjf':
+            self._sjf_add(process.burst_time, slot, -1)
+        else:
+            self._fcfs_add(process, slot, -1)
+        self.total_burst += burst_time - process.burst_time
+        process.burst_time = burst_time
+        process.remaining_time = burst_time
+        if self.policy == 'sjf':
+            self._sjf_add(burst_time, slot, 1)
+        else:
+            self._fcfs_add(process, slot, 1)
+
+    # Queries
+
+    def times(self, pid):
+        """Return (start, finish, waiting, turnaround) for one process."""
+        process = self.processes[pid]
+        slot = self.slots[pid]
+        if self.policy == 'sjf':
+            start = self._sjf_before(process.burst_time, slot)[1]
+        else:
+            _, prefix, gap = self.queue.query(0, slot + 1)
+            start = prefix - process.burst_time + max(0, gap)
+        finish = start + process.burst_time
+        # Waiting and turnaround are measured from time 0, like the batch algorithms
+        return start, finish, start, finish
+
+    def averages(self):
+        """Return (average waiting time, average turnaround time)."""
+        count = len(self.processes)
+        if not count:
+            return 0, 0
+        total_start = self.total_start
+        if self.policy == 'fcfs' and self.queue.root()[2] > 0:
+            # Some process arrives after the CPU goes idle
+            total_start += self.queue.idle_delay()
+        return total_start / count, (total_start + self.total_burst) / count
+
+    def apply(self, scheduler):
+        """Write the current what-if results into a Scheduler for display."""
+        scheduler.reset_processes()
+        scheduler.processes = sorted(self.processes.values(), key=lambda p: self.slots[p.pid])
+        for process in scheduler.processes:
+            start, finish, waiting, turnaround = self.times(process.pid)
+            process.start_time = start
+            process.finish_time = finish
+            process.waiting_time = waiting
+            process.turnaround_time = turnaround
+        order = sorted(scheduler.processes, key=lambda p: p.start_time)
+        scheduler.timeline = [{'pid': p.pid, 'start': p.start_time, 'end': p.finish_time} for p in order]
+
+
+def main():
+    scheduler = Scheduler()
+
+    file_name = input(f"{Fore.GREEN}Process file (default batch1.txt): {Style.RESET_ALL}") or "batch1.txt"
+    if not scheduler.load_from_file(file_name):
+        print(f"{Fore.RED}Failed to load {file_name}{Style.RESET_ALL}")
+        return
+
+    policy = input(f"{Fore.GREEN}Policy (fcfs/sjf): {Style.RESET_ALL}").strip().lower() or 'fcfs'
+    started = time.perf_counter()
+    what_if = IncrementalScheduler(scheduler.processes, policy)
+    print(f"{Fore.GREEN}Built {policy.upper()} what-if view of {len(what_if)} processes "
+          f"in {(time.perf_counter() - started) * 1000:.1f} ms{Style.RESET_ALL}")
+
+    print("Commands: burst PID N | priority PID N | add PID ARRIVAL BURST PRIORITY | remove PID | show PID | table | quit")
+    while True:
+        command = input(f"{Fore.CYAN}what-if> {Style.RESET_ALL}").split()
+        if not command:
+            continue
+        started = time.perf_counter()
+        try:
+            if command[0] == 'quit':
+                break
+            elif command[0] == 'burst':
+                what_if.update(int(command[1]), burst_time=int(command[2]))
+            elif command[0] == 'priority':
+                what_if.update(int(command[1]), priority=int(command[2]))
+            elif command[0] == 'add':
+                what_if.insert(Process(*(int(value) for value in command[1:5])))
+            elif command[0] == 'remove':
+                what_if.remove(int(command[1]))
+            elif command[0] == 'show':
+                start, finish, waiting, turnaround = what_if.times(int(command[1]))
+                print(f"P{command[1]}: Start={start}, Finish={finish}, Wait={waiting}, Turnaround={turnaround}")
+            elif command[0] == 'table':
+                what_if.apply(scheduler)
+                scheduler.display_results(f"What-if {policy.upper()}", summary_only=len(scheduler.processes) > 50)
+                continue
+            else:
+                print(f"{Fore.RED}Unknown command{Style.RESET_ALL}")
+                continue
+        except (KeyError, ValueError, IndexError) as error:
+            print(f"{Fore.RED}Invalid command: {error}{Style.RESET_ALL}")
+            continue
+
+        avg_waiting_time, avg_turnaround_time = what_if.averages()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{Fore.GREEN}Average Waiting Time: {avg_waiting_time:.2f} ms, "
+              f"Average Turnaround Time: {avg_turnaround_time:.2f} ms ({elapsed:.3f} ms){Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import random
+
+import pytest
+
+from mp2 import Process, Scheduler
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashingScheduler(Scheduler):
+    """Stops the run right after writing its first checkpoint."""
+    def save_checkpoint(self, algorithm, state):
+        super().save_checkpoint(algorithm, state)
+        raise Crash
+
+
+def random_processes(seed):
+    rng = random.Random(seed)
+    return [Process(i, rng.randint(0, 30), rng.randint(1, 12), rng.randint(1, 5)) for i in range(rng.randint(2, 25))]
+
+
+def outcome(scheduler):
+    return ([(p.pid, p.start_time, p.finish_time, p.waiting_time, p.turnaround_time) for p in scheduler.processes],
+            scheduler.timeline)
+
+
+@pytest.mark.parametrize("algorithm, arguments", [("fcfs", ()), ("sjf", ()), ("srpt", ()), ("priority", ()),
+                                                  ("round_robin", (3,))])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, algorithm, arguments):
+    checkpoint = str(tmp_path / "run.ckpt")
+    for seed in range(10):
+        uninterrupted = Scheduler()
+        uninterrupted.processes = random_processes(seed)
+        getattr(uninterrupted, algorithm)(*arguments)
+
+        for interval in (1, 3, 7):
+            crashing = CrashingScheduler()
+            crashing.processes = random_processes(seed)
+            crashing.enable_checkpoints(checkpoint, interval)
+            try:
+                getattr(crashing, algorithm)(*arguments)
+            except Crash:
+                resumed = Scheduler()
+                assert resumed.resume_from_checkpoint(checkpoint) == algorithm
+            else:
+                resumed = crashing  # The run finished before its first checkpoint
+            assert outcome(resumed) == outcome(uninterrupted)
+
+
+def finished_scheduler():
+    """Four processes with hand-set results; P3 and P4 waited equally long."""
+    scheduler = Scheduler()
+    scheduler.processes = [Process(1, 0, 5, 2), Process(2, 1, 2, 1), Process(3, 2, 4, 3), Process(4, 6, 1, 1)]
+    for process, waiting_time in zip(scheduler.processes, [0, 4, 5, 5]):
+        process.waiting_time = waiting_time
+        process.turnaround_time = waiting_time + process.burst_time
+    return scheduler
+
+
+def test_top_waiting_processes_are_the_longest_waiters_in_order():
+    scheduler = finished_scheduler()
+    # Equal waits keep load order
+    assert [p.pid for p in scheduler.top_waiting_processes(3)] == [3, 4, 2]
+    assert [p.pid for p in scheduler.top_waiting_processes(10)] == [3, 4, 2, 1]
+    assert list(scheduler.process_rows(scheduler.top_waiting_processes(1))) == [["P3", 2, 4, 3, 5, 9]]
+
+
+def test_export_writes_every_process(tmp_path):
+    scheduler = finished_scheduler()
+    csv_file = tmp_path / "results.csv"
+    assert scheduler.export_results(str(csv_file))
+    assert csv_file.read_text().splitlines() == [
+        ",".join(Scheduler.RESULT_HEADERS), "P1,0,5,2,0,5", "P2,1,2,1,4,6", "P3,2,4,3,5,9", "P4,6,1,1,5,6"]
+
+    jsonl_file = tmp_path / "results.jsonl"
+    assert scheduler.export_results(str(jsonl_file))
+    rows = [json.loads(line) for line in jsonl_file.read_text().splitlines()]
+    assert rows[2] == {"process": "P3", "arrival": 2, "burst": 4, "priority": 3, "waiting_time": 5,
+                       "turnaround_time": 9}
+    assert [row["process"] for row in rows] == ["P1", "P2", "P3", "P4"]
+
+    assert not scheduler.export_results(str(tmp_path / "results.xlsx"))
+
+
+def test_paged_output_stops_when_asked(monkeypatch, capsys):
+    answers = iter(["", "q"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    Scheduler().print_paged(([f"P{i}", i] for i in range(10)), ["Process", "Value"], "plain", page_size=3)
+    shown = capsys.readouterr().out
+    assert "P5" in shown and "P6" not in shown
@@ -0,0 +1,62 @@
+import pytest
+
+from mp2_io import BurstProcess, BurstScheduler
+
+
+@pytest.mark.parametrize("bursts", [[], [('disk', 3), ('cpu', 2)], [('cpu', 2), ('disk', 3), ('net', 1), ('cpu', 2)],
+                                    [('cpu', 0)], [('cpu', 4), ('disk', -1), ('cpu', 1)], [('cpu', 4), ('disk', 2)]])
+def test_invalid_bursts_are_rejected(bursts):
+    with pytest.raises(ValueError):
+        BurstProcess(1, 0, bursts)
+
+
+def test_loader_names_the_bad_line(tmp_path):
+    workload = tmp_path / "workload.txt"
+    workload.write_text("pid arrival priority bursts\n1 0 1 cpu:5 disk:3 cpu:2\n2 1 1 cpu:4 disk:2\n")
+    with pytest.raises(ValueError, match="line 3"):
+        BurstScheduler().load_from_file(str(workload))
+
+
+def test_loader_accepts_a_valid_workload(tmp_path):
+    workload = tmp_path / "workload.txt"
+    workload.write_text("pid arrival priority bursts\n1 0 1 cpu:5 disk:3 cpu:2\n2 1 2 cpu:4\n")
+    scheduler = BurstScheduler()
+    assert scheduler.load_from_file(str(workload))
+    assert [process.burst_time for process in scheduler.processes] == [7, 4]
+
+
+# P1 arrives at 0 with cpu:4 disk:3 cpu:2 and P2 at 1 with cpu:2 disk:4 cpu:1.
+# FCFS:             CPU P1 0-4, P2 4-6, idle, P1 7-9, idle, P2 11-12; disk P1 4-7, P2 7-11
+# Round robin q=2:  CPU P1 0-2, P2 2-4, P1 4-6, idle, P2 8-9, idle, P1 11-13; disk P2 4-8, P1 8-11
+@pytest.mark.parametrize("policy, quantum, finish_times, waiting_times, makespan", [
+    ('fcfs', None, [9, 12], [0, 3], 12),
+    ('round_robin', 2, [13, 9], [2, 1], 13),
+])
+def test_two_processes_sharing_a_disk(policy, quantum, finish_times, waiting_times, makespan):
+    scheduler = BurstScheduler()
+    scheduler.processes = [BurstProcess(1, 0, [('cpu', 4), ('disk', 3), ('cpu', 2)]),
+                           BurstProcess(2, 1, [('cpu', 2), ('disk', 4), ('cpu', 1)])]
+    report = scheduler.run(policy, quantum)
+
+    assert [process.finish_time for process in scheduler.processes] == finish_times
+    assert [process.waiting_time for process in scheduler.processes] == waiting_times
+    assert report['makespan'] == makespan
+    assert report['cpu_utilisation'] == pytest.approx(9 / makespan)
+    assert report['device_utilisation'] == {'disk': pytest.approx(7 / makespan)}
+    assert report['throughput'] == pytest.approx(2 / makespan)
+
+
+@pytest.mark.parametrize("quantum", [None, 0, -2])
+def test_round_robin_needs_a_positive_quantum(quantum):
+    scheduler = BurstScheduler()
+    scheduler.processes = [BurstProcess(1, 0, [('cpu', 4)])]
+    with pytest.raises(ValueError):
+        scheduler.run('round_robin', quantum)
+
+
+@pytest.mark.parametrize("policy", ['srtf', 'FCFS', ''])
+def test_unknown_policy_is_rejected(policy):
+    scheduler = BurstScheduler()
+    scheduler.processes = [BurstProcess(1, 0, [('cpu', 4)])]
+    with pytest.raises(ValueError, match="Unknown scheduling policy"):
+        scheduler.run(policy)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from mp2 import Process, Scheduler
+from mp2_whatif import IncrementalScheduler
+
+
+def rescheduled(what_if, policy):
+    """Run the batch algorithm on the what-if view's processes."""
+    scheduler = Scheduler()
+    scheduler.processes = [Process(p.pid, p.arrival_time, p.burst_time, p.priority)
+                           for p in sorted(what_if.processes.values(), key=lambda p: what_if.slots[p.pid])]
+    getattr(scheduler, policy)()
+    return scheduler
+
+
+@pytest.mark.parametrize("policy", ["fcfs", "sjf"])
+@pytest.mark.parametrize("idle", [False, True])
+def test_edits_match_rescheduling(policy, idle):
+    for seed in range(40):
+        rng = random.Random(seed)
+        processes = [Process(i, rng.randint(0, 40) if idle else 0, rng.randint(1, 10), rng.randint(1, 5))
+                     for i in range(rng.randint(1, 30))]
+        what_if = IncrementalScheduler(processes, policy)
+        next_pid = len(processes)
+        for _ in range(30):
+            operation = rng.random()
+            if operation < 0.4:
+                what_if.update(rng.choice(list(what_if.processes)), burst_time=rng.randint(0, 25))
+            elif operation < 0.7 or len(what_if) == 1:
+                what_if.insert(Process(next_pid, rng.randint(0, 60) if idle else 0, rng.randint(1, 30), 1))
+                next_pid += 1
+            else:
+                what_if.remove(rng.choice(list(what_if.processes)))
+
+            scheduler = rescheduled(what_if, policy)
+            assert {p.pid: (p.start_time, p.finish_time, p.waiting_time, p.turnaround_time)
+                    for p in scheduler.processes} == {pid: what_if.times(pid) for pid in what_if.processes}
+            assert what_if.averages() == pytest.approx(scheduler.calculate_statistics()[:2])
+
+
+def test_sjf_handles_huge_bursts():
+    processes = [Process(1, 0, 10 ** 9), Process(2, 0, 3), Process(3, 0, 10 ** 12)]
+    what_if = IncrementalScheduler(processes, 'sjf')
+    what_if.update(2, burst_time=10 ** 15)
+    what_if.insert(Process(4, 0, 7))
+    scheduler = rescheduled(what_if, 'sjf')
+    assert {p.pid: p.start_time for p in scheduler.processes} == \
+        {pid: what_if.times(pid)[0] for pid in what_if.processes}
+
+
+def test_sjf_edit_with_a_new_burst_is_logarithmic():
+    rng = random.Random(0)
+    what_if = IncrementalScheduler([Process(i, 0, rng.randint(1, 10 ** 9)) for i in range(100000)], 'sjf')
+    for pid in range(0, 100000, 10000):
+        visits = what_if.order.visits
+        what_if.update(pid, burst_time=10 ** 9 + pid)  # A burst value not in the queue yet
+        # A few root-to-leaf walks, not a pass over the 100k distinct bursts
+        assert what_if.order.visits - visits < 400
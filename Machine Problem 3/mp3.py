@@ -1,3 +1,20 @@
+import contextlib
+import io
+import os
+import random
+import sys
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+
+from eventsim import EventKernel
+from mp3_log import EventLog, LEVELS, SUMMARY, EVENTS, STATUS, open_sink
+from mp3_metrics import FreeSpaceMetrics
+
+MAX_SIMULATION_TIME = 10000
+# Jobs that could never be allocated that a streamed run keeps for its report
+REJECTED_SAMPLE_SIZE = 20
+
+
 class Job:
     """
     Represents a job with its attributes.
@@ -14,6 +31,7 @@ class Job:
         self.start_time = None
         self.finish_time = None
         self.waiting_time = 0
+        self.allocated_block = None
 
     def __str__(self):
         return f"Job {self.id} (Size: {self.size}, Time: {self.remaining_time}/{self.execution_time})"
@@ -31,6 +49,8 @@ class MemoryBlock:
         self.size = size
         self.is_allocated = False
         self.allocated_job = None
+        self.table = None  # BlockTable indexing this block, if any
+        self.position = None  # Order of this block within its table
 
     def __str__(self):
         if self.is_allocated:
@@ -41,6 +61,480 @@ class MemoryBlock:
             return f"Memory {self.id} (Size: {self.size}, Free: {self.size})"
 
 
+class MaxSegmentTree:
+    """
+    Segment tree over a fixed number of slots holding the maximum value of each range.
+    """
+    def __init__(self, values):
+        """
+        Initializes the tree from a list of slot values.
+        """
+        self.size = 1
+        while self.size < len(values):
+            self.size *= 2
+        self.tree = [-1] * (2 * self.size)
+        self.tree[self.size:self.size + len(values)] = values
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def update(self, index, value):
+        """
+        Sets a slot value and refreshes its ancestors in O(log n).
+        """
+        i = index + self.size
+        self.tree[i] = value
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def max(self):
+        return self.tree[1]
+
+    def find_first(self, threshold, start=0):
+        """
+        Returns the lowest slot index >= start whose value is >= threshold, or None.
+        """
+        tree = self.tree
+        if start >= self.size:
+            return None
+        i = start + self.size
+        while True:
+            if tree[i] >= threshold:
+                # Descend to the leftmost qualifying leaf
+                while i < self.size:
+                    i = 2 * i if tree[2 * i] >= threshold else 2 * i + 1
+                return i - self.size
+            # Climb while this is a right child, then step to the right sibling
+            while i & 1:
+                if i == 1:
+                    return None
+                i //= 2
+            i += 1
+
+
+class OrderedMaxTree:
+    """
+    Values kept in the order of their keys, answering MaxSegmentTree's
+    maximum and find_first queries over key order rather than fixed slots.
+
+    It is a treap: random priorities keep its expected depth O(log n), so
+    adding or removing a key and finding the first key whose value reaches
+    a threshold are O(log n) wherever in the order the key falls.  Nodes
+    live in parallel lists; node 0 is the empty tree.
+    """
+    def __init__(self, seed=0):
+        """
+        Initializes an empty tree.
+        """
+        self.random = random.Random(seed)
+        self.keys = [None]
+        self.values = [float('-inf')]
+        self.best = [float('-inf')]  # Maximum value in each subtree
+        self.priority = [0.0]
+        self.left = [0]
+        self.right = [0]
+        self.free = []  # Nodes of removed keys, reused by later inserts
+        self.root = 0
+
+    def pull(self, node):
+        self.best[node] = max(self.best[self.left[node]], self.values[node], self.best[self.right[node]])
+
+    def split(self, node, key):
+        """
+        Splits a subtree into (keys before `key`, the rest).
+        """
+        if not node:
+            return 0, 0
+        if self.keys[node] < key:
+            before, rest = self.split(self.right[node], key)
+            self.right[node] = before
+            self.pull(node)
+            return node, rest
+        before, rest = self.split(self.left[node], key)
+        self.left[node] = rest
+        self.pull(node)
+        return before, node
+
+    def merge(self, first, second):
+        """
+        Joins two subtrees whose keys are all in order.
+        """
+        if not first or not second:
+            return first or second
+        if self.priority[first] > self.priority[second]:
+            self.right[first] = self.merge(self.right[first], second)
+            self.pull(first)
+            return first
+        self.left[second] = self.merge(first, self.left[second])
+        self.pull(second)
+        return second
+
+    def insert(self, key, value):
+        """
+        Adds a key that is not in the tree yet.
+        """
+        if self.free:
+            node = self.free.pop()
+        else:
+            node = len(self.keys)
+            for column in (self.keys, self.values, self.best, self.priority, self.left, self.right):
+                column.append(0)
+        priority = self.random.random()
+        self.keys[node] = key
+        self.values[node] = self.best[node] = value
+        self.priority[node] = priority
+
+        # Walk down past the nodes that stay above the new one, then split what is below
+        parent = 0
+        child = self.root
+        while child and self.priority[child] > priority:
+            if value > self.best[child]:
+                self.best[child] = value
+            parent = child
+            child = self.left[child] if key < self.keys[child] else self.right[child]
+        self.left[node], self.right[node] = self.split(child, key)
+        self.pull(node)
+        self.attach(parent, key, node)
+
+    def remove(self, key):
+        """
+        Removes a key that is in the tree.
+        """
+        path = []
+        node = self.root
+        while self.keys[node] != key:
+            path.append(node)
+            node = self.left[node] if key < self.keys[node] else self.right[node]
+        self.attach(path[-1] if path else 0, key, self.merge(self.left[node], self.right[node]))
+        self.free.append(node)
+        for ancestor in reversed(path):
+            self.pull(ancestor)
+
+    def attach(self, parent, key, node):
+        """
+        Hangs `node` from `parent` on the side where `key` belongs (at the root when parent is 0).
+        """
+        if not parent:
+            self.root = node
+        elif key < self.keys[parent]:
+            self.left[parent] = node
+        else:
+            self.right[parent] = node
+
+    def max(self):
+        return self.best[self.root]
+
+    def find_first(self, threshold, after=None):
+        """
+        Returns the first key after `after` (from the start when None) whose
+        value is >= threshold, or None.
+        """
+        return self.find_in(self.root, threshold, after)
+
+    def find_in(self, node, threshold, after):
+        if not node or self.best[node] < threshold:
+            return None
+        key = self.keys[node]
+        if after is not None and key <= after:
+            return self.find_in(self.right[node], threshold, after)
+        found = self.find_in(self.left[node], threshold, after)
+        if found is not None:
+            return found
+        if self.values[node] >= threshold:
+            return key
+        # Every key on the right comes after `after`
+        return self.find_in(self.right[node], threshold, None)
+
+
+class BlockTable(list):
+    """
+    A list of memory blocks that also keeps the free blocks indexed by size.
+
+    allocate_block and release_block keep the indexes up to date, so the
+    allocation strategies can answer best-fit and worst-fit queries with a
+    binary search and first-fit queries with a segment tree descent instead
+    of scanning every block.  `metrics` tracks the shape of the free space
+    and is sampled once per tick or event time.
+    """
+    # Whether placing a job carves it out of a larger free area, so one
+    # allocation can shrink the room left for another
+    divisible = False
+
+    def __init__(self, memory_blocks=()):
+        """
+        Initializes a BlockTable over the given blocks, in partition order.
+        """
+        super().__init__(memory_blocks)
+        for position, block in enumerate(self):
+            block.table = self
+            block.position = position
+        # (size, position) of every free block, sorted; ties go to the lower position
+        self.free_blocks = sorted((block.size, block.position) for block in self if not block.is_allocated)
+        # Free size per position (-1 when allocated) for lowest-position first-fit lookups
+        self.free_tree = MaxSegmentTree([-1 if block.is_allocated else block.size for block in self])
+        self.largest_block_size = max((block.size for block in self), default=0)
+        self.metrics = FreeSpaceMetrics()
+        for size, position in self.free_blocks:
+            self.metrics.add(size)
+
+    def mark_allocated(self, block):
+        """
+        Removes a block from the free index.
+        """
+        del self.free_blocks[bisect_left(self.free_blocks, (block.size, block.position))]
+        self.free_tree.update(block.position, -1)
+        self.metrics.remove(block.size)
+
+    def mark_released(self, block):
+        """
+        Adds a block back to the free index.
+        """
+        insort(self.free_blocks, (block.size, block.position))
+        self.free_tree.update(block.position, block.size)
+        self.metrics.add(block.size)
+
+    def find_first_fit(self, size):
+        """
+        Returns the lowest-positioned free block that can hold `size`, or None.
+        """
+        position = self.free_tree.find_first(size)
+        return None if position is None else self[position]
+
+    def find_best_fit(self, size):
+        """
+        Returns the smallest free block that can hold `size`, or None.
+        """
+        index = bisect_left(self.free_blocks, (size, -1))
+        if index == len(self.free_blocks):
+            return None
+        return self[self.free_blocks[index][1]]
+
+    def find_worst_fit(self, size):
+        """
+        Returns the largest free block if it can hold `size`, or None.
+        """
+        if not self.free_blocks or self.free_blocks[-1][0] < size:
+            return None
+        # Among equally large blocks the lowest position wins, like the linear scan
+        largest = self.free_blocks[-1][0]
+        return self[self.free_blocks[bisect_left(self.free_blocks, (largest, -1))][1]]
+
+    def largest_free_size(self):
+        """
+        Returns the size of the largest free block, or 0 if every block is in use.
+        """
+        return self.free_blocks[-1][0] if self.free_blocks else 0
+
+    def advance(self, current_time):
+        """
+        Called by the simulation once per tick or event time, after allocation.
+        """
+        self.metrics.sample(current_time)
+
+    def wake_time(self, now):
+        """
+        Returns when the memory next needs advance() although no job arrives
+        or completes, for event-driven runs, or None.
+        """
+        return None
+
+    def statistics(self, end_time):
+        """
+        Returns extra memory statistics for the simulation results.
+        """
+        return self.metrics.statistics(end_time)
+
+
+class WaitingQueue:
+    """
+    Jobs waiting for memory, indexed by size.
+
+    A retry only offers the strategy the jobs that fit in the largest free
+    block, so when nothing large enough has been released it costs O(1)
+    instead of a pass over the whole backlog.  The policy decides which of
+    the fitting jobs go first: "fifo" (queue order, like a plain waiting
+    list), "smallest", "largest" (largest-first packing) or "sjf" (shortest
+    execution time first); equal keys keep queue order.
+
+    "backfill" is EASY backfilling: the job at the head of the queue starts
+    as soon as it fits, and while it cannot, it holds a reservation for the
+    earliest time memory is expected to free up for it.  Other jobs may
+    jump ahead only if they cannot delay that reservation: they finish
+    before it, or the memory keeps its blocks whole so a job placed now
+    cannot take space the head job is waiting for.
+    """
+    POLICIES = ("fifo", "smallest", "largest", "sjf", "backfill")
+    REMOVED = float('-inf')
+    ANY_SIZE = -sys.float_info.max  # Matched by every queued job's negated size
+
+    def __init__(self, policy="fifo"):
+        """
+        Initializes an empty queue with the given ordering policy.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown waiting queue policy {policy!r}, expected one of {self.POLICIES}")
+        self.policy = policy
+        self.entries = {}  # Sequence number -> (job, time it joined the queue), in queue order
+        self.sequence = 0
+        # fifo and backfill: the negated size of each queued job per sequence
+        # slot, so find_first(-free_size) returns the first job in queue order that fits
+        self.sizes = MaxSegmentTree([self.REMOVED] * 16)
+        # smallest/largest/sjf: the negated size of each queued job keyed by
+        # (size, sequence), (-size, sequence) or (execution time, sequence), so
+        # find_first(-free_size) returns the first job in serving order that fits
+        self.order = OrderedMaxTree()
+        # backfill: (sequence of the head job, time of its reservation)
+        self.reservation = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        """
+        Yields the waiting jobs in queue order.
+        """
+        for job, queued_at in self.entries.values():
+            yield job
+
+    def items(self):
+        """
+        Yields (job, time it joined the queue) in queue order.
+        """
+        return iter(self.entries.values())
+
+    def order_key(self, job):
+        if self.policy == "smallest":
+            return job.size
+        if self.policy == "largest":
+            return -job.size
+        return job.execution_time
+
+    def push(self, job, now):
+        """
+        Adds a job to the back of the queue.
+        """
+        if self.policy in ("fifo", "backfill"):
+            if self.sequence == self.sizes.size:
+                self.make_room()
+            self.sizes.update(self.sequence, -job.size)
+        else:
+            self.order.insert((self.order_key(job), self.sequence), -job.size)
+        self.entries[self.sequence] = (job, now)
+        self.sequence += 1
+
+    def remove(self, sequence):
+        job, queued_at = self.entries.pop(sequence)
+        if self.policy in ("fifo", "backfill"):
+            self.sizes.update(sequence, self.REMOVED)
+        else:
+            self.order.remove((self.order_key(job), sequence))
+
+    def make_room(self):
+        """
+        Renumbers the queued jobs from 0, doubling the slot count if they fill half of it.
+        """
+        capacity = self.sizes.size * 2 if 2 * len(self.entries) >= self.sizes.size else self.sizes.size
+        renumbered = {sequence: index for index, sequence in enumerate(self.entries)}
+        self.entries = dict(enumerate(self.entries.values()))
+        self.sequence = len(self.entries)
+        self.sizes = MaxSegmentTree([-job.size for job, queued_at in self.entries.values()] +
+                                    [self.REMOVED] * (capacity - self.sequence))
+        if self.reservation is not None:
+            self.reservation = (renumbered.get(self.reservation[0]), self.reservation[1])
+
+    def smallest_size(self):
+        """
+        Returns the size of the smallest waiting job.
+        """
+        if self.policy in ("fifo", "backfill"):
+            return -self.sizes.max()
+        return -self.order.max()
+
+    def admits(self, job, now, memory_blocks):
+        """
+        Whether an arriving job may be placed right away instead of joining
+        the queue; under backfilling it must not delay the head job.
+        """
+        if self.policy != "backfill" or not self.entries:
+            return True
+        head = self.sizes.find_first(self.ANY_SIZE)
+        return self.may_backfill(job, now, memory_blocks, head)
+
+    def may_backfill(self, job, now, memory_blocks, head):
+        """
+        Whether `job` can start now without delaying the head job's reservation.
+        """
+        if not memory_blocks.divisible:
+            return True
+        if self.reservation is None or self.reservation[0] != head or self.reservation[1] <= now:
+            self.reservation = (head, reservation_time(self.entries[head][0], memory_blocks, now))
+        return now + job.execution_time <= self.reservation[1]
+
+    def retry(self, memory_blocks, try_allocate, now=0):
+        """
+        Offers the waiting jobs that fit in the largest free block to
+        try_allocate(job, queued_at) in policy order, removing those it
+        allocates, until no remaining job fits.
+        """
+        if not self.entries:
+            return
+        free_size = memory_blocks.largest_free_size()
+        if self.smallest_size() > free_size:
+            return
+
+        if self.policy in ("fifo", "backfill"):
+            # Allocating only shrinks the free blocks, so one pass in queue order suffices
+            start = 0
+            head = self.sizes.find_first(self.ANY_SIZE) if self.policy == "backfill" else None
+            while True:
+                sequence = self.sizes.find_first(-free_size, start)
+                if sequence is None:
+                    break
+                job, queued_at = self.entries[sequence]
+                if sequence != head and head is not None and not self.may_backfill(job, now, memory_blocks, head):
+                    start = sequence + 1
+                    continue
+                if try_allocate(job, queued_at):
+                    self.remove(sequence)
+                    free_size = memory_blocks.largest_free_size()
+                    if sequence == head:
+                        # The next job in line becomes the head
+                        head = self.sizes.find_first(self.ANY_SIZE)
+                        start = 0 if head is None else head
+                        continue
+                start = sequence + 1
+            return
+
+        # Allocating only shrinks the free blocks, so one pass in serving order suffices
+        key = None
+        while True:
+            key = self.order.find_first(-free_size, key)
+            if key is None:
+                break
+            sequence = key[1]
+            job, queued_at = self.entries[sequence]
+            if try_allocate(job, queued_at):
+                self.remove(sequence)
+                free_size = memory_blocks.largest_free_size()
+
+
+def reservation_time(job, memory_blocks, now):
+    """
+    Returns when memory is expected to free up for a waiting job: the
+    earliest finish of a running job whose block could hold it, or, when
+    blocks split and merge, the time every running job has finished.
+    """
+    finish_times = [block.allocated_job.start_time + block.allocated_job.execution_time
+                    for block in memory_blocks if block.is_allocated
+                    and (memory_blocks.divisible or block.size >= job.size)]
+    if not finish_times:
+        return now
+    if memory_blocks.divisible:
+        return max(finish_times)
+    return min(finish_times)
+
+
 def initialize_jobs():
     """
     Initializes a list of Job objects based on the provided data.
@@ -98,6 +592,13 @@ def first_fit(job, memory_blocks):
     """
     Allocates memory to a job using the First-Fit algorithm.
     """
+    if isinstance(memory_blocks, BlockTable):
+        block = memory_blocks.find_first_fit(job.size)
+        if block is None:
+            return False
+        allocate_block(job, block)
+        return True
+
     for i, block in enumerate(memory_blocks):
         if not block.is_allocated and block.size >= job.size:
             allocate_block(job, block)
@@ -109,6 +610,13 @@ def worst_fit(job, memory_blocks):
     """
     Allocates memory to a job using the Worst-Fit algorithm.
     """
+    if isinstance(memory_blocks, BlockTable):
+        block = memory_blocks.find_worst_fit(job.size)
+        if block is None:
+            return False
+        allocate_block(job, block)
+        return True
+
     best_block_index = None
     max_diff = -1
     for i, block in enumerate(memory_blocks):
@@ -127,6 +635,13 @@ def best_fit(job, memory_blocks):
     """
     Allocates memory to a job using the Best-Fit algorithm.
     """
+    if isinstance(memory_blocks, BlockTable):
+        block = memory_blocks.find_best_fit(job.size)
+        if block is None:
+            return False
+        allocate_block(job, block)
+        return True
+
     best_block_index = None
     min_diff = float('inf')
     for i, block in enumerate(memory_blocks):
@@ -147,131 +662,414 @@ def allocate_block(job, block):
     """
     block.is_allocated = True
     block.allocated_job = job
-    job.start_time = current_time
-    print(f"Time {current_time}ms: Allocated Job {job.id} to Memory Block {block.id}")
+    job.allocated_block = block
+    if block.table is not None:
+        block.table.mark_allocated(block)
 
 
-def process_jobs(memory_blocks, completed_jobs):
+def release_block(block):
     """
-    Process jobs in memory and return completed jobs.
+    Releases a memory block held by a job.
     """
-    internal_fragmentation = 0
+    block.allocated_job.allocated_block = None
+    block.is_allocated = False
+    block.allocated_job = None
+    if block.table is not None:
+        block.table.mark_released(block)
 
-    # Process running jobs
-    for block in memory_blocks:
-        if block.is_allocated:
-            job = block.allocated_job
-            job.remaining_time -= 1
 
-            # Check if job has completed
-            if job.remaining_time == 0:
-                job.finish_time = current_time
-                print(f"Time {current_time}s: Job {job.id} completed. Releasing Memory Block {block.id}")
+def print_memory_status(memory_blocks):
+    """
+    Print the current status of all memory blocks.
+    """
+    log = EventLog(STATUS)
+    log.status(None, memory_blocks, [])
+    log.flush()
 
-                # Calculate internal fragmentation for this job
-                fragment = block.size - job.size
-                internal_fragmentation += fragment
 
-                # Add to completed jobs
-                completed_jobs.append(job)
+class CompletedJobs:
+    """
+    The jobs a simulation has completed, with running totals for the results.
+    With keep=False only the totals are kept.
+    """
+    def __init__(self, keep=True):
+        """
+        Initializes an empty record.
+        """
+        self.keep = keep
+        self.jobs = []
+        self.count = 0
+        self.total_turnaround_time = 0
+        self.total_waiting_time = 0
+        self.makespan = 0  # Latest finish time
 
-                # Release memory block
-                block.is_allocated = False
-                block.allocated_job = None
+    def append(self, job):
+        # A job's waiting time is final once it has run
+        self.count += 1
+        self.makespan = max(self.makespan, job.finish_time)
+        self.total_turnaround_time += job.finish_time - job.arrival_time
+        self.total_waiting_time += job.waiting_time
+        if self.keep:
+            self.jobs.append(job)
 
-    return internal_fragmentation
+    def __len__(self):
+        return self.count
 
+    def __iter__(self):
+        return iter(self.jobs)
 
-def print_memory_status(memory_blocks):
+
+class RejectedJobs:
     """
-    Print the current status of all memory blocks.
+    The jobs a simulation could never allocate.  With keep=False only the
+    count and the first `sample_size` jobs are kept.
     """
-    print("\nCurrent Memory Status:")
-    for block in memory_blocks:
-        if block.is_allocated:
-            job = block.allocated_job
-            print(f"  Block {block.id} ({block.size}): Job {job.id} ({job.size}) - {job.remaining_time}ms remaining")
+    def __init__(self, keep=True, sample_size=REJECTED_SAMPLE_SIZE):
+        """
+        Initializes an empty record.
+        """
+        self.keep = keep
+        self.sample_size = sample_size
+        self.jobs = []
+        self.count = 0
+
+    def append(self, job):
+        self.count += 1
+        if self.keep or len(self.jobs) < self.sample_size:
+            self.jobs.append(job)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.jobs)
+
+
+class MemorySimulation:
+    """
+    One run of the memory management simulation.
+
+    The simulation owns its clock and all of its state, so separate
+    simulations can run side by side in threads or worker processes.
+    Everything it reports goes through its EventLog.
+    """
+    def __init__(self, jobs, memory_blocks, allocation_strategy, queue_policy="fifo", log=None,
+                 time_limit=MAX_SIMULATION_TIME):
+        """
+        Initializes a simulation of `jobs` on `memory_blocks`.  `log` is an
+        EventLog or a log level; the default logs events without status.
+
+        A list of jobs is put in arrival order here.  Any other iterable,
+        such as a trace streamed from disk, must already be in arrival order;
+        it is read one job at a time and completed jobs are only counted,
+        not kept, so traces larger than memory can be simulated.
+        """
+        # Index the free blocks so the strategies do not rescan every block
+        if not isinstance(memory_blocks, BlockTable):
+            memory_blocks = BlockTable(memory_blocks)
+
+        keep_jobs = isinstance(jobs, list)
+        if keep_jobs:
+            # Jobs arriving in the same tick are handled in list order
+            jobs = sorted(jobs, key=lambda job: max(job.arrival_time, 0))
+        self.arrivals = iter(jobs)
+        self.next_job = next(self.arrivals, None)
+        self.time_limit = time_limit
+
+        self.memory_blocks = memory_blocks
+        self.allocation_strategy = allocation_strategy
+        self.strategy_name = allocation_strategy.__name__.replace('_', ' ').title()
+        self.current_time = 0
+        self.kernel = None  # Event kernel, in event-driven runs only
+        self.log = log if isinstance(log, EventLog) else EventLog(EVENTS if log is None else log)
+
+        self.waiting_jobs = WaitingQueue(queue_policy)
+        self.completed_jobs = CompletedJobs(keep_jobs)
+        self.never_allocated_jobs = RejectedJobs(keep_jobs)
+        self.total_internal_fragmentation = 0
+        self.peak_queue_length = 0
+        self.running = 0
+
+    def arrived_jobs(self, now):
+        """
+        Yields the jobs that have arrived by `now`, in arrival order.
+        """
+        while self.next_job is not None and max(self.next_job.arrival_time, 0) <= now:
+            job = self.next_job
+            self.next_job = next(self.arrivals, None)
+            yield job
+
+    def allocate(self, job):
+        """
+        Places a job with the allocation strategy and starts it if that succeeds.
+        """
+        if not self.allocation_strategy(job, self.memory_blocks):
+            return False
+        block = job.allocated_block
+        job.start_time = self.current_time
+        self.log.event("allocated", self.current_time, job, block)
+        self.running += 1
+        if self.kernel is not None:
+            # Completions run before arrivals at the same time, in block order, like the tick loop
+            self.kernel.schedule(self.current_time + job.remaining_time, self.job_completed, block,
+                                 priority=(0, block.position))
+        return True
+
+    def allocate_waiting(self, job, queued_at):
+        if not self.allocate(job):
+            return False
+        # A waiting job accrues one unit of waiting time per tick spent in the queue
+        job.waiting_time += self.current_time - queued_at
+        self.log.event("allocated_waiting", self.current_time, job)
+        return True
+
+    def job_arrived(self, job):
+        """
+        Allocates an arriving job or puts it in the waiting queue.
+        """
+        if not can_be_allocated(job, self.memory_blocks):
+            self.log.event("rejected", self.current_time, job)
+            self.never_allocated_jobs.append(job)
+        elif self.waiting_jobs.admits(job, self.current_time, self.memory_blocks) and self.allocate(job):
+            self.log.event("arrived_allocated", self.current_time, job)
         else:
-            print(f"  Block {block.id} ({block.size}): Free")
+            self.waiting_jobs.push(job, self.current_time)
+            self.log.event("queued", self.current_time, job)
 
+    def job_completed(self, block):
+        """
+        Finishes the job in a block and releases the block.
+        """
+        job = block.allocated_job
+        job.remaining_time = 0
+        job.finish_time = self.current_time if self.kernel is None else self.kernel.now
+        self.log.event("completed", job.finish_time, job, block)
+
+        # Calculate internal fragmentation for this job
+        self.total_internal_fragmentation += block.size - job.size
+
+        self.completed_jobs.append(job)
+        self.running -= 1
+        release_block(block)
+
+    def process_jobs(self):
+        """
+        Advances every running job by one tick and completes the finished ones.
+        """
+        # Over a copy: releasing a block may merge it with its neighbours
+        for block in list(self.memory_blocks):
+            if block.is_allocated:
+                job = block.allocated_job
+                job.remaining_time -= 1
+                if job.remaining_time == 0:
+                    self.job_completed(block)
+
+    def show_status(self):
+        self.log.status(self.current_time, self.memory_blocks, self.waiting_jobs)
+
+    def run(self, event_driven=False):
+        """
+        Runs the simulation and returns its statistics.
+
+        With event_driven=True the clock jumps between arrivals and completions
+        instead of advancing one unit at a time; the statistics are the same.
+        """
+        self.log.line(SUMMARY, f"\n{'='*50}")
+        self.log.line(SUMMARY, f"Starting {self.strategy_name} Simulation{' (event-driven)' if event_driven else ''}")
+        self.log.line(SUMMARY, f"{'='*50}")
+
+        # Memory statistics are time-weighted from the memory's state at the start
+        self.memory_blocks.advance(self.current_time)
+        end_time = self.run_events() if event_driven else self.run_ticks()
+
+        # Jobs still waiting were charged up to the last tick
+        for job, queued_at in self.waiting_jobs.items():
+            job.waiting_time += end_time - 1 - queued_at
+
+        try:
+            return report_results(self.strategy_name, self.completed_jobs, list(self.waiting_jobs),
+                                  self.never_allocated_jobs, self.memory_blocks, self.total_internal_fragmentation,
+                                  self.peak_queue_length, end_time, self.log)
+        finally:
+            self.log.close()
+
+    def run_ticks(self):
+        """
+        Advances the clock one unit at a time and returns the end time.
+        """
+        memory_blocks = self.memory_blocks
+
+        # Continue simulation until all jobs are completed
+        log = self.log
+        while self.next_job is not None or self.waiting_jobs or self.running:
+            log.line(STATUS, f"\nTime: {self.current_time}s")
+
+            # 1. Process jobs in memory and handle completed jobs
+            self.process_jobs()
+
+            # 2. Try to allocate the waiting jobs that fit in the largest free block
+            self.waiting_jobs.retry(memory_blocks, self.allocate_waiting, self.current_time)
+
+            # 3. Handle arriving jobs
+            for job in self.arrived_jobs(self.current_time):
+                self.job_arrived(job)
+
+            # 4. Track peak queue length
+            self.peak_queue_length = max(self.peak_queue_length, len(self.waiting_jobs))
+            memory_blocks.advance(self.current_time)
+
+            # 5. Record current memory status
+            if (self.running or self.waiting_jobs) and log.wants_status():
+                self.show_status()
+
+            # 6. Advance time if there's still work to do
+            self.current_time += 1
+
+            # Optional: Add a time limit to prevent infinite loops
+            if self.current_time > self.time_limit:
+                log.line(SUMMARY, "Simulation time limit reached. Some jobs may not have completed.")
+                break
+
+        return self.current_time
+
+    def run_events(self):
+        """
+        Runs on the shared event kernel, where job arrivals and completions
+        are events and time jumps directly from one to the next, and returns
+        the end time.
+
+        Work per instant is proportional to what happens at that instant:
+        only waiting jobs that fit in the largest free block are retried,
+        waiting time is charged when a job leaves the queue, and only the
+        next arrival is on the calendar at any time.
+        """
+        kernel = self.kernel = EventKernel()
+        memory_blocks = self.memory_blocks
+        log = self.log
+        arrived_jobs = []
+        wake_timer = None  # Pending instant the memory asked for, see BlockTable.wake_time
+
+        def memory_woke():
+            nonlocal wake_timer
+            wake_timer = None
+
+        def jobs_arrived():
+            # Collect every job arriving now and put the following arrival on the calendar
+            arrived_jobs.extend(self.arrived_jobs(kernel.now))
+            if self.next_job is not None:
+                kernel.schedule(max(self.next_job.arrival_time, 0), jobs_arrived, priority=(1,))
+
+        def end_of_instant(now):
+            self.current_time = now
+            log.line(STATUS, f"\nTime: {now}s")
+
+            self.waiting_jobs.retry(memory_blocks, self.allocate_waiting, self.current_time)
+            for job in arrived_jobs:
+                self.job_arrived(job)
+            arrived_jobs.clear()
+
+            self.peak_queue_length = max(self.peak_queue_length, len(self.waiting_jobs))
+            memory_blocks.advance(now)
+
+            # The tick loop advances the memory every tick while there is work;
+            # visit the instants where that matters
+            nonlocal wake_timer
+            busy = self.next_job is not None or self.waiting_jobs or self.running
+            wake_time = memory_blocks.wake_time(now) if busy else None
+            if wake_timer is not None and wake_timer.time != wake_time:
+                kernel.cancel(wake_timer)
+                wake_timer = None
+            if wake_timer is None and wake_time is not None:
+                wake_timer = kernel.schedule(wake_time, memory_woke, priority=(2,))
+
+            if (self.running or self.waiting_jobs) and log.wants_status():
+                # Remaining times are only materialised for the status printout
+                for block in memory_blocks:
+                    if block.is_allocated:
+                        job = block.allocated_job
+                        job.remaining_time = job.start_time + job.execution_time - now
+                self.show_status()
 
-def run_simulation(jobs, memory_blocks, allocation_strategy):
+        if self.next_job is not None:
+            kernel.schedule(max(self.next_job.arrival_time, 0), jobs_arrived, priority=(1,))
+        kernel.run(until=self.time_limit, after_instant=end_of_instant)
+
+        log.line(SUMMARY, f"Simulation kernel: {kernel.report()}")
+
+        # The tick loop stops one tick after its last busy tick
+        if len(kernel):
+            log.line(SUMMARY, "Simulation time limit reached. Some jobs may not have completed.")
+            return self.time_limit + 1
+        return kernel.now + 1
+
+
+def run_simulation(jobs, memory_blocks, allocation_strategy, event_driven=False, queue_policy="fifo", log=None,
+                   time_limit=MAX_SIMULATION_TIME):
     """
     Runs the memory management simulation with a given allocation strategy.
+
+    With event_driven=True the clock jumps between arrivals and completions
+    instead of advancing one unit at a time; the statistics are the same.
+    queue_policy orders the waiting jobs (see WaitingQueue) and log is an
+    EventLog or a log level from mp3_log.  jobs may also be an iterable in
+    arrival order, such as an mp3_trace.JobTrace.
     """
-    global current_time
-    current_time = 0
-
-    job_queue = jobs.copy()
-    waiting_jobs = []
-    completed_jobs = []
-    never_allocated_jobs = []
-
-    total_internal_fragmentation = 0
-    peak_queue_length = 0
-
-    strategy_name = allocation_strategy.__name__.replace('_', ' ').title()
-    print(f"\n{'='*50}")
-    print(f"Starting {strategy_name} Simulation")
-    print(f"{'='*50}")
-
-    MAX_SIMULATION_TIME = 10000
-
-    # Continue simulation until all jobs are completed
-    while job_queue or waiting_jobs or any(block.is_allocated for block in memory_blocks):
-        print(f"\nTime: {current_time}s")
-
-        # 1. Update waiting time for jobs in waiting queue
-        for job in waiting_jobs:
-            job.waiting_time += 1
-
-        # 2. Process jobs in memory and handle completed jobs
-        internal_frag = process_jobs(memory_blocks, completed_jobs)
-        total_internal_fragmentation += internal_frag
-
-        # 3. Try to allocate waiting jobs
-        waiting_jobs_copy = waiting_jobs.copy()
-        for job in waiting_jobs_copy:
-            if allocation_strategy(job, memory_blocks):
-                waiting_jobs.remove(job)
-                print(f"Time {current_time}s: Allocated waiting Job {job.id}")
-
-        # 4. Handle arriving jobs
-        arrived_jobs = [job for job in job_queue if job.arrival_time <= current_time]
-        for job in arrived_jobs:
-            job_queue.remove(job)
-            if not can_be_allocated(job, memory_blocks):
-                print(f"Job {job.id} is too large for any memory block and will never be allocated.")
-                never_allocated_jobs.append(job)
-                continue
-            if allocation_strategy(job, memory_blocks):
-                print(f"Time {current_time}ms: Job {job.id} arrived and was allocated immediately")
-            else:
-                waiting_jobs.append(job)
-                print(f"Time {current_time}ms: Job {job.id} arrived and was added to waiting queue")
+    return MemorySimulation(jobs, memory_blocks, allocation_strategy, queue_policy, log,
+                            time_limit).run(event_driven)
 
-        # 5. Track peak queue length
-        peak_queue_length = max(peak_queue_length, len(waiting_jobs))
 
-        # 6. Print current memory status
-        if any(block.is_allocated for block in memory_blocks) or waiting_jobs:
-            print_memory_status(memory_blocks)
-            if waiting_jobs:
-                print(f"Waiting Queue: {[f'Job {j.id}' for j in waiting_jobs]}")
+def run_configuration(configuration):
+    """
+    Runs one simulation from a dict of run_simulation keyword arguments, plus
+    an optional "label" for the results, and returns the results together
+    with everything the simulation printed.
+    """
+    configuration = dict(configuration)
+    label = configuration.pop("label", None)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = run_simulation(**configuration)
+    if result and label:
+        result["strategy"] = label
+    return result, output.getvalue()
 
-        # 7. Advance time if there's still work to do
-        current_time += 1
 
-        # Optional: Add a time limit to prevent infinite loops
-        if current_time > MAX_SIMULATION_TIME:
-            print("Simulation time limit reached. Some jobs may not have completed.")
-            break
+def run_parallel(configurations, max_workers=None, show_output=True):
+    """
+    Runs each configuration (see run_configuration) in a worker process and
+    returns the results in the order given, ready for compare_strategies.
+    The output of each run is printed afterwards, one run at a time.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        runs = list(executor.map(run_configuration, configurations))
+    results = []
+    for result, output in runs:
+        if show_output:
+            print(output, end="")
+        results.append(result)
+    return results
+
+
+def report_results(strategy_name, completed_jobs, waiting_jobs, never_allocated_jobs, memory_blocks,
+                   total_internal_fragmentation, peak_queue_length, current_time, log=None):
+    """
+    Prints the statistics of a finished simulation and returns them as a dict.
+    The per-job lines are only written at the EVENTS log level and above.
+    """
+    if log is None:
+        log = EventLog()
 
     # Calculate statistics
     total_jobs = len(completed_jobs)
     if total_jobs > 0:
-        total_turnaround_time = sum(job.finish_time - job.arrival_time for job in completed_jobs)
-        total_waiting_time = sum(job.waiting_time for job in completed_jobs)
+        if isinstance(completed_jobs, CompletedJobs):
+            total_turnaround_time = completed_jobs.total_turnaround_time
+            total_waiting_time = completed_jobs.total_waiting_time
+            makespan = completed_jobs.makespan
+        else:
+            total_turnaround_time = sum(job.finish_time - job.arrival_time for job in completed_jobs)
+            total_waiting_time = sum(job.waiting_time for job in completed_jobs)
+            makespan = max(job.finish_time for job in completed_jobs)
 
         avg_turnaround_time = total_turnaround_time / total_jobs
         avg_waiting_time = total_waiting_time / total_jobs
@@ -279,38 +1077,61 @@ def run_simulation(jobs, memory_blocks, allocation_strategy):
         throughput = total_jobs / current_time if current_time > 0 else 0
 
         # Print statistics
-        print(f"\n{'='*50}")
-        print(f"{strategy_name} Simulation Results:")
-        print(f"{'='*50}")
-        print(f"Simulation ended at time: {current_time}ms")
-        print(f"Total jobs completed: {total_jobs}")
-        print(f"Average waiting time: {avg_waiting_time:.2f}ms")
-        print(f"Average turnaround time: {avg_turnaround_time:.2f}ms")
-        print(f"Throughput: {throughput:.4f} jobs/ms")
-        print(f"Average internal fragmentation: {avg_internal_fragmentation:.2f} bytes per job")
-        print(f"Peak waiting queue length: {peak_queue_length}")
+        log.line(SUMMARY, f"\n{'='*50}")
+        log.line(SUMMARY, f"{strategy_name} Simulation Results:")
+        log.line(SUMMARY, f"{'='*50}")
+        log.line(SUMMARY, f"Simulation ended at time: {current_time}ms")
+        log.line(SUMMARY, f"Total jobs completed: {total_jobs}")
+        log.line(SUMMARY, f"Average waiting time: {avg_waiting_time:.2f}ms")
+        log.line(SUMMARY, f"Average turnaround time: {avg_turnaround_time:.2f}ms")
+        log.line(SUMMARY, f"Throughput: {throughput:.4f} jobs/ms")
+        log.line(SUMMARY, f"Average internal fragmentation: {avg_internal_fragmentation:.2f} bytes per job")
+        log.line(SUMMARY, f"Peak waiting queue length: {peak_queue_length}")
+        memory_statistics = memory_blocks.statistics(current_time) if isinstance(memory_blocks, BlockTable) else {}
+        tables = {}
+        for name, value in memory_statistics.items():
+            if isinstance(value, list):
+                tables[name] = value  # Rows such as per-class statistics, printed after the scalars
+                continue
+            log.line(SUMMARY, f"{name.replace('_', ' ').capitalize()}: {value:.4f}" if isinstance(value, float)
+                     else f"{name.replace('_', ' ').capitalize()}: {value}")
+        for name, rows in tables.items():
+            log.line(SUMMARY, f"{name.replace('_', ' ').capitalize()}:")
+            for row in rows:
+                log.line(SUMMARY, "  " + ", ".join(f"{key.replace('_', ' ')} {value:.4f}" if isinstance(value, float)
+                                                    else f"{key.replace('_', ' ')} {value}"
+                                                    for key, value in row.items()))
 
         if waiting_jobs:
-            print(f"\nJobs still waiting at end of simulation: {[job.id for job in waiting_jobs]}")
+            log.line(SUMMARY, f"\nJobs still waiting at end of simulation: {[job.id for job in waiting_jobs]}")
         if never_allocated_jobs:
-            print(f"\nJobs that could never be allocated: {[job.id for job in never_allocated_jobs]}")
+            shown = [job.id for job in never_allocated_jobs]
+            hidden = len(never_allocated_jobs) - len(shown)  # Beyond the sample of a streamed run
+            log.line(SUMMARY, f"\nJobs that could never be allocated: {shown}"
+                     + (f" and {hidden} more" if hidden else ""))
         incomplete_jobs = [block.allocated_job for block in memory_blocks if block.is_allocated]
         if incomplete_jobs:
-            print(f"\nJobs still running at end of simulation: {[job.id for job in incomplete_jobs]}")
+            log.line(SUMMARY, f"\nJobs still running at end of simulation: {[job.id for job in incomplete_jobs]}")
 
         for job in completed_jobs:
-            print(f"Job {job.id}: Waiting Time = {job.waiting_time}, Completion Time = {job.finish_time}")
-
-        return {
+            log.line(EVENTS, f"Job {job.id}: Waiting Time = {job.waiting_time}, Completion Time = {job.finish_time}")
+        results = {
             "strategy": strategy_name,
             "avg_waiting_time": avg_waiting_time,
             "avg_turnaround_time": avg_turnaround_time,
             "throughput": throughput,
             "avg_internal_fragmentation": avg_internal_fragmentation,
-            "peak_queue_length": peak_queue_length
+            "peak_queue_length": peak_queue_length,
+            "jobs_completed": total_jobs,
+            "makespan": makespan,
+            **memory_statistics
         }
+        log.summary(results)
+        log.flush()
+        return results
     else:
-        print("No jobs completed in simulation")
+        log.line(SUMMARY, "No jobs completed in simulation")
+        log.flush()
         return None
 
 
@@ -334,27 +1155,37 @@ def compare_strategies(results):
 
 
 def can_be_allocated(job, memory_blocks):
+    if isinstance(memory_blocks, BlockTable):
+        return memory_blocks.largest_block_size >= job.size
     return any(block.size >= job.size for block in memory_blocks)
 
 
 if __name__ == "__main__":
-    current_time = 0
-    results = []
-
-    # Run First-Fit Simulation
-    jobs = initialize_jobs()
-    memory_blocks = initialize_memory_blocks()
-    results.append(run_simulation(jobs, memory_blocks, first_fit))
+    # Pass --event-driven to jump between arrivals and completions instead of ticking,
+    # --queue fifo|smallest|largest|sjf|backfill to choose which waiting jobs are served first
+    # and --workers N to limit the number of worker processes.
+    # --log silent|summary|events|status sets how much is printed (status adds
+    # the memory status after every tick) and --log-file NAME.jsonl|NAME.bin
+    # also records every event to NAME_<strategy>.jsonl or .bin
+    event_driven = "--event-driven" in sys.argv
+    queue_policy = sys.argv[sys.argv.index("--queue") + 1] if "--queue" in sys.argv else "fifo"
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    log_level = LEVELS[sys.argv[sys.argv.index("--log") + 1]] if "--log" in sys.argv else EVENTS
+    log_file = sys.argv[sys.argv.index("--log-file") + 1] if "--log-file" in sys.argv else None
 
-    # Run Worst-Fit Simulation
-    jobs = initialize_jobs()
-    memory_blocks = initialize_memory_blocks()
-    results.append(run_simulation(jobs, memory_blocks, worst_fit))
+    def event_log(strategy):
+        if log_file is None:
+            return log_level
+        name, extension = os.path.splitext(log_file)
+        return EventLog(log_level, sink=open_sink(f"{name}_{strategy.__name__}{extension}"))
 
-    # Run Best-Fit Simulation
-    jobs = initialize_jobs()
-    memory_blocks = initialize_memory_blocks()
-    results.append(run_simulation(jobs, memory_blocks, best_fit))
+    # Run the First-Fit, Worst-Fit and Best-Fit simulations side by side
+    configurations = [
+        {"jobs": initialize_jobs(), "memory_blocks": initialize_memory_blocks(), "allocation_strategy": strategy,
+         "event_driven": event_driven, "queue_policy": queue_policy, "log": event_log(strategy)}
+        for strategy in (first_fit, worst_fit, best_fit)
+    ]
+    results = run_parallel(configurations, workers)
 
     # Compare strategies
     compare_strategies(results)
@@ -0,0 +1,73 @@
+"""
+Compares the waiting-queue admission policies on the same job set.
+
+Every policy runs with every allocation strategy on the fixed partitions
+and on variable partitions of the same total size, and the report shows
+throughput and makespan for each, with the change relative to plain FIFO
+admission.
+"""
+import sys
+
+from mp3 import WaitingQueue, first_fit, best_fit, worst_fit, run_parallel
+from mp3_buddy import scaled_workload
+from mp3_log import SILENT
+from mp3_variable import VariablePartitionMemory
+
+
+def admission_configurations(copies, event_driven):
+    """
+    Returns run_parallel configurations for every memory model, strategy and policy.
+    """
+    configurations = []
+    for memory in ("Fixed", "Var"):
+        for strategy in (first_fit, best_fit, worst_fit):
+            for policy in WaitingQueue.POLICIES:
+                jobs, memory_blocks = scaled_workload(copies)
+                if memory == "Var":
+                    memory_blocks = VariablePartitionMemory(sum(block.size for block in memory_blocks))
+                configurations.append({
+                    "jobs": jobs, "memory_blocks": memory_blocks, "allocation_strategy": strategy,
+                    "event_driven": event_driven, "queue_policy": policy, "log": SILENT,
+                    "label": f"{memory} {strategy.__name__.replace('_', ' ').title()}|{policy}"
+                })
+    return configurations
+
+
+def display_admission(results):
+    """
+    Prints throughput, makespan and waiting time per policy, with gains over
+    FIFO; the gains show "-" when the FIFO run completed no jobs.
+    """
+    print("\n" + "="*96)
+    print("Admission Policies (gains relative to fifo)")
+    print("="*96)
+    print(f"{'Memory / Strategy':<20} {'Policy':<10} {'Completed':<10} {'Throughput':<11} {'Gain':<9} "
+          f"{'Makespan':<9} {'Gain':<9} {'Avg Wait':<9}")
+    print("-"*96)
+    baselines = {}
+    for result in results:
+        if result:
+            name, policy = result["strategy"].split("|")
+            if policy == "fifo":
+                baselines[name] = result
+    for result in results:
+        if not result:
+            continue
+        name, policy = result["strategy"].split("|")
+        baseline = baselines.get(name)
+        if baseline is None:
+            throughput_gain = makespan_gain = "-"
+        else:
+            throughput_gain = f"{result['throughput'] / baseline['throughput'] - 1:+.2%}"
+            # A shorter makespan is a gain
+            makespan_gain = f"{baseline['makespan'] / result['makespan'] - 1 if result['makespan'] else 0.0:+.2%}"
+        print(f"{name:<20} {policy:<10} {result['jobs_completed']:<10} {result['throughput']:<11.4f} "
+              f"{throughput_gain:<9} {result['makespan']:<9} {makespan_gain:<9} "
+              f"{result['avg_waiting_time']:<9.2f}")
+
+
+if __name__ == "__main__":
+    # Pass --scale N to repeat the default workload N times and --event-driven to jump between events
+    copies = int(sys.argv[sys.argv.index("--scale") + 1]) if "--scale" in sys.argv else 1
+    event_driven = "--event-driven" in sys.argv
+    display_admission(run_parallel(admission_configurations(copies, event_driven), show_output=False))
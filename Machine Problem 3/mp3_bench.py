@@ -0,0 +1,253 @@
+"""
+Benchmark suite for the allocation strategies.
+
+Workloads are generated from a seed, so every run of the suite measures
+the same jobs and partitions.  Job sizes follow one of three
+distributions and arrivals one of two patterns:
+
+    uniform       sizes evenly spread over the partition size range
+    bimodal       mostly small jobs with a minority of large ones
+    heavy-tailed  Pareto sizes: many small jobs and a few near the largest partition
+
+    burst         a batch of jobs every BURST_INTERVAL ticks
+    poisson       exponential gaps between arrivals
+
+Arrival rates scale with the number of partitions so every scale runs at
+about the same load.  Each case times one run_simulation per strategy (the
+best of --repeat runs), counts allocations per second, and measures the
+simulation's peak memory with tracemalloc in a separate run, since
+tracing slows the timed runs down.  The results are printed and written
+as JSON so runs of different versions can be compared with --compare.
+"""
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from mp3 import Job, MemoryBlock, initialize_memory_blocks, run_simulation, first_fit, best_fit, worst_fit
+from mp3_log import SILENT
+
+SIZE_DISTRIBUTIONS = ("uniform", "bimodal", "heavy-tailed")
+ARRIVAL_PATTERNS = ("burst", "poisson")
+MIN_JOB_SIZE = 100
+MAX_JOB_SIZE = 9500  # The largest default partition
+MAX_EXECUTION_TIME = 12
+LOAD = 0.8  # Arriving work as a fraction of what the partitions can run
+BURST_INTERVAL = 10
+DEFAULT_SCALES = ((100, 1000), (1000, 10000), (10000, 100000))
+# Results go to the temporary directory unless --output names a file to keep
+DEFAULT_OUTPUT = os.path.join(tempfile.gettempdir(), "bench_results.json")
+FORMAT_VERSION = 1
+
+
+def job_size(distribution, rng):
+    """
+    Draws one job size from a size distribution.
+    """
+    if distribution == "uniform":
+        size = rng.uniform(MIN_JOB_SIZE, MAX_JOB_SIZE)
+    elif distribution == "bimodal":
+        size = rng.gauss(1500, 400) if rng.random() < 0.8 else rng.gauss(8000, 800)
+    elif distribution == "heavy-tailed":
+        size = 500 * rng.paretovariate(1.2)
+    else:
+        raise ValueError(f"Unknown size distribution {distribution!r}, expected one of {SIZE_DISTRIBUTIONS}")
+    return min(MAX_JOB_SIZE, max(MIN_JOB_SIZE, round(size)))
+
+
+def arrival_times(pattern, count, rate, rng):
+    """
+    Yields `count` arrival times for `rate` jobs per tick on average.
+    """
+    if pattern == "burst":
+        burst = max(1, round(rate * BURST_INTERVAL))
+        for i in range(count):
+            yield i // burst * BURST_INTERVAL
+    elif pattern == "poisson":
+        now = 0.0
+        for _ in range(count):
+            now += rng.expovariate(rate)
+            yield int(now)
+    else:
+        raise ValueError(f"Unknown arrival pattern {pattern!r}, expected one of {ARRIVAL_PATTERNS}")
+
+
+def generate_partitions(count, seed=0):
+    """
+    Returns (id, size) tuples for `count` partitions drawn from the default partition sizes.
+    """
+    rng = random.Random(seed)
+    sizes = [block.size for block in initialize_memory_blocks()]
+    return [(i + 1, rng.choice(sizes)) for i in range(count)]
+
+
+def generate_jobs(count, block_count, distribution="uniform", pattern="poisson", seed=0):
+    """
+    Returns (id, arrival time, size, execution time) tuples for `count` jobs,
+    arriving fast enough to keep about LOAD of `block_count` partitions busy.
+    """
+    rng = random.Random(seed)
+    rate = LOAD * block_count / ((1 + MAX_EXECUTION_TIME) / 2)
+    arrivals = list(arrival_times(pattern, count, rate, rng))
+    return [(i + 1, arrivals[i], job_size(distribution, rng), rng.randint(1, MAX_EXECUTION_TIME))
+            for i in range(count)]
+
+
+def workload(jobs, blocks):
+    """
+    Returns fresh Job and MemoryBlock objects for the job and partition tuples.
+    """
+    return [Job(*job) for job in jobs], [MemoryBlock(*block) for block in blocks]
+
+
+def benchmark(strategy, block_count, job_count, distribution, pattern, seed=0, repeat=1, event_driven=False,
+              measure_memory=True):
+    """
+    Times run_simulation for one strategy on one generated workload and returns a result record.
+    """
+    blocks = generate_partitions(block_count, seed)
+    jobs = generate_jobs(job_count, block_count, distribution, pattern, seed)
+
+    seconds = math.inf
+    for _ in range(repeat):
+        # Building the Job and MemoryBlock objects is not timed
+        run_jobs, run_blocks = workload(jobs, blocks)
+        started = time.perf_counter()
+        result = run_simulation(run_jobs, run_blocks, strategy, event_driven, log=SILENT)
+        seconds = min(seconds, time.perf_counter() - started)
+    result = result or {}
+    # Every job that started either completed or was still running at the end
+    allocations = sum(job.start_time is not None for job in run_jobs)
+
+    peak_memory = None
+    if measure_memory:
+        run_jobs, run_blocks = workload(jobs, blocks)
+        tracemalloc.start()
+        run_simulation(run_jobs, run_blocks, strategy, event_driven, log=SILENT)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "strategy": strategy.__name__,
+        "blocks": block_count,
+        "jobs": job_count,
+        "sizes": distribution,
+        "arrivals": pattern,
+        "seed": seed,
+        "event_driven": event_driven,
+        "seconds": seconds,
+        "allocations": allocations,
+        "allocations_per_second": allocations / seconds if seconds else 0.0,
+        "jobs_completed": result.get("jobs_completed", 0),
+        "throughput": result.get("throughput", 0.0),
+        "makespan": result.get("makespan", 0),
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def case_key(record):
+    return (record["strategy"], record["blocks"], record["jobs"], record["sizes"], record["arrivals"],
+            record["seed"], record["event_driven"])
+
+
+def current_commit():
+    """
+    Returns the git commit of the working tree, or None outside a repository.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(filename, records, parameters):
+    """
+    Writes the result records with enough context to compare runs of different versions.
+    """
+    document = {
+        "format_version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": records
+    }
+    with open(filename, "w") as file:
+        json.dump(document, file, indent=2)
+        file.write("\n")
+
+
+def display_benchmarks(records, baseline=None):
+    """
+    Prints the result records; with a baseline document, also the speed-up
+    over the matching case in it.
+    """
+    previous = {case_key(record): record for record in baseline["results"]} if baseline else {}
+    print("\n" + "="*112)
+    print("Allocation Benchmarks" + (f" (speed-up over {baseline.get('commit') or 'baseline'})" if baseline else ""))
+    print("="*112)
+    print(f"{'Strategy':<10} {'Blocks':<7} {'Jobs':<8} {'Sizes':<13} {'Arrivals':<9} {'Seconds':<9} "
+          f"{'Allocs/s':<10} {'Completed':<10} {'Peak KiB':<10} {'Speed-up':<8}")
+    print("-"*112)
+    for r in records:
+        peak = f"{r['peak_memory_bytes'] / 1024:.0f}" if r["peak_memory_bytes"] is not None else "-"
+        before = previous.get(case_key(r))
+        speed_up = f"{before['seconds'] / r['seconds']:.2f}x" if before and r["seconds"] else "-"
+        print(f"{r['strategy']:<10} {r['blocks']:<7} {r['jobs']:<8} {r['sizes']:<13} {r['arrivals']:<9} "
+              f"{r['seconds']:<9.3f} {r['allocations_per_second']:<10.0f} {r['jobs_completed']:<10} {peak:<10} "
+              f"{speed_up:<8}")
+
+
+def parse_scales(text):
+    """
+    Parses scales written as BLOCKSxJOBS,BLOCKSxJOBS,...
+    """
+    scales = []
+    for scale in text.split(","):
+        blocks, _, jobs = scale.partition("x")
+        scales.append((int(blocks), int(jobs)))
+    return scales
+
+
+if __name__ == "__main__":
+    # Usage: mp3_bench.py [--scales 100x1000,1000x10000] [--sizes uniform,bimodal,heavy-tailed]
+    #        [--arrivals burst,poisson] [--strategies first_fit,best_fit,worst_fit] [--seed S] [--repeat N]
+    #        [--event-driven] [--no-memory] [--output FILE] [--compare FILE]
+    scales = parse_scales(sys.argv[sys.argv.index("--scales") + 1]) if "--scales" in sys.argv \
+        else list(DEFAULT_SCALES)
+    distributions = sys.argv[sys.argv.index("--sizes") + 1].split(",") if "--sizes" in sys.argv \
+        else list(SIZE_DISTRIBUTIONS)
+    patterns = sys.argv[sys.argv.index("--arrivals") + 1].split(",") if "--arrivals" in sys.argv \
+        else list(ARRIVAL_PATTERNS)
+    strategies = {s.__name__: s for s in (first_fit, best_fit, worst_fit)}
+    names = sys.argv[sys.argv.index("--strategies") + 1].split(",") if "--strategies" in sys.argv \
+        else list(strategies)
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+    event_driven = "--event-driven" in sys.argv
+    measure_memory = "--no-memory" not in sys.argv
+    output = sys.argv[sys.argv.index("--output") + 1] if "--output" in sys.argv else DEFAULT_OUTPUT
+    baseline = None
+    if "--compare" in sys.argv:
+        with open(sys.argv[sys.argv.index("--compare") + 1]) as file:
+            baseline = json.load(file)
+
+    records = [benchmark(strategies[name], blocks, jobs, distribution, pattern, seed, repeat, event_driven,
+                         measure_memory)
+               for blocks, jobs in scales for distribution in distributions for pattern in patterns
+               for name in names]
+    write_results(output, records, {
+        "scales": scales, "sizes": distributions, "arrivals": patterns, "strategies": names, "seed": seed,
+        "repeat": repeat, "event_driven": event_driven, "load": LOAD
+    })
+    display_benchmarks(records, baseline)
+    print(f"\nResults written to {output}")
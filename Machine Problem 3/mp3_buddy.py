@@ -0,0 +1,209 @@
+import sys
+
+from mp3 import (Job, MemoryBlock, BlockTable, initialize_jobs, initialize_memory_blocks, first_fit, best_fit,
+                 worst_fit, allocate_block, run_parallel, compare_strategies)
+
+MIN_BLOCK_SIZE = 64
+
+
+class BuddyMemory(BlockTable):
+    """
+    Memory managed by a binary buddy system.
+
+    Every block is a power of two in size and aligned to its size.  A job
+    gets the smallest such block that holds it, splitting larger blocks in
+    half as needed; a released block merges with its buddy (the other half
+    of the block it was split from) whenever that buddy is free too.  There
+    is one free list per order, and every block is found by its start
+    address, so a split or merge costs O(1) and an allocation or release
+    O(log maxsize).  The rounding up to a power of two shows up as internal
+    fragmentation.  A block's position is its start address.
+
+    The blocks are kept by address rather than in the list itself, and
+    iterating over the memory walks them in address order.
+    """
+    divisible = True
+
+    def __init__(self, total_size, min_block_size=MIN_BLOCK_SIZE):
+        """
+        Initializes the region, covered by the largest aligned power-of-two
+        blocks that fit; bytes below min_block_size at the end go unused.
+        """
+        self.blocks = {}  # Start address -> block, for every block
+        self.total_size = 0  # Grows as the blocks are added below; iteration stops here
+        # The region starts with no blocks, so the BlockTable indexes start empty
+        super().__init__()
+        self.min_order = min_block_size.bit_length() - 1
+        self.max_order = max(total_size.bit_length() - 1, self.min_order)
+        self.next_block_id = 1
+        # free_lists[order] maps start address -> free block of size 2 ** order
+        self.free_lists = [{} for _ in range(self.max_order + 1)]
+        self.splits = 0
+        self.merges = 0
+
+        address = 0
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if total_size - address >= 1 << order:
+                self.free_lists[order][address] = self.new_block(address, 1 << order)
+                self.metrics.add(1 << order)
+                address += 1 << order
+        self.total_size = address
+        self.largest_block_size = 1 << self.max_order if address else 0
+
+    def new_block(self, address, size):
+        """
+        Creates a block at `address`.
+        """
+        block = MemoryBlock(self.next_block_id, size)
+        self.next_block_id += 1
+        block.table = self
+        block.position = address
+        self.blocks[address] = block
+        return block
+
+    def __iter__(self):
+        """
+        Yields the blocks in address order.
+        """
+        address = 0
+        while address < self.total_size:
+            block = self.blocks[address]
+            yield block
+            address += block.size
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def order_for(self, size):
+        """
+        Returns the order of the smallest block that can hold `size`.
+        """
+        return max((size - 1).bit_length(), self.min_order)
+
+    def find_buddy_block(self, size):
+        """
+        Returns a free block of the smallest order that can hold `size`, or None.
+        """
+        for order in range(self.order_for(size), self.max_order + 1):
+            free_list = self.free_lists[order]
+            if free_list:
+                # The most recently freed block of that order
+                return free_list[next(reversed(free_list))]
+        return None
+
+    def mark_allocated(self, block):
+        """
+        Takes the block off its free list and splits it down to the job's order,
+        freeing the upper halves.
+        """
+        order = block.size.bit_length() - 1
+        del self.free_lists[order][block.position]
+        self.metrics.remove(block.size)
+        target = self.order_for(block.allocated_job.size)
+        while order > target:
+            order -= 1
+            block.size = 1 << order
+            upper = block.position + block.size
+            self.free_lists[order][upper] = self.new_block(upper, block.size)
+            self.metrics.add(block.size)
+            self.splits += 1
+
+    def mark_released(self, block):
+        """
+        Returns the block to its free list, merging it with its buddy for as
+        long as the buddy is free.
+        """
+        order = block.size.bit_length() - 1
+        while order < self.max_order:
+            buddy = self.free_lists[order].pop(block.position ^ (1 << order), None)
+            if buddy is None:
+                break
+            self.metrics.remove(buddy.size)
+            # Keep the lower half and drop the upper one from the table
+            lower, upper = (block, buddy) if block.position < buddy.position else (buddy, block)
+            del self.blocks[upper.position]
+            block = lower
+            order += 1
+            block.size = 1 << order
+            self.merges += 1
+        self.free_lists[order][block.position] = block
+        self.metrics.add(block.size)
+
+    def largest_free_size(self):
+        """
+        Returns the size of the largest free block, or 0 if every block is in use.
+        """
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if self.free_lists[order]:
+                return 1 << order
+        return 0
+
+    # Address and size policies all reduce to the buddy search
+    def find_first_fit(self, size):
+        return self.find_buddy_block(size)
+
+    def find_best_fit(self, size):
+        return self.find_buddy_block(size)
+
+    def find_worst_fit(self, size):
+        return self.find_buddy_block(size)
+
+    def statistics(self, end_time):
+        """
+        Returns the free-space statistics and the split and merge counts for the run.
+        """
+        return {
+            **super().statistics(end_time),
+            "splits": self.splits,
+            "merges": self.merges
+        }
+
+
+def buddy_system(job, memory_blocks):
+    """
+    Allocates memory to a job using the binary buddy system.
+
+    memory_blocks must be a BuddyMemory.
+    """
+    if not isinstance(memory_blocks, BuddyMemory):
+        raise TypeError("buddy_system allocation needs a BuddyMemory")
+    block = memory_blocks.find_buddy_block(job.size)
+    if block is None:
+        return False
+    allocate_block(job, block)
+    return True
+
+
+def scaled_workload(copies):
+    """
+    Returns the default jobs and partitions repeated `copies` times, with each
+    copy of the jobs arriving one time unit after the previous one.
+    """
+    jobs = []
+    memory_blocks = []
+    for copy in range(copies):
+        for job in initialize_jobs():
+            jobs.append(Job(len(jobs) + 1, job.arrival_time + copy, job.size, job.execution_time))
+        for block in initialize_memory_blocks():
+            memory_blocks.append(MemoryBlock(len(memory_blocks) + 1, block.size))
+    return jobs, memory_blocks
+
+
+if __name__ == "__main__":
+    # Pass --event-driven to jump between arrivals and completions, --scale N to repeat the workload N times
+    event_driven = "--event-driven" in sys.argv
+    copies = int(sys.argv[sys.argv.index("--scale") + 1]) if "--scale" in sys.argv else 1
+
+    configurations = []
+    for strategy in (first_fit, best_fit, worst_fit):
+        jobs, memory_blocks = scaled_workload(copies)
+        configurations.append({"jobs": jobs, "memory_blocks": memory_blocks, "allocation_strategy": strategy,
+                               "event_driven": event_driven})
+
+    # The buddy system manages the same amount of memory as one contiguous region
+    jobs, memory_blocks = scaled_workload(copies)
+    configurations.append({"jobs": jobs, "memory_blocks": BuddyMemory(sum(block.size for block in memory_blocks)),
+                           "allocation_strategy": buddy_system, "event_driven": event_driven})
+    results = run_parallel(configurations)
+
+    compare_strategies(results)
@@ -0,0 +1,253 @@
+"""
+Simulates memory jobs placed across a cluster of nodes.
+
+Every node has the same memory: the default partitions repeated
+--partitions times, or variable partitions or a buddy system of the same
+total size.  A placement layer assigns each arriving job to a node, and
+each node then runs the ordinary simulation on the jobs it was given, so
+the nodes are simulated independently in parallel worker processes.
+
+The placement layer sees a node as its capacity minus the jobs placed on
+it that have not yet finished, taking a job to finish its execution time
+after it arrives.  Node-local waiting and fragmentation are left to the
+nodes.  The placement policies are:
+
+    first-fit       the lowest-numbered node with room for the job
+    best-fit        the node with the least room that still holds the job
+    least-loaded    the node with the most room
+    two-choices     the roomier of two nodes picked at random
+
+When no node has room, first-fit and best-fit fall back to the
+least-loaded node, where the job waits.  A job placed on a node without
+room for it (a fallback, or a two-choices pick) counts as filling what
+room the node has left, so a node is never seen as more than full.
+"""
+import heapq
+import random
+import statistics
+import sys
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+
+from mp3 import Job, MaxSegmentTree, initialize_memory_blocks, first_fit, best_fit, worst_fit, run_simulation
+from mp3_bench import SIZE_DISTRIBUTIONS, ARRIVAL_PATTERNS, generate_jobs
+from mp3_buddy import BuddyMemory, buddy_system
+from mp3_log import SILENT
+from mp3_variable import VariablePartitionMemory
+
+PLACEMENT_POLICIES = ("first-fit", "best-fit", "least-loaded", "two-choices")
+MEMORY_KINDS = ("fixed", "variable", "buddy")
+DEFAULT_NODE_COUNTS = (100, 1000, 5000)
+DEFAULT_JOBS_PER_NODE = 50
+
+
+class Placement:
+    """
+    The placement layer's view of the nodes and one placement policy.
+    """
+    def __init__(self, policy, node_count, capacity, seed=0):
+        """
+        Initializes every node with its full capacity free.
+        """
+        if policy not in PLACEMENT_POLICIES:
+            raise ValueError(f"Unknown placement policy {policy!r}, expected one of {PLACEMENT_POLICIES}")
+        self.policy = policy
+        self.free = [capacity] * node_count
+        # Room per node, for first-fit and least-loaded; the maximum finds the least-loaded node
+        self.room = MaxSegmentTree(self.free)
+        # (room, node) in increasing order, for best-fit only
+        self.by_room = [(capacity, node) for node in range(node_count)] if policy == "best-fit" else None
+        self.releases = []  # (expected finish time, node, size charged) heap
+        self.random = random.Random(seed)
+        self.overflows = 0  # Jobs placed on a node without room for them
+        self.decisions = 0
+        self.decision_time = 0.0
+
+    def set_free(self, node, free):
+        if self.by_room is not None:
+            del self.by_room[bisect_left(self.by_room, (self.free[node], node))]
+            insort(self.by_room, (free, node))
+        self.free[node] = free
+        self.room.update(node, free)
+
+    def release_until(self, now):
+        """
+        Returns the memory of the jobs expected to finish by `now` to their nodes.
+        """
+        while self.releases and self.releases[0][0] <= now:
+            _, node, size = heapq.heappop(self.releases)
+            self.set_free(node, self.free[node] + size)
+
+    def least_loaded(self):
+        return self.room.find_first(self.room.max())
+
+    def choose(self, size):
+        """
+        Returns the node the policy picks for a job of `size`.
+        """
+        if self.policy == "first-fit":
+            node = self.room.find_first(size)
+        elif self.policy == "best-fit":
+            index = bisect_left(self.by_room, (size, -1))
+            node = self.by_room[index][1] if index < len(self.by_room) else None
+        elif self.policy == "least-loaded":
+            node = self.least_loaded()
+        else:
+            a = self.random.randrange(len(self.free))
+            b = self.random.randrange(len(self.free))
+            node = a if self.free[a] >= self.free[b] else b
+        return node if node is not None else self.least_loaded()
+
+    def place(self, arrival_time, size, execution_time):
+        """
+        Picks a node for a job, records it as running there and returns the node.
+        """
+        started = time.perf_counter()
+        self.release_until(arrival_time)
+        node = self.choose(size)
+        charged = min(size, self.free[node])
+        if charged < size:
+            self.overflows += 1
+        self.set_free(node, self.free[node] - charged)
+        heapq.heappush(self.releases, (arrival_time + execution_time, node, charged))
+        self.decision_time += time.perf_counter() - started
+        self.decisions += 1
+        return node
+
+
+def node_capacity(partitions):
+    return partitions * sum(block.size for block in initialize_memory_blocks())
+
+
+def node_memory(kind, partitions):
+    """
+    Returns a node's memory and the allocation strategy it needs, or None to
+    use the requested one.
+    """
+    if kind == "fixed":
+        return [block for _ in range(partitions) for block in initialize_memory_blocks()], None
+    if kind == "variable":
+        return VariablePartitionMemory(node_capacity(partitions)), None
+    if kind == "buddy":
+        return BuddyMemory(node_capacity(partitions)), buddy_system
+    raise ValueError(f"Unknown memory kind {kind!r}, expected one of {MEMORY_KINDS}")
+
+
+def simulate_node(node):
+    """
+    Runs one node's jobs, given as (memory kind, partitions, strategy,
+    event_driven, job tuples), and returns its summary.
+    """
+    kind, partitions, strategy, event_driven, jobs = node
+    summary = {"jobs": len(jobs), "jobs_completed": 0, "makespan": 0, "total_waiting_time": 0,
+               "utilisation": 0.0}
+    if not jobs:
+        return summary
+    memory_blocks, required_strategy = node_memory(kind, partitions)
+    result = run_simulation([Job(*job) for job in jobs], memory_blocks, required_strategy or strategy,
+                            event_driven, log=SILENT)
+    if result:
+        summary["jobs_completed"] = result["jobs_completed"]
+        summary["makespan"] = result["makespan"]
+        summary["total_waiting_time"] = result["avg_waiting_time"] * result["jobs_completed"]
+        summary["utilisation"] = 1 - result["avg_free_memory"] / node_capacity(partitions)
+    return summary
+
+
+def simulate_cluster(jobs, node_count, policy, kind="fixed", partitions=1, strategy=first_fit,
+                     event_driven=False, executor=None, seed=0):
+    """
+    Places the jobs, given as (id, arrival time, size, execution time)
+    tuples in arrival order, simulates every node and returns the cluster
+    statistics with a summary per node.
+    """
+    placement = Placement(policy, node_count, node_capacity(partitions), seed)
+    assigned = [[] for _ in range(node_count)]
+    for job in jobs:
+        assigned[placement.place(job[1], job[2], job[3])].append(job)
+
+    nodes = [(kind, partitions, strategy, event_driven, node_jobs) for node_jobs in assigned]
+    if executor is None:
+        summaries = list(map(simulate_node, nodes))
+    else:
+        # Nodes are small, so send them to the workers in batches
+        summaries = list(executor.map(simulate_node, nodes, chunksize=max(1, node_count // 64)))
+
+    completed = sum(s["jobs_completed"] for s in summaries)
+    makespan = max(s["makespan"] for s in summaries)
+    utilisations = [s["utilisation"] for s in summaries]
+    loads = [s["jobs"] for s in summaries]
+    return {
+        "policy": policy,
+        "nodes": node_count,
+        "jobs": len(jobs),
+        "jobs_completed": completed,
+        "makespan": makespan,
+        "throughput": completed / makespan if makespan else 0.0,
+        "avg_waiting_time": sum(s["total_waiting_time"] for s in summaries) / completed if completed else 0.0,
+        "overflow_placements": placement.overflows,
+        "placement_us": placement.decision_time / placement.decisions * 1e6 if placement.decisions else 0.0,
+        "avg_utilisation": statistics.fmean(utilisations),
+        "min_utilisation": min(utilisations),
+        "max_utilisation": max(utilisations),
+        "utilisation_stdev": statistics.pstdev(utilisations),
+        # Jobs on the busiest node relative to the average node
+        "load_imbalance": max(loads) / statistics.fmean(loads) if jobs else 0.0,
+        "node_summaries": summaries
+    }
+
+
+def display_cluster_results(results, per_node=False):
+    """
+    Prints the cluster statistics per node count and placement policy.
+    """
+    print("\n" + "="*127)
+    print("Cluster Placement")
+    print("="*127)
+    print(f"{'Nodes':<7} {'Policy':<13} {'Jobs':<8} {'Completed':<10} {'Throughput':<11} {'Avg Wait':<9} "
+          f"{'Place (us)':<11} {'Util Avg':<9} {'Min':<7} {'Max':<7} {'Stdev':<7} {'Imbalance':<9} {'Overflow':<8}")
+    print("-"*127)
+    for r in results:
+        print(f"{r['nodes']:<7} {r['policy']:<13} {r['jobs']:<8} {r['jobs_completed']:<10} {r['throughput']:<11.4f} "
+              f"{r['avg_waiting_time']:<9.2f} {r['placement_us']:<11.2f} {r['avg_utilisation']:<9.2%} "
+              f"{r['min_utilisation']:<7.1%} {r['max_utilisation']:<7.1%} {r['utilisation_stdev']:<7.4f} "
+              f"{r['load_imbalance']:<9.2f} {r['overflow_placements']:<8}")
+    if per_node:
+        for r in results:
+            print(f"\n{r['nodes']} nodes, {r['policy']}:")
+            print(f"{'Node':<7} {'Jobs':<6} {'Completed':<10} {'Makespan':<9} {'Utilisation':<11}")
+            for node, s in enumerate(r["node_summaries"]):
+                print(f"{node:<7} {s['jobs']:<6} {s['jobs_completed']:<10} {s['makespan']:<9} "
+                      f"{s['utilisation']:<11.2%}")
+
+
+if __name__ == "__main__":
+    # Usage: mp3_cluster.py [--nodes 100,1000,5000] [--jobs-per-node N] [--policies first-fit,...]
+    #        [--memory fixed|variable|buddy] [--partitions N] [--strategy first_fit|best_fit|worst_fit]
+    #        [--sizes uniform|bimodal|heavy-tailed] [--arrivals burst|poisson] [--seed S] [--workers N]
+    #        [--event-driven] [--per-node]
+    node_counts = [int(n) for n in sys.argv[sys.argv.index("--nodes") + 1].split(",")] \
+        if "--nodes" in sys.argv else list(DEFAULT_NODE_COUNTS)
+    jobs_per_node = int(sys.argv[sys.argv.index("--jobs-per-node") + 1]) if "--jobs-per-node" in sys.argv \
+        else DEFAULT_JOBS_PER_NODE
+    policies = sys.argv[sys.argv.index("--policies") + 1].split(",") if "--policies" in sys.argv \
+        else list(PLACEMENT_POLICIES)
+    kind = sys.argv[sys.argv.index("--memory") + 1] if "--memory" in sys.argv else "fixed"
+    partitions = int(sys.argv[sys.argv.index("--partitions") + 1]) if "--partitions" in sys.argv else 1
+    strategy = {s.__name__: s for s in (first_fit, best_fit, worst_fit)}[
+        sys.argv[sys.argv.index("--strategy") + 1] if "--strategy" in sys.argv else "first_fit"]
+    distribution = sys.argv[sys.argv.index("--sizes") + 1] if "--sizes" in sys.argv else SIZE_DISTRIBUTIONS[0]
+    pattern = sys.argv[sys.argv.index("--arrivals") + 1] if "--arrivals" in sys.argv else ARRIVAL_PATTERNS[1]
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+
+    block_count = len(initialize_memory_blocks()) * partitions
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for node_count in node_counts:
+            jobs = generate_jobs(node_count * jobs_per_node, node_count * block_count, distribution, pattern, seed)
+            for policy in policies:
+                results.append(simulate_cluster(jobs, node_count, policy, kind, partitions, strategy,
+                                                "--event-driven" in sys.argv, executor, seed))
+    display_cluster_results(results, "--per-node" in sys.argv)
@@ -0,0 +1,323 @@
+"""
+Column-backed jobs and memory blocks for large simulations.
+
+JobColumns and BlockColumns keep every numeric field in a typed array,
+one array per field, and hand out views (ColumnJob, ColumnBlock) holding
+only a row number that read and write those arrays through the same
+attribute names as Job and MemoryBlock, so the rest of the simulator works
+on them unchanged.  Job views only exist while the simulation holds the
+job, so a job costs about a quarter of a Job object.
+
+ColumnarSimulation replaces the per-tick pass over every block: each
+allocation files its block under the tick its job will finish, and a tick
+completes just the blocks filed under it, in block order, in one batch.
+Remaining times are only worked out when the memory status is shown.
+Only plain fixed partitions (a BlockTable) can be column-backed, since the
+other memory models add attributes to their blocks.
+
+The completion calendar only pays off in tick mode, where the object run
+passes over every running block each tick, so the gain grows with the run
+length.  Measured with 100k blocks and 100k jobs, first fit:
+
+    ticks    tick mode    event mode
+    2000     1.7-2.0x     0.8x
+    10000    4.4-5.3x     0.8x
+
+An event-driven object run already skips the idle ticks, and there the
+column views cost more than they save; the memory saving (about 41
+instead of 160 bytes per job) holds in both modes.
+"""
+import sys
+import time
+import tracemalloc
+from array import array
+
+from mp3 import (Job, MemoryBlock, BlockTable, CompletedJobs, MemorySimulation, MAX_SIMULATION_TIME, first_fit,
+                 best_fit, worst_fit)
+from mp3_log import SILENT
+
+NONE = -1  # Stored in place of None in integer columns
+
+
+def column_property(values, optional=False):
+    """
+    Returns a property reading and writing a view's row of the `values` column.
+    """
+    if optional:
+        def get(self):
+            value = values[self.index]
+            return None if value == NONE else value
+
+        def set(self, value):
+            values[self.index] = NONE if value is None else value
+    else:
+        def get(self):
+            return values[self.index]
+
+        def set(self, value):
+            values[self.index] = value
+    return property(get, set)
+
+
+def bind_view(view_class, columns, fields, optional=()):
+    """
+    Returns a subclass of view_class whose properties read the columns of one table.
+    """
+    namespace = {"__slots__": ()}
+    for field in fields:
+        namespace[field] = column_property(getattr(columns, field), field in optional)
+    return type(view_class.__name__, (view_class,), namespace)
+
+
+class ColumnJob:
+    """
+    A job stored as one row of a JobColumns table.
+    """
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    __str__ = Job.__str__
+
+
+class JobColumns:
+    """
+    Jobs stored field by field in typed arrays.
+
+    Views are made on demand, so a job the simulation is not holding on to
+    costs only its row: 4 bytes per field plus a pointer to its block.
+    """
+    FIELDS = ("id", "arrival_time", "size", "execution_time", "remaining_time", "start_time", "finish_time",
+              "waiting_time", "allocated_block")
+    TYPECODES = {"id": "I", "size": "I"}  # Unsigned like trace records; times are signed
+
+    def __init__(self, jobs=()):
+        """
+        Initializes the table from (id, arrival time, size, execution time)
+        tuples or Job objects.
+        """
+        for field in self.FIELDS[:-1]:
+            setattr(self, field, array(self.TYPECODES.get(field, "i")))
+        self.allocated_block = []
+        self.View = bind_view(ColumnJob, self, self.FIELDS, optional=("start_time", "finish_time"))
+        for job in jobs:
+            if isinstance(job, tuple):
+                self.append(*job)
+            else:
+                self.append(job.id, job.arrival_time, job.size, job.execution_time)
+
+    def append(self, id, arrival_time, size, execution_time):
+        self.id.append(id)
+        self.arrival_time.append(arrival_time)
+        self.size.append(size)
+        self.execution_time.append(execution_time)
+        self.remaining_time.append(execution_time)
+        self.start_time.append(NONE)
+        self.finish_time.append(NONE)
+        self.waiting_time.append(0)
+        self.allocated_block.append(None)
+
+    def __len__(self):
+        return len(self.id)
+
+    def __getitem__(self, index):
+        return self.View(index)
+
+    def __iter__(self):
+        return map(self.View, range(len(self.id)))
+
+    def arrival_order(self):
+        """
+        Yields a view per job in arrival order; jobs arriving in the same
+        tick keep table order, as in run_simulation.
+        """
+        arrivals = self.arrival_time
+        if all(max(arrivals[i - 1], 0) <= max(arrivals[i], 0) for i in range(1, len(arrivals))):
+            return iter(self)
+        order = array("I", sorted(range(len(arrivals)), key=lambda i: max(arrivals[i], 0)))
+        return map(self.View, order)
+
+
+class ColumnBlock:
+    """
+    A memory block stored as one row of a BlockColumns table.
+    """
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    __str__ = MemoryBlock.__str__
+
+
+class BlockColumns:
+    """
+    Memory blocks stored field by field in typed arrays, with a view per block.
+    """
+    FIELDS = ("id", "size", "position", "is_allocated", "allocated_job", "table")
+
+    def __init__(self, blocks=()):
+        """
+        Initializes the table from (id, size) tuples or MemoryBlock objects.
+        """
+        self.id = array("I")
+        self.size = array("I")
+        self.position = array("i")
+        self.is_allocated = []  # Shared True/False objects, so the flag reads back as a bool
+        self.allocated_job = []
+        self.table = []
+        self.View = bind_view(ColumnBlock, self, self.FIELDS, optional=("position",))
+        self.views = []
+        for block in blocks:
+            if isinstance(block, tuple):
+                self.append(*block)
+            else:
+                self.append(block.id, block.size)
+
+    def append(self, id, size):
+        self.id.append(id)
+        self.size.append(size)
+        self.position.append(NONE)
+        self.is_allocated.append(False)
+        self.allocated_job.append(None)
+        self.table.append(None)
+        self.views.append(self.View(len(self.views)))
+
+    def __len__(self):
+        return len(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+
+class CompletedRows(CompletedJobs):
+    """
+    Completed jobs of a JobColumns table, kept as row numbers.
+    """
+    def __init__(self, columns):
+        super().__init__(keep=False)
+        self.columns = columns
+        self.rows = array("I")
+
+    def append(self, job):
+        super().append(job)
+        self.rows.append(job.index)
+
+    def __iter__(self):
+        return map(self.columns.View, self.rows)
+
+
+class ColumnarSimulation(MemorySimulation):
+    """
+    A simulation whose ticks complete jobs in batches from a calendar
+    instead of counting down every running job.
+
+    Given a JobColumns table, jobs are read from it in arrival order and
+    only the views of arrived, unfinished jobs are kept alive.
+    """
+    def __init__(self, jobs, memory_blocks, *args, **kwargs):
+        columns = jobs if isinstance(jobs, JobColumns) else None
+        super().__init__(jobs.arrival_order() if columns else jobs, memory_blocks, *args, **kwargs)
+        if columns:
+            self.completed_jobs = CompletedRows(columns)
+        self.due = {}  # Tick -> blocks whose jobs finish in that tick
+
+    def allocate(self, job):
+        if not super().allocate(job):
+            return False
+        if self.kernel is None:
+            # Counting down from the next tick, the job reaches 0 this many ticks from now
+            self.due.setdefault(self.current_time + job.remaining_time, []).append(job.allocated_block)
+        return True
+
+    def process_jobs(self):
+        """
+        Completes every job due this tick, in block order like the per-block pass.
+        """
+        blocks = self.due.pop(self.current_time, None)
+        if blocks:
+            blocks.sort(key=lambda block: block.position)
+            for block in blocks:
+                self.job_completed(block)
+
+    def show_status(self):
+        # Remaining times are only materialised for the status printout
+        for block in self.memory_blocks:
+            if block.is_allocated:
+                job = block.allocated_job
+                job.remaining_time = job.start_time + job.execution_time - self.current_time
+        super().show_status()
+
+
+def run_columnar(jobs, memory_blocks, allocation_strategy, event_driven=False, queue_policy="fifo", log=None,
+                 time_limit=MAX_SIMULATION_TIME):
+    """
+    Runs run_simulation's simulation on column-backed jobs and blocks,
+    converting Job and MemoryBlock lists (or tuples) as needed.
+    """
+    if not isinstance(jobs, JobColumns):
+        jobs = JobColumns(jobs)
+    if not isinstance(memory_blocks, BlockColumns):
+        memory_blocks = BlockColumns(memory_blocks)
+    return ColumnarSimulation(jobs, BlockTable(memory_blocks), allocation_strategy, queue_policy, log,
+                              time_limit).run(event_driven)
+
+
+def synthetic_workload(block_count, job_count, ticks=1000):
+    """
+    Returns (jobs, blocks) as tuples: the default partition sizes repeated
+    over block_count blocks and job_count jobs arriving over `ticks` ticks.
+    """
+    sizes = [9500, 7000, 4500, 8500, 3000, 9000, 1000, 5500, 1500, 500]
+    blocks = [(i + 1, sizes[i % len(sizes)]) for i in range(block_count)]
+    jobs = [(i + 1, i * ticks // job_count, 500 + (i * 7919) % 9000, 1 + (i * 31) % 12) for i in range(job_count)]
+    return jobs, blocks
+
+
+def bytes_per_job(make_jobs, job_count):
+    """
+    Returns the memory traced while building job_count jobs, per job.
+    """
+    tracemalloc.start()
+    jobs = make_jobs()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    return size / job_count
+
+
+if __name__ == "__main__":
+    # Usage: mp3_columnar.py [--blocks N] [--jobs N] [--ticks N] [--strategy first_fit|best_fit|worst_fit]
+    #                        [--event-driven]
+    block_count = int(sys.argv[sys.argv.index("--blocks") + 1]) if "--blocks" in sys.argv else 100000
+    job_count = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else 100000
+    ticks = int(sys.argv[sys.argv.index("--ticks") + 1]) if "--ticks" in sys.argv else 10000
+    strategy = {s.__name__: s for s in (first_fit, best_fit, worst_fit)}[
+        sys.argv[sys.argv.index("--strategy") + 1] if "--strategy" in sys.argv else "first_fit"]
+    event_driven = "--event-driven" in sys.argv
+    job_tuples, block_tuples = synthetic_workload(block_count, job_count, ticks)
+
+    object_bytes = bytes_per_job(lambda: [Job(*job) for job in job_tuples], job_count)
+    column_bytes = bytes_per_job(lambda: JobColumns(job_tuples), job_count)
+
+    started = time.perf_counter()
+    plain = MemorySimulation([Job(*job) for job in job_tuples], [MemoryBlock(*block) for block in block_tuples],
+                             strategy, log=SILENT).run(event_driven)
+    plain_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    columnar = run_columnar(job_tuples, block_tuples, strategy, event_driven, log=SILENT)
+    columnar_seconds = time.perf_counter() - started
+
+    print(f"{block_count} blocks, {job_count} jobs arriving over {ticks} ticks, {strategy.__name__}, "
+          f"{'event-driven' if event_driven else 'tick-based'}")
+    print(f"{'':<10} {'Bytes/Job':<11} {'Seconds':<9} {'Completed':<10} {'Throughput':<10}")
+    print(f"{'Objects':<10} {object_bytes:<11.1f} {plain_seconds:<9.2f} {plain['jobs_completed']:<10} "
+          f"{plain['throughput']:<10.4f}")
+    print(f"{'Columns':<10} {column_bytes:<11.1f} {columnar_seconds:<9.2f} {columnar['jobs_completed']:<10} "
+          f"{columnar['throughput']:<10.4f}")
+    print(f"Speed-up: {plain_seconds / columnar_seconds:.1f}x, memory per job: {column_bytes / object_bytes:.0%}")
@@ -0,0 +1,264 @@
+"""
+Stress harness for the allocation strategies under real threads.
+
+The blocks are split into LockedTables that each have their own lock, and
+worker threads allocate and release through them concurrently.  The
+locking scheme decides how the blocks are split:
+
+    global      one table and one lock for all blocks
+    striped     contiguous ranges of blocks; each thread starts at its own stripe
+    size-class  blocks grouped by power-of-two size; a job starts at the
+                smallest class that can hold it
+
+Each lock counts how often a thread found it held and how long it waited.
+With the GIL the threads do not run Python code in parallel, so the
+allocation rate mostly shows the locking overhead, while the contention
+counts show how often threads would have serialised on a lock.
+"""
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+from mp3 import (Job, MemoryBlock, BlockTable, initialize_jobs, initialize_memory_blocks, first_fit, best_fit,
+                 worst_fit, release_block)
+
+DEFAULT_OPERATIONS = 20000
+
+
+class CountingLock:
+    """
+    A mutex that records acquisitions, contended acquisitions and waiting time.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+
+    def __enter__(self):
+        if not self.lock.acquire(blocking=False):
+            started = time.perf_counter()
+            self.lock.acquire()
+            # The counters are only touched while the lock is held
+            self.contended += 1
+            self.wait_time += time.perf_counter() - started
+        self.acquisitions += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+
+
+class LockedTable(BlockTable):
+    """
+    A BlockTable guarded by its own CountingLock.
+    """
+    def __init__(self, memory_blocks):
+        super().__init__(memory_blocks)
+        self.lock = CountingLock()
+
+
+class LockedAllocator:
+    """
+    Blocks split into LockedTables, each guarded by its own CountingLock.
+
+    A job is offered to the tables in the order candidates() gives, and the
+    strategy runs on one table at a time under that table's lock, so best
+    and worst fit are only best and worst within a table.
+    """
+    def __init__(self, groups):
+        """
+        Initializes one locked table per non-empty group of blocks.
+        """
+        self.tables = []
+        for blocks in groups:
+            if blocks:
+                self.tables.append(LockedTable(blocks))
+
+    def candidates(self, job, home):
+        """
+        Returns the indexes of the tables to try for `job`, in order.
+        """
+        count = len(self.tables)
+        return [(home + i) % count for i in range(count)]
+
+    def home(self, thread, threads):
+        """
+        Returns the table worker `thread` of `threads` tries first, spacing
+        the workers evenly over the tables.
+        """
+        return thread * len(self.tables) // threads
+
+    def allocate(self, job, strategy, home=0):
+        """
+        Returns True once some table's strategy placed the job.
+        """
+        for index in self.candidates(job, home):
+            table = self.tables[index]
+            # Block sizes never change, so this check needs no lock
+            if table.largest_block_size < job.size:
+                continue
+            with table.lock:
+                if strategy(job, table):
+                    return True
+        return False
+
+    def release(self, block):
+        with block.table.lock:
+            release_block(block)
+
+    def lock_statistics(self):
+        """
+        Returns (acquisitions, contended acquisitions, total waiting seconds) over all locks.
+        """
+        locks = [table.lock for table in self.tables]
+        return (sum(lock.acquisitions for lock in locks), sum(lock.contended for lock in locks),
+                sum(lock.wait_time for lock in locks))
+
+
+class GlobalLockAllocator(LockedAllocator):
+    def __init__(self, memory_blocks):
+        super().__init__([memory_blocks])
+
+
+class StripedAllocator(LockedAllocator):
+    """
+    Contiguous ranges of blocks, one lock each; threads spread over the stripes.
+    """
+    def __init__(self, memory_blocks, stripes):
+        stripes = max(1, min(stripes, len(memory_blocks)))
+        bounds = [len(memory_blocks) * i // stripes for i in range(stripes + 1)]
+        super().__init__([memory_blocks[start:end] for start, end in zip(bounds, bounds[1:])])
+
+
+class SizeClassAllocator(LockedAllocator):
+    """
+    Blocks grouped by power-of-two size, one lock per class; jobs try the
+    smallest class that can hold them first and then larger ones.
+    """
+    def __init__(self, memory_blocks):
+        classes = {}
+        for block in memory_blocks:
+            classes.setdefault(block.size.bit_length(), []).append(block)
+        super().__init__([classes[order] for order in sorted(classes)])
+
+    def candidates(self, job, home):
+        first = 0
+        while first < len(self.tables) and self.tables[first].largest_block_size < job.size:
+            first += 1
+        return range(first, len(self.tables))
+
+
+def make_allocator(scheme, memory_blocks, threads):
+    """
+    Returns the allocator for a locking scheme name.
+    """
+    if scheme == "global":
+        return GlobalLockAllocator(memory_blocks)
+    if scheme == "striped":
+        return StripedAllocator(memory_blocks, threads * 2)
+    if scheme == "size-class":
+        return SizeClassAllocator(memory_blocks)
+    raise ValueError(f"Unknown locking scheme {scheme!r}, expected global, striped or size-class")
+
+
+def stress_blocks(copies):
+    """
+    Returns the default partitions repeated `copies` times.
+    """
+    return [MemoryBlock(copy * 10 + block.id, block.size)
+            for copy in range(copies) for block in initialize_memory_blocks()]
+
+
+def worker(allocator, strategy, operations, seed, home, held_limit, barrier, counts):
+    """
+    Allocates a job of a random default job size per operation, releasing
+    its oldest block when it holds more than held_limit or an allocation fails.
+    """
+    rng = random.Random(seed)
+    sizes = [job.size for job in initialize_jobs()]
+    held = deque()
+    allocated = failed = 0
+    barrier.wait()
+    for operation in range(operations):
+        job = Job(operation, 0, rng.choice(sizes), 1)
+        if allocator.allocate(job, strategy, home):
+            held.append(job.allocated_block)
+            allocated += 1
+        else:
+            failed += 1
+        if held and (len(held) > held_limit or job.allocated_block is None):
+            allocator.release(held.popleft())
+    while held:
+        allocator.release(held.popleft())
+    counts.append((allocated, failed))
+
+
+def stress(scheme, strategy, threads, copies=100, operations=DEFAULT_OPERATIONS, seed=0):
+    """
+    Runs `threads` workers of `operations` allocations each against a fresh
+    allocator and returns the throughput and contention statistics.
+    """
+    memory_blocks = stress_blocks(copies)
+    allocator = make_allocator(scheme, memory_blocks, threads)
+    # Together the threads keep about half the blocks busy
+    held_limit = max(1, len(memory_blocks) // (2 * threads))
+    barrier = threading.Barrier(threads + 1)
+    counts = []
+    workers = [threading.Thread(target=worker, args=(allocator, strategy, operations, seed + i,
+                                                     allocator.home(i, threads), held_limit, barrier, counts))
+               for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    allocated = sum(a for a, f in counts)
+    failed = sum(f for a, f in counts)
+    acquisitions, contended, wait_time = allocator.lock_statistics()
+    return {
+        "scheme": scheme,
+        "strategy": strategy.__name__,
+        "threads": threads,
+        "locks": len(allocator.tables),
+        "allocations": allocated,
+        "failed_allocations": failed,
+        "allocations_per_second": allocated / elapsed if elapsed else 0.0,
+        "lock_acquisitions": acquisitions,
+        "contention_rate": contended / acquisitions if acquisitions else 0.0,
+        "avg_wait_us": wait_time / contended * 1e6 if contended else 0.0
+    }
+
+
+def display_stress_results(results):
+    print("\n" + "="*100)
+    print("Concurrent Allocation")
+    print("="*100)
+    print(f"{'Scheme':<12} {'Strategy':<10} {'Threads':<8} {'Locks':<6} {'Allocs/s':<11} {'Failed':<8} "
+          f"{'Acquired':<10} {'Contended':<10} {'Avg Wait (us)':<13}")
+    print("-"*100)
+    for r in results:
+        print(f"{r['scheme']:<12} {r['strategy']:<10} {r['threads']:<8} {r['locks']:<6} "
+              f"{r['allocations_per_second']:<11.0f} {r['failed_allocations']:<8} {r['lock_acquisitions']:<10} "
+              f"{r['contention_rate']:<10.4f} {r['avg_wait_us']:<13.2f}")
+
+
+if __name__ == "__main__":
+    # Usage: mp3_concurrent.py [--threads 1,2,4,8] [--schemes global,striped,size-class]
+    #        [--copies N] [--operations N]   (N copies of the default partitions; operations per thread)
+    thread_counts = [int(n) for n in sys.argv[sys.argv.index("--threads") + 1].split(",")] \
+        if "--threads" in sys.argv else [1, 2, 4, 8]
+    schemes = sys.argv[sys.argv.index("--schemes") + 1].split(",") if "--schemes" in sys.argv \
+        else ["global", "striped", "size-class"]
+    copies = int(sys.argv[sys.argv.index("--copies") + 1]) if "--copies" in sys.argv else 100
+    operations = int(sys.argv[sys.argv.index("--operations") + 1]) if "--operations" in sys.argv \
+        else DEFAULT_OPERATIONS
+
+    results = [stress(scheme, strategy, threads, copies, operations)
+               for scheme in schemes for strategy in (first_fit, best_fit, worst_fit) for threads in thread_counts]
+    display_stress_results(results)
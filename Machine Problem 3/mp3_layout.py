@@ -0,0 +1,234 @@
+"""
+Searches for fixed-partition layouts that suit the job mix.
+
+A layout is the list of partition sizes, in partition order (first-fit
+depends on the order), using at most the memory budget and in multiples of
+a granularity.  Layouts are scored by simulating the jobs on them: most
+jobs completed first, then highest throughput, then lowest average
+turnaround time.  Three searches are offered:
+
+    greedy      add the partition that improves the score most, until none does
+    local       hill-climb from the hand-picked layout, rounded to the
+                granularity, by moving memory between partitions,
+                splitting, merging and swapping neighbours
+    annealing   simulated annealing over the same moves
+
+Candidate layouts are simulated in parallel worker processes, and every
+layout is simulated at most once per strategy.
+"""
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from mp3 import MemoryBlock, initialize_memory_blocks, first_fit, best_fit, worst_fit, run_simulation
+from mp3_buddy import scaled_workload
+from mp3_log import SILENT
+
+GRANULARITY = 500
+NO_RESULT = (0, 0.0, float('-inf'))
+
+
+def layout_blocks(layout):
+    return [MemoryBlock(index + 1, size) for index, size in enumerate(layout)]
+
+
+def simulate_layout(layout, strategy, copies=1):
+    """
+    Returns the simulation results for the jobs on a layout, or None.
+    """
+    jobs, _ = scaled_workload(copies)
+    return run_simulation(jobs, layout_blocks(layout), strategy, event_driven=True, log=SILENT)
+
+
+def score(result):
+    """
+    Returns a key that is larger for better results.
+    """
+    if not result:
+        return NO_RESULT
+    return result["jobs_completed"], result["throughput"], -result["avg_turnaround_time"]
+
+
+class LayoutOptimizer:
+    """
+    Layout searches for one allocation strategy, sharing a worker pool and
+    a cache of simulated layouts.
+    """
+    def __init__(self, strategy, executor, copies=1, budget=None, granularity=GRANULARITY, seed=0):
+        """
+        Initializes the optimizer; the budget defaults to the memory of the
+        hand-picked partitions.
+        """
+        self.strategy = strategy
+        self.executor = executor
+        self.copies = copies
+        self.budget = budget if budget is not None else copies * sum(b.size for b in initialize_memory_blocks())
+        self.granularity = granularity
+        self.random = random.Random(seed)
+        self.results = {}  # Layout tuple -> simulation results
+
+    def evaluate(self, layouts):
+        """
+        Simulates the layouts not seen before in parallel and returns
+        (score, layout) for every layout, in order.
+        """
+        layouts = [tuple(layout) for layout in layouts]
+        pending = list(dict.fromkeys(layout for layout in layouts if layout not in self.results))
+        if pending:
+            simulated = self.executor.map(simulate_layout, pending, repeat(self.strategy), repeat(self.copies))
+            self.results.update(zip(pending, simulated))
+        return [(score(self.results[layout]), layout) for layout in layouts]
+
+    def round_up(self, size):
+        return -(-size // self.granularity) * self.granularity
+
+    def snap(self, layout):
+        """
+        Returns the layout with every partition rounded to the nearest
+        multiple of the granularity, shrinking the largest partitions a
+        granule at a time until it fits the budget.
+        """
+        g = self.granularity
+        layout = [max(g, (size + g // 2) // g * g) for size in layout]
+        while layout and sum(layout) > self.budget:
+            largest = max(range(len(layout)), key=layout.__getitem__)
+            if layout[largest] > g:
+                layout[largest] -= g
+            else:
+                layout.pop()
+        return tuple(layout)
+
+    def candidate_sizes(self):
+        """
+        Returns the job sizes rounded up to the granularity, the natural partition sizes.
+        """
+        jobs, _ = scaled_workload(1)
+        return sorted({self.round_up(job.size) for job in jobs})
+
+    def greedy(self):
+        """
+        Builds a layout one partition at a time, each time adding the
+        candidate size that improves the score most.
+        """
+        layout = ()
+        best = (NO_RESULT, layout)
+        sizes = self.candidate_sizes()
+        while True:
+            remaining = self.budget - sum(layout)
+            options = [layout + (size,) for size in sizes if size <= remaining]
+            if not options:
+                return best
+            candidate = max(self.evaluate(options))
+            if candidate[0] <= best[0]:
+                return best
+            best = candidate
+            layout = candidate[1]
+
+    def neighbours(self, layout):
+        """
+        Returns the layouts one move away: moving one granule between two
+        partitions, splitting or merging partitions, or swapping neighbours.
+        """
+        g = self.granularity
+        result = []
+        for i, size in enumerate(layout):
+            if size > g:
+                for j in range(len(layout)):
+                    if j != i:
+                        moved = list(layout)
+                        moved[i] -= g
+                        moved[j] += g
+                        result.append(tuple(moved))
+                half = self.round_up(size // 2)
+                if half < size:
+                    result.append(layout[:i] + (half, size - half) + layout[i + 1:])
+            if i + 1 < len(layout):
+                result.append(layout[:i] + (size + layout[i + 1],) + layout[i + 2:])
+                result.append(layout[:i] + (layout[i + 1], size) + layout[i + 2:])
+        if sum(layout) + g <= self.budget:
+            # Spend unused budget on a partition
+            for i in range(len(layout)):
+                result.append(layout[:i] + (layout[i] + g,) + layout[i + 1:])
+        return result
+
+    def local_search(self, start, max_steps=200):
+        """
+        Moves to the best neighbour for as long as that improves the score,
+        starting from `start` snapped to the granularity.
+        """
+        best = self.evaluate([self.snap(start)])[0]
+        for _ in range(max_steps):
+            candidate = max(self.evaluate(self.neighbours(best[1])))
+            if candidate[0] <= best[0]:
+                break
+            best = candidate
+        return best
+
+    def annealing(self, start, steps=60, batch=8, temperature=1.0, cooling=0.95):
+        """
+        Simulated annealing: each step simulates a batch of random neighbours
+        in parallel and takes the first one the Metropolis rule accepts.  A
+        lost job costs 1 and lost throughput costs its value in jobs/ms.
+        The search starts from `start` snapped to the granularity.
+        """
+        current = best = self.evaluate([self.snap(start)])[0]
+        for _ in range(steps):
+            moves = self.neighbours(current[1])
+            for candidate in self.evaluate(self.random.sample(moves, min(batch, len(moves)))):
+                loss = (current[0][0] - candidate[0][0]) + (current[0][1] - candidate[0][1])
+                if candidate[0] >= current[0] or self.random.random() < math.exp(-loss / temperature):
+                    current = candidate
+                    break
+            best = max(best, current)
+            temperature *= cooling
+        return best
+
+    def result(self, layout):
+        return self.results.get(tuple(layout))
+
+
+def display_layouts(rows):
+    """
+    Prints the best layout found by each search for each strategy.
+    """
+    print("\n" + "="*110)
+    print("Partition Layouts")
+    print("="*110)
+    print(f"{'Strategy':<12} {'Search':<11} {'Done':<6} {'Throughput':<11} {'Makespan':<9} {'Avg Wait':<9} "
+          f"{'New Sims':<9} Layout")
+    print("-"*110)
+    for strategy, search, result, simulations, layout in rows:
+        if result:
+            print(f"{strategy:<12} {search:<11} {result['jobs_completed']:<6} {result['throughput']:<11.4f} "
+                  f"{result['makespan']:<9} {result['avg_waiting_time']:<9.2f} {simulations:<9} {list(layout)}")
+        else:
+            print(f"{strategy:<12} {search:<11} no jobs completed {list(layout)}")
+
+
+if __name__ == "__main__":
+    # Usage: mp3_layout.py [--scale N] [--granularity BYTES] [--workers N] [--seed S]
+    copies = int(sys.argv[sys.argv.index("--scale") + 1]) if "--scale" in sys.argv else 1
+    granularity = int(sys.argv[sys.argv.index("--granularity") + 1]) if "--granularity" in sys.argv \
+        else GRANULARITY
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+
+    hand_picked = tuple(block.size for block in initialize_memory_blocks()) * copies
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for strategy in (first_fit, best_fit, worst_fit):
+            name = strategy.__name__.replace('_', ' ').title()
+            optimizer = LayoutOptimizer(strategy, executor, copies, granularity=granularity, seed=seed)
+            searches = [("hand-picked", lambda: optimizer.evaluate([hand_picked])[0]),
+                        ("greedy", optimizer.greedy),
+                        ("local", lambda: optimizer.local_search(hand_picked)),
+                        ("annealing", lambda: optimizer.annealing(hand_picked))]
+            for search, run in searches:
+                # Layouts another search already simulated come from the cache
+                simulated_before = len(optimizer.results)
+                key, layout = run()
+                rows.append((name, search, optimizer.result(layout), len(optimizer.results) - simulated_before,
+                             layout))
+    display_layouts(rows)
@@ -0,0 +1,202 @@
+"""
+Leveled, buffered event log for the memory simulator.
+
+Every allocation, completion and queueing decision is an event record
+(time, kind, job id, block id).  The log turns records into the familiar
+text lines only when its level asks for them, collects text in a buffer
+that is written out in large chunks, and can also send every record to a
+JSONL or compact binary file for later analysis.
+"""
+import json
+import struct
+import sys
+
+# Log levels, each including everything below it
+SILENT = 0    # No text at all
+SUMMARY = 1   # Start banner and final statistics
+EVENTS = 2    # One line per allocation, completion and queueing decision
+STATUS = 3    # Also the time and full memory status after every tick
+LEVELS = {"silent": SILENT, "summary": SUMMARY, "events": EVENTS, "status": STATUS}
+
+EVENT_MESSAGES = {
+    "allocated": "Time {time}ms: Allocated Job {job} to Memory Block {block}",
+    "completed": "Time {time}s: Job {job} completed. Releasing Memory Block {block}",
+    "allocated_waiting": "Time {time}s: Allocated waiting Job {job}",
+    "arrived_allocated": "Time {time}ms: Job {job} arrived and was allocated immediately",
+    "queued": "Time {time}ms: Job {job} arrived and was added to waiting queue",
+    "rejected": "Job {job} is too large for any memory block and will never be allocated."
+}
+# Binary records store the kind as its index here
+EVENT_KINDS = tuple(EVENT_MESSAGES)
+
+# time, kind, job id, block id (-1 when there is no block)
+BINARY_RECORD = struct.Struct("<iBii")
+
+
+class JsonlSink:
+    """
+    Writes one JSON object per event, status snapshot and run summary.
+    """
+    def __init__(self, filename):
+        """
+        Initializes the sink; the file is opened on the first write, so an
+        unused sink can be sent to a worker process.
+        """
+        self.filename = filename
+        self.file = None
+
+    def write(self, time, kind, job_id, block_id):
+        if self.file is None:
+            self.file = open(self.filename, "w", buffering=1 << 16)
+        self.file.write(json.dumps({"time": time, "event": kind, "job": job_id, "block": block_id}) + "\n")
+
+    def write_status(self, time, memory_blocks, waiting_jobs):
+        if self.file is None:
+            self.file = open(self.filename, "w", buffering=1 << 16)
+        blocks = [[block.id, block.size, block.allocated_job.id if block.is_allocated else None]
+                  for block in memory_blocks]
+        self.file.write(json.dumps({"time": time, "event": "status", "blocks": blocks,
+                                    "waiting": [job.id for job in waiting_jobs]}) + "\n")
+
+    def write_summary(self, results):
+        if self.file is None:
+            self.file = open(self.filename, "w", buffering=1 << 16)
+        self.file.write(json.dumps({"event": "summary", **results}) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class BinarySink:
+    """
+    Writes each event as a fixed 13-byte record; status snapshots and
+    summaries are not kept.
+    """
+    def __init__(self, filename):
+        """
+        Initializes the sink; the file is opened on the first write.
+        """
+        self.filename = filename
+        self.file = None
+
+    def write(self, time, kind, job_id, block_id):
+        if self.file is None:
+            self.file = open(self.filename, "wb", buffering=1 << 16)
+        self.file.write(BINARY_RECORD.pack(time, EVENT_KINDS.index(kind), job_id,
+                                           -1 if block_id is None else block_id))
+
+    def write_status(self, time, memory_blocks, waiting_jobs):
+        pass
+
+    def write_summary(self, results):
+        pass
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def open_sink(filename):
+    """
+    Returns a binary sink for .bin files and a JSONL sink otherwise.
+    """
+    return BinarySink(filename) if filename.endswith(".bin") else JsonlSink(filename)
+
+
+def read_event_log(filename):
+    """
+    Yields the event records of a JSONL or binary log as dicts.
+    """
+    if filename.endswith(".bin"):
+        with open(filename, "rb") as file:
+            for time, kind, job_id, block_id in BINARY_RECORD.iter_unpack(file.read()):
+                yield {"time": time, "event": EVENT_KINDS[kind], "job": job_id,
+                       "block": None if block_id == -1 else block_id}
+    else:
+        with open(filename) as file:
+            for line in file:
+                yield json.loads(line)
+
+
+class EventLog:
+    """
+    Collects simulation events and writes the text the level asks for.
+    """
+    def __init__(self, level=EVENTS, sink=None, stream=None, buffer_lines=4096):
+        """
+        Initializes a log.  Text goes to `stream` (standard output when None)
+        in chunks of buffer_lines lines; every event also goes to `sink`.
+        """
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.sink = sink
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self.buffer = []
+
+    def line(self, level, text):
+        """
+        Adds a line of text if the log level includes `level`.
+        """
+        if self.level >= level:
+            self.buffer.append(text)
+            if len(self.buffer) >= self.buffer_lines:
+                self.flush()
+
+    def event(self, kind, time, job, block=None):
+        """
+        Records an event for a job and, optionally, the block involved.
+        """
+        block_id = block.id if block is not None else None
+        if self.sink is not None:
+            self.sink.write(time, kind, job.id, block_id)
+        if self.level >= EVENTS:
+            self.line(EVENTS, EVENT_MESSAGES[kind].format(time=time, job=job.id, block=block_id))
+
+    def wants_status(self):
+        """
+        Whether status snapshots are printed or recorded at all.  They cost a
+        pass over every block, so only the STATUS level takes them, whatever
+        the sink.
+        """
+        return self.level >= STATUS
+
+    def status(self, time, memory_blocks, waiting_jobs):
+        """
+        Records the full memory status and waiting queue.
+        """
+        if self.sink is not None:
+            self.sink.write_status(time, memory_blocks, waiting_jobs)
+        if self.level >= STATUS:
+            self.line(STATUS, "\nCurrent Memory Status:")
+            for block in memory_blocks:
+                if block.is_allocated:
+                    job = block.allocated_job
+                    self.line(STATUS, f"  Block {block.id} ({block.size}): Job {job.id} ({job.size}) - "
+                                      f"{job.remaining_time}ms remaining")
+                else:
+                    self.line(STATUS, f"  Block {block.id} ({block.size}): Free")
+            if waiting_jobs:
+                self.line(STATUS, f"Waiting Queue: {[f'Job {j.id}' for j in waiting_jobs]}")
+
+    def summary(self, results):
+        """
+        Records the final statistics of a run in the sink, at every level.
+        """
+        if self.sink is not None:
+            self.sink.write_summary(results)
+
+    def flush(self):
+        """
+        Writes out the buffered text.
+        """
+        if self.buffer:
+            (self.stream or sys.stdout).write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
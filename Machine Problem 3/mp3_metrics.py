@@ -0,0 +1,153 @@
+"""
+Free-space metrics for the memory simulator, kept up to date incrementally.
+
+Memory models report every free block they gain or lose, so the total
+free memory, the largest free block, a histogram of free-block sizes and
+the fragmentation index are always current without scanning the blocks.
+Samples go into a compact time series that only records changes.
+"""
+import heapq
+from array import array
+
+
+class FreeSpaceMetrics:
+    """
+    Running totals over the multiset of free block sizes.
+
+    The histogram counts free blocks per power-of-two size bucket: bucket b
+    holds sizes from 2 ** (b - 1) to 2 ** b - 1.  The fragmentation index is
+    the share of free memory outside the largest free block.
+    """
+    def __init__(self):
+        """
+        Initializes the metrics for a memory with no free blocks.
+        """
+        self.total_free = 0
+        self.free_count = 0
+        self.histogram = [0]
+        self.size_counts = {}  # Free block size -> number of free blocks of that size
+        self.largest_sizes = []  # Max-heap of negated sizes; entries whose count dropped to 0 are skipped
+        self.in_heap = set()
+
+        # Time series of (time, total free, largest free, free block count), one row per change
+        self.times = array("q")
+        self.free_series = array("q")
+        self.largest_series = array("q")
+        self.count_series = array("q")
+
+        # Time-weighted totals, accumulated at each sample
+        self.first_time = None
+        self.last_time = None
+        self.free_area = 0
+        self.largest_area = 0
+        self.fragmentation_area = 0.0
+        self.last_fragmentation = 0.0
+        self.peak_fragmentation = 0.0
+        self.peak_histogram = None  # Histogram when the fragmentation index peaked
+
+    def add(self, size):
+        """
+        Records a new free block of `size`.  O(log n).
+        """
+        self.total_free += size
+        self.free_count += 1
+        bucket = size.bit_length()
+        if bucket >= len(self.histogram):
+            self.histogram.extend([0] * (bucket + 1 - len(self.histogram)))
+        self.histogram[bucket] += 1
+        self.size_counts[size] = self.size_counts.get(size, 0) + 1
+        if size not in self.in_heap:
+            self.in_heap.add(size)
+            heapq.heappush(self.largest_sizes, -size)
+
+    def remove(self, size):
+        """
+        Records that a free block of `size` was allocated, split or merged.
+        Amortised O(1).
+        """
+        self.total_free -= size
+        self.free_count -= 1
+        self.histogram[size.bit_length()] -= 1
+        count = self.size_counts[size] - 1
+        if count:
+            self.size_counts[size] = count
+        else:
+            del self.size_counts[size]
+            # Rebuild the heap once stale sizes outnumber live ones, so it stays O(live sizes)
+            if len(self.largest_sizes) > 2 * len(self.size_counts):
+                self.largest_sizes = [-live for live in self.size_counts]
+                heapq.heapify(self.largest_sizes)
+                self.in_heap = set(self.size_counts)
+
+    def largest_free(self):
+        """
+        Returns the size of the largest free block, or 0.  Amortised O(log n).
+        """
+        heap = self.largest_sizes
+        while heap and -heap[0] not in self.size_counts:
+            self.in_heap.discard(-heapq.heappop(heap))
+        return -heap[0] if heap else 0
+
+    def fragmentation_index(self):
+        """
+        Returns 1 - largest free block / total free memory, or 0.0 when nothing is free.
+        """
+        if self.total_free == 0:
+            return 0.0
+        return 1 - self.largest_free() / self.total_free
+
+    def sample(self, time):
+        """
+        Accumulates the time-weighted totals up to `time` and appends the
+        current values to the time series if they changed.
+        """
+        largest = self.largest_free()
+        if self.last_time is not None and time > self.last_time:
+            elapsed = time - self.last_time
+            self.free_area += self.free_series[-1] * elapsed
+            self.largest_area += self.largest_series[-1] * elapsed
+            self.fragmentation_area += self.last_fragmentation * elapsed
+        if self.first_time is None:
+            self.first_time = time
+        self.last_time = time
+        self.last_fragmentation = self.fragmentation_index()
+        if self.peak_histogram is None or self.last_fragmentation > self.peak_fragmentation:
+            self.peak_fragmentation = self.last_fragmentation
+            self.peak_histogram = self.histogram[:]
+
+        if self.times and (self.free_series[-1], self.largest_series[-1], self.count_series[-1]) == \
+                (self.total_free, largest, self.free_count):
+            return
+        if self.times and self.times[-1] == time:
+            # Several samples at one instant keep only the last
+            self.free_series[-1], self.largest_series[-1], self.count_series[-1] = \
+                self.total_free, largest, self.free_count
+            return
+        self.times.append(time)
+        self.free_series.append(self.total_free)
+        self.largest_series.append(largest)
+        self.count_series.append(self.free_count)
+
+    def size_histogram(self, histogram=None):
+        """
+        Returns the non-empty buckets of `histogram` (the current one by
+        default) as {"min_size", "max_size", "count"} rows.
+        """
+        return [{"min_size": 1 << (bucket - 1) if bucket else 0, "max_size": (1 << bucket) - 1, "count": count}
+                for bucket, count in enumerate(self.histogram if histogram is None else histogram) if count]
+
+    def statistics(self, end_time):
+        """
+        Returns the time-weighted free-space statistics up to `end_time`,
+        with the free-block size histogram from when fragmentation peaked.
+        """
+        self.sample(end_time)
+        duration = end_time - self.first_time if self.first_time is not None else 0
+        return {
+            "avg_free_memory": self.free_area / duration if duration else float(self.total_free),
+            "avg_largest_free_block": self.largest_area / duration if duration else float(self.largest_free()),
+            "avg_fragmentation_index": self.fragmentation_area / duration if duration else self.last_fragmentation,
+            "peak_fragmentation_index": self.peak_fragmentation,
+            "free_space_samples": len(self.times),
+            "free_blocks_at_peak_fragmentation": self.size_histogram(self.peak_histogram)
+        }
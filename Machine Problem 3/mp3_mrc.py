@@ -0,0 +1,268 @@
+"""
+Miss-ratio curves for page replacement, computed offline from a reference trace.
+
+Instead of simulating every candidate memory size, one pass over the trace
+gives each reference's stack distance: the smallest number of frames with
+which that reference would have been a hit.  LRU distances come from
+Mattson's algorithm with a Fenwick tree over reference times; OPT
+(Belady) distances come from Mattson's priority stack ordered by a
+precomputed next-use index.  A histogram of distances yields the miss
+ratio for every memory size at once.
+
+The priority stack costs a reference its stack distance, so traces with
+long reuse distances make it quadratic.  Past OPT_EXACT_REFERENCES
+references the OPT curve is instead simulated at the displayed memory
+sizes only, at O(n log frames) each; --opt-exact forces the full curve.
+"""
+import heapq
+import sys
+import time
+
+from mp3_paging import PAGE_BITS, PAGE_SIZE, PagingSimulator, read_references
+
+# Longest trace whose full OPT curve is computed by default (about 1.5 s in the worst case)
+OPT_EXACT_REFERENCES = 20000
+
+
+def trace_pages(references, page_size=PAGE_SIZE):
+    """
+    Returns the page of every (job id, virtual address) reference, in trace order.
+    """
+    shift = page_size.bit_length() - 1
+    return [(job_id << PAGE_BITS) | (address >> shift) for job_id, address in references]
+
+
+def lru_stack_distances(pages):
+    """
+    Returns (histogram, cold misses), where histogram[d] counts the references
+    at LRU stack distance d.  O(n log n).
+
+    The stack distance of a reference is one more than the number of
+    distinct pages referenced since the previous reference to the same page.
+    A Fenwick tree over reference times marks the latest reference to every
+    page, so that count is the number of marks after the previous reference.
+    """
+    size = len(pages)
+    tree = [0] * (size + 1)
+    last_reference = {}
+    histogram = [0]
+    cold_misses = 0
+
+    for time_index, page in enumerate(pages):
+        previous = last_reference.get(page)
+        if previous is None:
+            cold_misses += 1
+        else:
+            # Marks at or before the previous reference
+            marked = 0
+            i = previous + 1
+            while i > 0:
+                marked += tree[i]
+                i -= i & -i
+            distance = len(last_reference) - marked + 1
+            if distance >= len(histogram):
+                histogram.extend([0] * (distance + 1 - len(histogram)))
+            histogram[distance] += 1
+            # Move this page's mark to now
+            i = previous + 1
+            while i <= size:
+                tree[i] -= 1
+                i += i & -i
+        i = time_index + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+        last_reference[page] = time_index
+    return histogram, cold_misses
+
+
+def next_use_index(pages):
+    """
+    Returns, for every reference, the time of the next reference to the same
+    page, or len(pages) if there is none.  O(n).
+    """
+    never = len(pages)
+    next_use = [never] * len(pages)
+    upcoming = {}
+    for time_index in range(len(pages) - 1, -1, -1):
+        page = pages[time_index]
+        next_use[time_index] = upcoming.get(page, never)
+        upcoming[page] = time_index
+    return next_use
+
+
+def opt_stack_distances(pages, next_use=None):
+    """
+    Returns (histogram, cold misses) for Belady's OPT, like lru_stack_distances.
+
+    Mattson's priority stack keeps pages ordered so that, for every size c,
+    the top c pages are what OPT would hold in c frames.  On a reference the
+    page moves to the top, and the pages above its old position are carried
+    down, each level keeping whichever of two pages is needed sooner.  The
+    work per reference is its stack distance (the whole stack on a miss),
+    so this is O(n * distinct pages) in the worst case; see opt_miss_ratios
+    for long traces.
+    """
+    if next_use is None:
+        next_use = next_use_index(pages)
+    stack = []  # Pages, top first
+    priority = {}  # Page -> time of its next reference
+    histogram = [0, 0]
+    cold_misses = 0
+
+    for time_index, page in enumerate(pages):
+        if not stack:
+            cold_misses += 1
+            stack.append(page)
+        elif stack[0] == page:
+            histogram[1] += 1
+        else:
+            seen = page in priority
+            if seen:
+                depth = stack.index(page, 1)
+                if depth + 1 >= len(histogram):
+                    histogram.extend([0] * (depth + 2 - len(histogram)))
+                histogram[depth + 1] += 1
+            else:
+                cold_misses += 1
+                depth = len(stack)
+
+            carried = stack[0]
+            for level in range(1, depth):
+                resident = stack[level]
+                if priority[resident] > priority[carried]:
+                    # The carried page is needed sooner, so it keeps this level
+                    stack[level] = carried
+                    carried = resident
+            if seen:
+                stack[depth] = carried
+            else:
+                stack.append(carried)
+            stack[0] = page
+        priority[page] = next_use[time_index]
+    return histogram, cold_misses
+
+
+def opt_misses(pages, frame_count, next_use=None):
+    """
+    Returns the number of misses OPT makes with frame_count frames.  O(n log frames).
+    With no frames every reference misses.
+    """
+    if frame_count <= 0:
+        return len(pages)
+    if next_use is None:
+        next_use = next_use_index(pages)
+    resident = {}  # Page -> its next use
+    farthest = []  # Max-heap of (-next use, page); stale entries are skipped
+    misses = 0
+    for time_index, page in enumerate(pages):
+        if page not in resident:
+            misses += 1
+            if len(resident) >= frame_count:
+                while True:
+                    upcoming, victim = heapq.heappop(farthest)
+                    if resident.get(victim) == -upcoming:
+                        del resident[victim]
+                        break
+        resident[page] = next_use[time_index]
+        heapq.heappush(farthest, (-next_use[time_index], page))
+    return misses
+
+
+def opt_miss_ratios(pages, sizes, next_use=None):
+    """
+    Returns {frames: OPT miss ratio} for the given memory sizes by
+    simulating each one.  O(len(sizes) * n log frames).
+    """
+    if next_use is None:
+        next_use = next_use_index(pages)
+    return {frames: opt_misses(pages, frames, next_use) / len(pages) if pages else 0.0 for frames in sizes}
+
+
+def miss_ratio_curve(histogram, cold_misses, references):
+    """
+    Returns miss_ratios where miss_ratios[c] is the miss ratio with c frames,
+    for c from 0 up to the largest stack distance.  An empty trace has no
+    misses at any size.
+    """
+    if not references:
+        return [0.0] * len(histogram)
+    misses = references
+    curve = [1.0]
+    for distance in range(1, len(histogram)):
+        misses -= histogram[distance]
+        curve.append(misses / references)
+    return curve
+
+
+def curve_sizes(largest, points=16):
+    """
+    Returns about `points` memory sizes from 1 frame up to `largest` frames,
+    and at least 1 frame even when no page is ever reused.
+    """
+    largest = max(1, largest)
+    step = max(1, largest // points)
+    return list(range(step, largest, step)) + [largest]
+
+
+def display_curves(rows):
+    """
+    Prints (frames, LRU miss ratio, OPT miss ratio) rows.
+    """
+    print("\n" + "="*40)
+    print("Miss Ratio Curves")
+    print("="*40)
+    print(f"{'Frames':<10} {'LRU':<12} {'OPT':<12}")
+    print("-"*40)
+    for frames, lru, opt in rows:
+        print(f"{frames:<10} {lru:<12.4f} {opt:<12.4f}")
+
+
+if __name__ == "__main__":
+    # Usage: mp3_mrc.py TRACE [--check FRAMES] [--csv FILE] [--opt-exact]
+    # --check replays the trace through the LRU paging simulator and OPT at one size
+    trace = sys.argv[1]
+    pages = trace_pages(read_references(trace))
+
+    started = time.perf_counter()
+    lru_histogram, cold_misses = lru_stack_distances(pages)
+    lru_seconds = time.perf_counter() - started
+
+    lru_curve = miss_ratio_curve(lru_histogram, cold_misses, len(pages))
+    # Beyond the largest LRU distance every page stays resident, under OPT too
+    sizes = curve_sizes(len(lru_curve) - 1)
+    exact = "--opt-exact" in sys.argv or len(pages) <= OPT_EXACT_REFERENCES
+    csv_sizes = range(1, max(len(lru_curve), 2)) if "--csv" in sys.argv and exact else sizes
+
+    started = time.perf_counter()
+    next_use = next_use_index(pages)
+    if exact:
+        opt_histogram, _ = opt_stack_distances(pages, next_use)
+        opt_curve = miss_ratio_curve(opt_histogram, cold_misses, len(pages))
+        opt_ratios = {frames: opt_curve[min(frames, len(opt_curve) - 1)] for frames in csv_sizes}
+    else:
+        opt_ratios = opt_miss_ratios(pages, sizes, next_use)
+    opt_seconds = time.perf_counter() - started
+
+    print(f"{len(pages)} references, {cold_misses} distinct pages")
+    print(f"LRU curve in {lru_seconds:.2f} s, OPT {'curve' if exact else f'at {len(sizes)} sizes'} "
+          f"in {opt_seconds:.2f} s")
+    display_curves([(frames, lru_curve[min(frames, len(lru_curve) - 1)], opt_ratios[frames]) for frames in sizes])
+
+    if "--csv" in sys.argv:
+        with open(sys.argv[sys.argv.index("--csv") + 1], "w") as file:
+            file.write("frames,lru_miss_ratio,opt_miss_ratio\n")
+            for frames in csv_sizes:
+                file.write(f"{frames},{lru_curve[min(frames, len(lru_curve) - 1)]},{opt_ratios[frames]}\n")
+
+    if "--check" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--check") + 1])
+        simulated = PagingSimulator(frames, "LRU").run(read_references(trace))
+        print(f"\nLRU with {frames} frames: curve {lru_curve[min(frames, len(lru_curve) - 1)]:.4f}, "
+              f"simulated {simulated['page_faults'] / max(simulated['references'], 1):.4f}")
+        simulated = opt_misses(pages, frames, next_use) / max(len(pages), 1)
+        if exact:
+            print(f"OPT with {frames} frames: curve {opt_curve[min(frames, len(opt_curve) - 1)]:.4f}, "
+                  f"simulated {simulated:.4f}")
+        else:
+            print(f"OPT with {frames} frames: simulated {simulated:.4f}")
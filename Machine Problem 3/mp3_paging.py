@@ -0,0 +1,397 @@
+"""
+Paging virtual-memory simulator.
+
+Jobs address their memory through per-job page tables; physical memory is
+a fixed number of page frames shared by every job, and a replacement
+policy (FIFO, LRU, Clock or ARC) picks the victim on a page fault.  A TLB
+caches recent translations.  Reference strings are read from binary trace
+files through mmap, one chunk at a time, so traces need not fit in memory.
+"""
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from mp3 import initialize_jobs, initialize_memory_blocks
+
+PAGE_SIZE = 256
+TLB_SIZE = 16
+
+# Simulated latencies in nanoseconds
+TLB_LATENCY = 1
+MEMORY_LATENCY = 100  # One memory access; a TLB miss costs one more for the page table walk
+PAGE_FAULT_LATENCY = 8000000
+
+# Reference traces: a magic number, then (job id, virtual address) records
+REFERENCE_MAGIC = b"MP3R"
+REFERENCE_RECORD = struct.Struct("<IQ")
+RECORDS_PER_READ = 1 << 16
+
+# A page is identified by its job id and virtual page number packed into one int
+PAGE_BITS = 40
+
+
+class FIFOPolicy:
+    """
+    Evicts the page that was loaded first.
+    """
+    name = "FIFO"
+    repeat_is_noop = True  # Referencing the page just referenced changes nothing
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.pages = OrderedDict()
+        self.evicted = None  # Victim of the last miss, if memory was full
+
+    def access(self, page):
+        """
+        References a page; returns True on a hit, otherwise loads the page.
+        """
+        if page in self.pages:
+            return True
+        self.evicted = self.pages.popitem(last=False)[0] if len(self.pages) >= self.capacity else None
+        self.pages[page] = None
+        return False
+
+
+class LRUPolicy:
+    """
+    Evicts the least recently used page; an ordered hash makes every access O(1).
+    """
+    name = "LRU"
+    repeat_is_noop = True
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.pages = OrderedDict()
+        self.evicted = None
+
+    def access(self, page):
+        pages = self.pages
+        if page in pages:
+            pages.move_to_end(page)
+            return True
+        self.evicted = pages.popitem(last=False)[0] if len(pages) >= self.capacity else None
+        pages[page] = None
+        return False
+
+
+class ClockPolicy:
+    """
+    Second-chance replacement: a hand sweeps the frames, clearing reference
+    bits, and evicts the first page whose bit is already clear.
+    """
+    name = "Clock"
+    repeat_is_noop = True
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.frames = []  # Page held by each frame
+        self.referenced = bytearray(capacity)
+        self.slot = {}  # Page -> frame index
+        self.hand = 0
+        self.evicted = None
+
+    def access(self, page):
+        index = self.slot.get(page)
+        if index is not None:
+            self.referenced[index] = 1
+            return True
+        if len(self.frames) < self.capacity:
+            self.evicted = None
+            index = len(self.frames)
+            self.frames.append(page)
+        else:
+            referenced = self.referenced
+            hand = self.hand
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = (hand + 1) % self.capacity
+            index = hand
+            self.evicted = self.frames[index]
+            del self.slot[self.evicted]
+            self.frames[index] = page
+            self.hand = (hand + 1) % self.capacity
+        self.slot[page] = index
+        self.referenced[index] = 1
+        return False
+
+
+class ARCPolicy:
+    """
+    Adaptive Replacement Cache (Megiddo and Modha).
+
+    Resident pages are split between T1 (seen once recently) and T2 (seen at
+    least twice); the ghost lists B1 and B2 remember pages recently evicted
+    from each, and a hit on a ghost moves the target size p of T1 towards
+    whichever list would have kept that page.
+    """
+    name = "ARC"
+    repeat_is_noop = False  # A second reference promotes a page from T1 to T2
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+        self.evicted = None
+
+    def replace(self, in_b2):
+        """
+        Evicts the LRU page of T1 or T2 into its ghost list.
+        """
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            victim = self.t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        self.evicted = victim
+
+    def access(self, page):
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+        if page in t2:
+            t2.move_to_end(page)
+            return True
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            return True
+
+        self.evicted = None
+        capacity = self.capacity
+        if page in b1:
+            self.p = min(capacity, self.p + max(len(b2) // len(b1), 1))
+            self.replace(False)
+            del b1[page]
+            t2[page] = None
+        elif page in b2:
+            self.p = max(0, self.p - max(len(b1) // len(b2), 1))
+            self.replace(True)
+            del b2[page]
+            t2[page] = None
+        else:
+            if len(t1) + len(b1) == capacity:
+                if len(t1) < capacity:
+                    b1.popitem(last=False)
+                    self.replace(False)
+                else:
+                    self.evicted = t1.popitem(last=False)[0]
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= capacity:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * capacity:
+                    b2.popitem(last=False)
+                self.replace(False)
+            t1[page] = None
+        return False
+
+
+POLICIES = {policy.name: policy for policy in (FIFOPolicy, LRUPolicy, ClockPolicy, ARCPolicy)}
+
+
+class PageTable:
+    """
+    One job's page table: virtual page number -> frame number.
+    """
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.entries = {}
+        self.faults = 0
+
+    def __str__(self):
+        return f"Job {self.job_id} (Resident: {len(self.entries)} pages, Faults: {self.faults})"
+
+
+class PagingSimulator:
+    """
+    Runs reference strings against paged physical memory.
+    """
+    def __init__(self, frame_count, policy, tlb_size=TLB_SIZE, page_size=PAGE_SIZE):
+        """
+        Initializes memory of frame_count frames managed by `policy` (a policy
+        class or its name).
+        """
+        if isinstance(policy, str):
+            policy = POLICIES[policy]
+        self.frame_count = frame_count
+        self.policy = policy(frame_count)
+        self.tlb_size = tlb_size
+        self.page_shift = page_size.bit_length() - 1
+        self.page_size = 1 << self.page_shift
+        self.tlb = OrderedDict()  # Page -> None, in LRU order
+        self.page_tables = {}
+        self.free_frames = list(range(frame_count - 1, -1, -1))
+
+        self.references = 0
+        self.tlb_hits = 0
+        self.page_faults = 0
+        self.elapsed = 0.0
+
+    def page_fault(self, page):
+        """
+        Maps a faulting page into the frame freed by the policy's victim, or a free frame.
+        """
+        evicted = self.policy.evicted
+        if evicted is not None:
+            self.tlb.pop(evicted, None)
+            frame = self.page_tables[evicted >> PAGE_BITS].entries.pop(evicted & ((1 << PAGE_BITS) - 1))
+        else:
+            frame = self.free_frames.pop()
+        job_id = page >> PAGE_BITS
+        table = self.page_tables.get(job_id)
+        if table is None:
+            table = self.page_tables[job_id] = PageTable(job_id)
+        table.entries[page & ((1 << PAGE_BITS) - 1)] = frame
+        table.faults += 1
+
+    def run(self, references):
+        """
+        Simulates an iterable of (job id, virtual address) references and returns the report.
+        """
+        access = self.policy.access
+        page_fault = self.page_fault
+        tlb = self.tlb
+        tlb_size = self.tlb_size
+        shift = self.page_shift
+        skip_repeats = self.policy.repeat_is_noop
+        references_seen = tlb_hits = page_faults = 0
+        last_page = None
+
+        started = time.perf_counter()
+        for job_id, address in references:
+            page = (job_id << PAGE_BITS) | (address >> shift)
+            references_seen += 1
+            if page == last_page and skip_repeats:
+                # Already the most recent entry in the TLB and the policy
+                tlb_hits += 1
+                continue
+            last_page = page
+            if page in tlb:
+                # A TLB entry means the page is resident; the policy still sees the reference
+                access(page)
+                tlb.move_to_end(page)
+                tlb_hits += 1
+                continue
+            if not access(page):
+                page_faults += 1
+                page_fault(page)
+            tlb[page] = None
+            if len(tlb) > tlb_size:
+                tlb.popitem(last=False)
+        self.elapsed += time.perf_counter() - started
+
+        self.references += references_seen
+        self.tlb_hits += tlb_hits
+        self.page_faults += page_faults
+        return self.report()
+
+    def report(self):
+        references = self.references
+        tlb_misses = references - self.tlb_hits
+        total_latency = (references * (TLB_LATENCY + MEMORY_LATENCY) + tlb_misses * MEMORY_LATENCY +
+                         self.page_faults * PAGE_FAULT_LATENCY)
+        return {
+            "policy": self.policy.name,
+            "references": references,
+            "page_faults": self.page_faults,
+            "hit_ratio": (references - self.page_faults) / references if references else 0.0,
+            "tlb_hit_ratio": self.tlb_hits / references if references else 0.0,
+            "avg_access_latency": total_latency / references if references else 0.0,
+            "references_per_second": references / self.elapsed if self.elapsed > 0 else 0.0
+        }
+
+
+def read_references(filename):
+    """
+    Yields (job id, virtual address) from a binary reference trace, mapping
+    the file into memory and decoding it one chunk at a time.
+    """
+    with open(filename, "rb") as file:
+        if file.read(len(REFERENCE_MAGIC)) != REFERENCE_MAGIC:
+            raise ValueError(f"{filename} is not a reference trace")
+        if os.path.getsize(filename) == len(REFERENCE_MAGIC):
+            return  # A trace with no references
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            chunk_size = REFERENCE_RECORD.size * RECORDS_PER_READ
+            end = len(data) - (len(data) - len(REFERENCE_MAGIC)) % REFERENCE_RECORD.size
+            for offset in range(len(REFERENCE_MAGIC), end, chunk_size):
+                yield from REFERENCE_RECORD.iter_unpack(data[offset:min(offset + chunk_size, end)])
+
+
+def write_references(filename, references):
+    """
+    Writes (job id, virtual address) references as a binary reference trace.
+    """
+    with open(filename, "wb") as file:
+        file.write(REFERENCE_MAGIC)
+        for job_id, address in references:
+            file.write(REFERENCE_RECORD.pack(job_id, address))
+
+
+def generate_references(jobs, count, seed=0, locality=0.9, working_set=8, page_size=PAGE_SIZE):
+    """
+    Yields `count` references by the given jobs, each within its job's size.
+
+    Jobs take turns in random bursts; with probability `locality` a job
+    touches one of the last `working_set` pages it used, otherwise a random
+    page of its address space.
+    """
+    generator = random.Random(seed)
+    recent = {job.id: [] for job in jobs}
+    produced = 0
+    while produced < count:
+        job = generator.choice(jobs)
+        pages = max(1, -(-job.size // page_size))
+        for _ in range(min(generator.randint(1, 64), count - produced)):
+            history = recent[job.id]
+            if history and generator.random() < locality:
+                page = generator.choice(history)
+            else:
+                page = generator.randrange(pages)
+                history.append(page)
+                if len(history) > working_set:
+                    history.pop(0)
+            yield job.id, page * page_size + generator.randrange(page_size)
+            produced += 1
+
+
+def display_reports(reports):
+    print("\n" + "="*78)
+    print("Paging Simulation")
+    print("="*78)
+    print(f"{'Policy':<8} {'References':<12} {'Faults':<10} {'Hit Ratio':<10} {'TLB Hits':<10} "
+          f"{'Latency (ns)':<14} {'Refs/s':<12}")
+    print("-"*78)
+    for report in reports:
+        print(f"{report['policy']:<8} {report['references']:<12} {report['page_faults']:<10} "
+              f"{report['hit_ratio']:<10.4f} {report['tlb_hit_ratio']:<10.4f} "
+              f"{report['avg_access_latency']:<14.1f} {report['references_per_second']:<12,.0f}")
+
+
+if __name__ == "__main__":
+    # Pass --trace FILE to replay a reference trace; otherwise one of --references N
+    # (default 1000000) references is generated for the default jobs into the temporary
+    # directory, where later runs can --trace it.  The default --frames covers the
+    # same physical memory as the default partitions.
+    option = lambda name, default: sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+    frames = int(option("--frames", sum(block.size for block in initialize_memory_blocks()) // PAGE_SIZE))
+    tlb_size = int(option("--tlb", TLB_SIZE))
+    trace = option("--trace", None)
+
+    if trace is None:
+        trace = os.path.join(tempfile.gettempdir(), "references.bin")
+        write_references(trace, generate_references(initialize_jobs(), int(option("--references", 1000000))))
+        print(f"Generated {trace} ({os.path.getsize(trace)} bytes)")
+
+    reports = []
+    for name in POLICIES:
+        simulator = PagingSimulator(frames, name, tlb_size)
+        reports.append(simulator.run(read_references(trace)))
+    display_reports(reports)
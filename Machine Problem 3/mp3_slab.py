@@ -0,0 +1,274 @@
+import sys
+from bisect import bisect_left
+
+from mp3 import (MemoryBlock, BlockTable, initialize_jobs, initialize_memory_blocks, first_fit, best_fit,
+                 worst_fit, allocate_block, run_parallel, compare_strategies)
+
+DEFAULT_CLASS_COUNT = 4
+
+
+class SizeClass:
+    """
+    One size class of a slab allocator: equal-sized slots and their free list.
+    """
+    def __init__(self, size):
+        """
+        Initializes an empty size class.
+        """
+        self.size = size
+        self.slots = []
+        self.free_slots = []  # Used as a stack, so allocation and release are O(1)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.allocations = 0
+        self.wasted_bytes = 0  # Slot space left unused by the jobs placed here
+        self.occupancy_area = 0
+        self.last_in_use = 0  # Slots in use when the occupancy was last accumulated
+
+    def __str__(self):
+        return f"Class {self.size} ({len(self.free_slots)}/{len(self.slots)} free)"
+
+
+class SlabMemory(BlockTable):
+    """
+    Memory carved into slots of a few fixed size classes.
+
+    Each class keeps its own free list, so a job is placed by looking up its
+    class and popping a free slot instead of searching every block.  With
+    spill=True a job whose class is full may take a slot from a larger class.
+    """
+    def __init__(self, layout, spill=True):
+        """
+        Initializes the slots from a layout of (class size, slot count) pairs.
+        """
+        self.classes = [SizeClass(size) for size, count in sorted(layout)]
+        self.class_sizes = [size_class.size for size_class in self.classes]
+        self.spill = spill
+        self.spilled_allocations = 0
+        self.last_time = None
+
+        memory_blocks = []
+        for (size, count), size_class in zip(sorted(layout), self.classes):
+            for _ in range(count):
+                block = MemoryBlock(len(memory_blocks) + 1, size)
+                block.size_class = size_class
+                size_class.slots.append(block)
+                memory_blocks.append(block)
+        super().__init__(memory_blocks)
+        # Hand out each class's lowest slots first
+        for size_class in self.classes:
+            size_class.free_slots = size_class.slots[::-1]
+
+    def class_index(self, size):
+        """
+        Returns the index of the smallest class that can hold `size`.
+        """
+        return bisect_left(self.class_sizes, size)
+
+    def find_slot(self, size):
+        """
+        Returns a free slot for `size` from its own class, or from the next
+        larger class with a free slot when spilling is allowed, or None.
+        """
+        index = self.class_index(size)
+        if index < len(self.classes) and self.classes[index].free_slots:
+            return self.classes[index].free_slots[-1]
+        if self.spill:
+            for size_class in self.classes[index + 1:]:
+                if size_class.free_slots:
+                    return size_class.free_slots[-1]
+        return None
+
+    def mark_allocated(self, block):
+        """
+        Pops the slot off its class's free list.
+        """
+        size_class = block.size_class
+        if size_class.free_slots[-1] is block:
+            size_class.free_slots.pop()
+        else:
+            size_class.free_slots.remove(block)  # Only when a slot is picked by hand
+        self.metrics.remove(block.size)
+        size_class.in_use += 1
+        size_class.peak_in_use = max(size_class.peak_in_use, size_class.in_use)
+        size_class.allocations += 1
+        size_class.wasted_bytes += block.size - block.allocated_job.size
+        if size_class is not self.classes[self.class_index(block.allocated_job.size)]:
+            self.spilled_allocations += 1
+
+    def mark_released(self, block):
+        """
+        Pushes the slot back onto its class's free list.
+        """
+        block.size_class.free_slots.append(block)
+        block.size_class.in_use -= 1
+        self.metrics.add(block.size)
+
+    def largest_free_size(self):
+        """
+        Returns the size of the largest class with a free slot, or 0.  Without
+        spilling this is only an upper bound on what can be allocated.
+        """
+        for size_class in reversed(self.classes):
+            if size_class.free_slots:
+                return size_class.size
+        return 0
+
+    # Every policy reduces to the size-class lookup
+    def find_first_fit(self, size):
+        return self.find_slot(size)
+
+    def find_best_fit(self, size):
+        return self.find_slot(size)
+
+    def find_worst_fit(self, size):
+        return self.find_slot(size)
+
+    def advance(self, current_time):
+        super().advance(current_time)
+        self.accumulate(current_time)
+
+    def accumulate(self, current_time):
+        """
+        Accumulates each class's slot occupancy up to `current_time`.
+        """
+        for size_class in self.classes:
+            if self.last_time is not None:
+                size_class.occupancy_area += size_class.last_in_use * (current_time - self.last_time)
+            size_class.last_in_use = size_class.in_use
+        self.last_time = current_time
+
+    def class_statistics(self, end_time):
+        """
+        Returns the slot count, allocations, peak slots in use, time-weighted
+        occupancy and average wasted bytes of every size class.
+        """
+        return [{
+            "size": c.size,
+            "slots": len(c.slots),
+            "allocations": c.allocations,
+            "peak_in_use": c.peak_in_use,
+            "occupancy": c.occupancy_area / (len(c.slots) * end_time) if c.slots and end_time else 0.0,
+            "avg_waste": c.wasted_bytes / c.allocations if c.allocations else 0.0
+        } for c in self.classes]
+
+    def statistics(self, end_time):
+        """
+        Returns the free-space statistics, time-weighted slot occupancy,
+        spill count and per-class statistics for the run.
+        """
+        # The memory itself no longer changes
+        self.accumulate(end_time)
+        slot_time = len(self) * end_time
+        return {
+            **super().statistics(end_time),
+            "avg_slot_occupancy": sum(c.occupancy_area for c in self.classes) / slot_time if slot_time else 0.0,
+            "spilled_allocations": self.spilled_allocations,
+            "size_classes": self.class_statistics(end_time)
+        }
+
+def display_classes(size_classes):
+    """
+    Prints occupancy and waste for every size class, from the "size_classes" statistics of a run.
+    """
+    print("\n" + "="*60)
+    print("Size Classes")
+    print("="*60)
+    print(f"{'Class':<10} {'Slots':<8} {'Allocs':<8} {'Peak Used':<10} {'Occupancy':<11} {'Avg Waste':<10}")
+    print("-"*60)
+    for c in size_classes:
+        print(f"{c['size']:<10} {c['slots']:<8} {c['allocations']:<8} {c['peak_in_use']:<10} "
+              f"{c['occupancy']:<11.4f} {c['avg_waste']:<10.2f}")
+
+
+def derive_size_classes(jobs, class_count=DEFAULT_CLASS_COUNT):
+    """
+    Splits the job sizes into class_count groups of about equal job count and
+    returns the largest size in each group as the class sizes.
+    """
+    sizes = sorted(job.size for job in jobs)
+    if not sizes:
+        return []
+    class_count = min(class_count, len(sizes))
+    return sorted({sizes[(i + 1) * len(sizes) // class_count - 1] for i in range(class_count)})
+
+
+def slab_layout(jobs, total_size, class_sizes=None, class_count=DEFAULT_CLASS_COUNT):
+    """
+    Returns (class size, slot count) pairs dividing total_size between the
+    size classes in proportion to the memory-time the jobs of each class need.
+    Classes are derived from the jobs unless class_sizes is given.  Every
+    class gets at least one slot, and the slots never exceed total_size.
+    """
+    class_sizes = sorted(class_sizes or derive_size_classes(jobs, class_count))
+    demand = [0] * len(class_sizes)
+    for job in jobs:
+        index = bisect_left(class_sizes, job.size)
+        if index < len(class_sizes):
+            demand[index] += class_sizes[index] * job.execution_time
+    total_demand = sum(demand) or 1
+
+    # Every class gets one slot, then its share of the memory left after those
+    budget = total_size - sum(class_sizes)
+    if budget < 0:
+        raise ValueError(f"{total_size} bytes cannot hold one slot of each size class {class_sizes}")
+    counts = [1 + budget * d // total_demand // size for size, d in zip(class_sizes, demand)]
+    # Spend what rounding left over on extra slots, largest classes first
+    remaining = total_size - sum(size * count for size, count in zip(class_sizes, counts))
+    for index in range(len(class_sizes) - 1, -1, -1):
+        while remaining >= class_sizes[index]:
+            counts[index] += 1
+            remaining -= class_sizes[index]
+    return list(zip(class_sizes, counts))
+
+
+def slab_allocation(job, memory_blocks):
+    """
+    Allocates memory to a job from the free list of its size class.
+
+    memory_blocks must be a SlabMemory.
+    """
+    if not isinstance(memory_blocks, SlabMemory):
+        raise TypeError("slab_allocation needs a SlabMemory")
+    block = memory_blocks.find_slot(job.size)
+    if block is None:
+        return False
+    allocate_block(job, block)
+    return True
+
+
+def parse_classes(text):
+    """
+    Parses a class list such as "1000,4000,9000" or, with slot counts, "1000x5,4000x3".
+    """
+    classes = [item.split("x") for item in text.split(",")]
+    if all(len(item) == 2 for item in classes):
+        return [(int(size), int(count)) for size, count in classes]
+    return [int(item[0]) for item in classes]
+
+
+if __name__ == "__main__":
+    # Pass --event-driven to jump between arrivals and completions, --classes to configure the size classes
+    event_driven = "--event-driven" in sys.argv
+    configured = parse_classes(sys.argv[sys.argv.index("--classes") + 1]) if "--classes" in sys.argv else None
+
+    configurations = [
+        {"jobs": initialize_jobs(), "memory_blocks": initialize_memory_blocks(), "allocation_strategy": strategy,
+         "event_driven": event_driven}
+        for strategy in (first_fit, best_fit, worst_fit)
+    ]
+
+    # The slabs share the same amount of memory as the fixed partitions
+    jobs = initialize_jobs()
+    total_size = sum(block.size for block in initialize_memory_blocks())
+    if configured and isinstance(configured[0], tuple):
+        layout = configured
+    else:
+        layout = slab_layout(jobs, total_size, class_sizes=configured)
+    configurations.append({"jobs": jobs, "memory_blocks": SlabMemory(layout), "allocation_strategy": slab_allocation,
+                           "event_driven": event_driven})
+    results = run_parallel(configurations)
+
+    compare_strategies(results)
+    if results[-1]:
+        display_classes(results[-1]["size_classes"])
@@ -0,0 +1,148 @@
+"""
+Job and partition traces for the memory simulator.
+
+Traces are CSV files with a header row, JSONL files with one object per
+line, or compact binary files of fixed-size little-endian records after a
+4-byte magic number.  Job traces are read lazily in arrival order, so a
+simulation can consume a trace far larger than memory.
+
+    jobs:       id, arrival_time, size, execution_time
+    partitions: id, size
+"""
+import csv
+import json
+import os
+import struct
+import sys
+
+from mp3 import Job, MemoryBlock, first_fit, best_fit, worst_fit, run_parallel, compare_strategies
+from mp3_log import LEVELS, SUMMARY
+
+JOB_FIELDS = ("id", "arrival_time", "size", "execution_time")
+BLOCK_FIELDS = ("id", "size")
+JOB_RECORD = struct.Struct("<IIII")
+BLOCK_RECORD = struct.Struct("<II")
+JOB_MAGIC = b"MP3J"
+BLOCK_MAGIC = b"MP3B"
+RECORDS_PER_READ = 4096
+
+
+def read_records(filename, fields, record, magic):
+    """
+    Yields tuples of integer fields from a CSV, JSONL or binary trace file.
+    """
+    if filename.endswith(".bin"):
+        with open(filename, "rb") as file:
+            if file.read(len(magic)) != magic:
+                raise ValueError(f"{filename} is not a {magic.decode()} trace")
+            while True:
+                chunk = file.read(record.size * RECORDS_PER_READ)
+                if len(chunk) % record.size:
+                    raise ValueError(f"{filename} ends with a partial record")
+                if not chunk:
+                    break
+                yield from record.iter_unpack(chunk)
+    elif filename.endswith(".jsonl"):
+        with open(filename) as file:
+            for line in file:
+                if line.strip():
+                    values = json.loads(line)
+                    yield tuple(int(values[field]) for field in fields)
+    else:
+        with open(filename, newline="") as file:
+            reader = csv.reader(file)
+            header = [name.strip() for name in next(reader)]
+            columns = [header.index(field) for field in fields]
+            for row in reader:
+                if row:
+                    yield tuple(int(row[column]) for column in columns)
+
+
+def write_records(filename, fields, record, magic, rows):
+    """
+    Writes tuples of integer fields to a CSV, JSONL or binary trace file.
+    """
+    if filename.endswith(".bin"):
+        with open(filename, "wb") as file:
+            file.write(magic)
+            for row in rows:
+                file.write(record.pack(*row))
+    elif filename.endswith(".jsonl"):
+        with open(filename, "w") as file:
+            for row in rows:
+                file.write(json.dumps(dict(zip(fields, row))) + "\n")
+    else:
+        with open(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            writer.writerows(rows)
+
+
+def load_jobs(filename):
+    """
+    Yields the jobs of a trace one at a time, checking they are in arrival order.
+    """
+    previous_arrival = None
+    for id, arrival_time, size, execution_time in read_records(filename, JOB_FIELDS, JOB_RECORD, JOB_MAGIC):
+        if previous_arrival is not None and arrival_time < previous_arrival:
+            raise ValueError(f"{filename}: job {id} arrives at {arrival_time}, before the job ahead of it "
+                             f"({previous_arrival}); job traces must be sorted by arrival time")
+        previous_arrival = arrival_time
+        yield Job(id, arrival_time, size, execution_time)
+
+
+def load_memory_blocks(filename):
+    """
+    Returns the partitions of a trace as a list of MemoryBlock objects.
+    """
+    return [MemoryBlock(id, size) for id, size in read_records(filename, BLOCK_FIELDS, BLOCK_RECORD, BLOCK_MAGIC)]
+
+
+def write_jobs(filename, jobs):
+    write_records(filename, JOB_FIELDS, JOB_RECORD, JOB_MAGIC,
+                  ((job.id, job.arrival_time, job.size, job.execution_time) for job in jobs))
+
+
+def write_memory_blocks(filename, memory_blocks):
+    write_records(filename, BLOCK_FIELDS, BLOCK_RECORD, BLOCK_MAGIC,
+                  ((block.id, block.size) for block in memory_blocks))
+
+
+class JobTrace:
+    """
+    A job trace file that run_simulation can stream from.
+
+    Every iteration reads the file again from the start, and the object
+    only holds the file name, so it can be sent to worker processes.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __iter__(self):
+        return load_jobs(self.filename)
+
+
+if __name__ == "__main__":
+    # Usage: mp3_trace.py JOBS PARTITIONS [--event-driven] [--log LEVEL] [--time-limit T]
+    #        mp3_trace.py --convert IN OUT    (job traces; use --convert-blocks for partitions)
+    if "--convert" in sys.argv or "--convert-blocks" in sys.argv:
+        blocks = "--convert-blocks" in sys.argv
+        source, target = sys.argv[sys.argv.index("--convert-blocks" if blocks else "--convert") + 1:][:2]
+        if blocks:
+            write_memory_blocks(target, load_memory_blocks(source))
+        else:
+            write_jobs(target, load_jobs(source))
+        print(f"Wrote {target} ({os.path.getsize(target)} bytes)")
+        sys.exit()
+
+    job_file, block_file = sys.argv[1], sys.argv[2]
+    event_driven = "--event-driven" in sys.argv
+    log_level = LEVELS[sys.argv[sys.argv.index("--log") + 1]] if "--log" in sys.argv else SUMMARY
+    time_limit = int(sys.argv[sys.argv.index("--time-limit") + 1]) if "--time-limit" in sys.argv else 10 ** 9
+
+    configurations = [
+        {"jobs": JobTrace(job_file), "memory_blocks": load_memory_blocks(block_file), "allocation_strategy": strategy,
+         "event_driven": event_driven, "log": log_level, "time_limit": time_limit}
+        for strategy in (first_fit, worst_fit, best_fit)
+    ]
+    compare_strategies(run_parallel(configurations))
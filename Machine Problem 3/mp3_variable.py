@@ -0,0 +1,454 @@
+import math
+import sys
+from bisect import bisect_left, insort
+
+from mp3 import (MemoryBlock, BlockTable, initialize_jobs, initialize_memory_blocks, first_fit, best_fit,
+                 worst_fit, allocate_block, run_parallel, compare_strategies)
+
+# Bytes a compaction moves per simulated time unit
+COMPACTION_BYTES_PER_TIME_UNIT = 10000
+
+
+class VariablePartitionMemory(BlockTable):
+    """
+    One contiguous region of memory carved into variable-sized partitions.
+
+    Allocating a job splits the chosen hole so the job gets exactly the size
+    it asked for, and releasing a partition coalesces it with free
+    neighbours, so there is no internal fragmentation; instead free memory
+    ends up scattered in holes too small for the waiting jobs (external
+    fragmentation).  The blocks stay in address order, and a block's
+    position is its start address.
+    """
+    divisible = True
+
+    def __init__(self, total_size):
+        """
+        Initializes the region as a single hole of `total_size` bytes.
+        """
+        # The region starts with no blocks; the hole covering it is added below
+        super().__init__()
+        self.total_size = total_size
+        self.free_size = total_size
+        self.next_block_id = 1
+        # Start addresses of the holes, sorted, for address-ordered policies
+        self.hole_addresses = []
+        self.holes = {}  # Start address -> free block
+        # free_blocks holds (size, address) of every hole, for best-fit and worst-fit
+        # Any job up to the whole region can fit once enough memory is released
+        self.largest_block_size = total_size
+        self.roving_address = 0  # Where next-fit resumes its search
+        self.splits = 0
+        self.coalesces = 0
+
+        self.add_hole(self.new_block(0, total_size))
+
+    def new_block(self, address, size):
+        """
+        Creates a block at `address` and inserts it in address order.
+        """
+        block = MemoryBlock(self.next_block_id, size)
+        self.next_block_id += 1
+        block.table = self
+        block.position = address
+        self.insert(bisect_left(self, address, key=lambda b: b.position), block)
+        return block
+
+    def index_of(self, block):
+        return bisect_left(self, block.position, key=lambda b: b.position)
+
+    def add_hole(self, block):
+        insort(self.hole_addresses, block.position)
+        self.holes[block.position] = block
+        insort(self.free_blocks, (block.size, block.position))
+        self.metrics.add(block.size)
+
+    def remove_hole(self, block):
+        del self.hole_addresses[bisect_left(self.hole_addresses, block.position)]
+        del self.holes[block.position]
+        del self.free_blocks[bisect_left(self.free_blocks, (block.size, block.position))]
+        self.metrics.remove(block.size)
+
+    def mark_allocated(self, block):
+        """
+        Gives the job exactly its size and returns the rest of the hole to the free list.
+        """
+        self.remove_hole(block)
+        size = block.allocated_job.size
+        if block.size > size:
+            remainder = self.new_block(block.position + size, block.size - size)
+            block.size = size
+            self.add_hole(remainder)
+            self.splits += 1
+        self.free_size -= block.size
+        self.roving_address = block.position + block.size
+
+    def mark_released(self, block):
+        """
+        Returns a partition to the free list, merging it with free neighbours.
+        """
+        self.free_size += block.size
+        index = self.index_of(block)
+        if index + 1 < len(self) and not self[index + 1].is_allocated:
+            right = self[index + 1]
+            self.remove_hole(right)
+            block.size += right.size
+            del self[index + 1]
+            self.coalesces += 1
+        if index > 0 and not self[index - 1].is_allocated:
+            left = self[index - 1]
+            self.remove_hole(left)
+            left.size += block.size
+            del self[index]
+            self.coalesces += 1
+            block = left
+        self.add_hole(block)
+
+    def find_first_fit(self, size):
+        """
+        Returns the lowest-addressed hole that can hold `size`, or None.
+        """
+        for address in self.hole_addresses:
+            if self.holes[address].size >= size:
+                return self.holes[address]
+        return None
+
+    def find_next_fit(self, size):
+        """
+        Returns the first hole that can hold `size`, searching from where the
+        last allocation ended and wrapping around to the start, or None.
+        """
+        addresses = self.hole_addresses
+        holes = self.holes
+        start = bisect_left(addresses, self.roving_address)
+        for index in range(start, len(addresses)):
+            if holes[addresses[index]].size >= size:
+                return holes[addresses[index]]
+        for index in range(start):
+            if holes[addresses[index]].size >= size:
+                return holes[addresses[index]]
+        return None
+
+    def find_best_fit(self, size):
+        """
+        Returns the smallest hole that can hold `size`, or None.
+        """
+        index = bisect_left(self.free_blocks, (size, -1))
+        if index == len(self.free_blocks):
+            return None
+        return self.holes[self.free_blocks[index][1]]
+
+    def find_worst_fit(self, size):
+        """
+        Returns the largest hole if it can hold `size`, or None.
+        """
+        if not self.free_blocks or self.free_blocks[-1][0] < size:
+            return None
+        largest = self.free_blocks[-1][0]
+        return self.holes[self.free_blocks[bisect_left(self.free_blocks, (largest, -1))][1]]
+
+    def external_fragmentation(self):
+        """
+        Returns the share of free memory lying outside the largest hole.
+        """
+        return self.metrics.fragmentation_index()
+
+    def statistics(self, end_time):
+        """
+        Adds the split and coalesce counts to the free-space statistics.
+        """
+        return {
+            **super().statistics(end_time),
+            "splits": self.splits,
+            "coalesces": self.coalesces
+        }
+
+
+class CompactingMemory(VariablePartitionMemory):
+    """
+    Variable partitions that can be compacted: every partition in use slides
+    down to the lowest free address, leaving one hole at the top.
+
+    Compaction runs when any of its triggers is set and fires:
+      on_failure  a job fits in the total free memory but in no single hole
+                  (the job is placed right after compacting)
+      threshold   the fragmentation index reaches this value at the end of a time step
+      period      this many time units have passed since the last compaction
+
+    Moving a partition costs its size divided by bytes_per_time_unit.  By
+    default the cost is only reported, so the schedule is the one compaction
+    would give for free.  With charge_cost the moves stall the memory: after
+    a compaction no job is placed for the cost rounded up to whole time
+    units, and a job that triggered an on_failure compaction waits too.
+    """
+    def __init__(self, total_size, on_failure=False, threshold=None, period=None,
+                 bytes_per_time_unit=COMPACTION_BYTES_PER_TIME_UNIT, charge_cost=False):
+        """
+        Initializes the region as a single hole with the given compaction triggers.
+        """
+        super().__init__(total_size)
+        self.on_failure = on_failure
+        self.threshold = threshold
+        self.period = period
+        self.bytes_per_time_unit = bytes_per_time_unit
+        self.charge_cost = charge_cost
+        self.compactions = 0
+        self.bytes_moved = 0
+        self.last_compaction_time = 0
+        self.compacted_at = None  # Time of the last threshold or periodic compaction
+        # Jobs larger than every hole before the last compaction that were
+        # placed in the hole it gathered, before any partition was released
+        # again, count as unblocked by it
+        self.unblock_limit = None
+        self.compacted_from = None
+        self.unblocked_jobs = 0
+        # Bytes moved since the last advance(), which turns them into a stall
+        self.unpaid_bytes = 0
+        self.stalled = False
+        self.stalled_until = 0  # First time jobs may be placed again
+        self.stall_time = 0
+
+    def compact(self):
+        """
+        Slides every partition in use down to the lowest free address and
+        merges all holes into one at the top.  O(number of blocks).
+        """
+        largest_before = self.metrics.largest_free()
+        moved = self.bytes_moved
+        for hole in list(self.holes.values()):
+            self.remove_hole(hole)
+        self[:] = [block for block in self if block.is_allocated]
+        address = 0
+        for block in self:
+            if block.position != address:
+                self.bytes_moved += block.size
+                block.position = address
+            address += block.size
+        if address < self.total_size:
+            self.add_hole(self.new_block(address, self.total_size - address))
+        self.roving_address = address
+        self.compactions += 1
+        if self.charge_cost and self.bytes_moved > moved:
+            self.unpaid_bytes += self.bytes_moved - moved
+            self.stalled = True
+        self.unblock_limit = largest_before
+        self.compacted_from = address
+
+    def fit_or_compact(self, find, size):
+        """
+        Returns find(size), compacting first when that fails but the free
+        memory as a whole could hold `size` and on_failure is set.  Returns
+        None while the memory is stalled by a charged compaction.
+        """
+        if self.stalled:
+            return None
+        block = find(size)
+        if block is None and self.on_failure and len(self.holes) > 1 and self.free_size >= size:
+            self.compact()
+            if not self.stalled:
+                block = find(size)
+        return block
+
+    def find_first_fit(self, size):
+        return self.fit_or_compact(super().find_first_fit, size)
+
+    def find_next_fit(self, size):
+        return self.fit_or_compact(super().find_next_fit, size)
+
+    def find_best_fit(self, size):
+        return self.fit_or_compact(super().find_best_fit, size)
+
+    def find_worst_fit(self, size):
+        return self.fit_or_compact(super().find_worst_fit, size)
+
+    def largest_free_size(self):
+        """
+        Returns the largest allocatable size: with on_failure compaction any
+        job up to the total free memory can be placed, and while stalled none.
+        """
+        if self.stalled:
+            return 0
+        return self.free_size if self.on_failure else super().largest_free_size()
+
+    def mark_allocated(self, block):
+        """
+        Splits the hole as usual and counts jobs only compaction made room for.
+        """
+        if (self.unblock_limit is not None and block.allocated_job.size > self.unblock_limit
+                and block.position >= self.compacted_from):
+            self.unblocked_jobs += 1
+        super().mark_allocated(block)
+
+    def mark_released(self, block):
+        """
+        Coalesces as usual; room made by a release is no longer credited to the last compaction.
+        """
+        self.unblock_limit = None
+        self.compacted_from = None
+        super().mark_released(block)
+
+    def advance(self, current_time):
+        """
+        Runs the threshold and periodic triggers, charges the compactions of
+        this time step, then accumulates the statistics.
+        """
+        if len(self.holes) > 1:
+            due = self.period is not None and current_time - self.last_compaction_time >= self.period
+            if due or (self.threshold is not None and self.external_fragmentation() >= self.threshold):
+                self.compact()
+                self.last_compaction_time = self.compacted_at = current_time
+        if self.unpaid_bytes:
+            stall = math.ceil(self.unpaid_bytes / self.bytes_per_time_unit)
+            start = max(self.stalled_until, current_time)
+            self.stalled_until = start + stall
+            self.stall_time += stall
+            self.unpaid_bytes = 0
+        # Jobs are placed before the next advance(), at the next time step
+        self.stalled = current_time + 1 < self.stalled_until
+        super().advance(current_time)
+
+    def wake_time(self, now):
+        """
+        Returns the tick after a compaction, when the tick loop retries the
+        waiting jobs, the last stalled tick, where advance() lifts a stall,
+        and the tick after it, or else the next periodic compaction while
+        there are holes to merge.
+        """
+        times = []
+        if self.compacted_at == now:
+            times.append(now + 1)
+        if self.stalled_until > now:
+            times.append(max(self.stalled_until - 1, now + 1))
+        if self.period is not None and len(self.holes) > 1:
+            times.append(max(self.last_compaction_time + self.period, now + 1))
+        return min(times, default=None)
+
+    def statistics(self, end_time):
+        """
+        Adds the compaction count, bytes moved, simulated cost, time stalled
+        by charged compactions and unblocked jobs.
+        """
+        compaction_time = self.bytes_moved / self.bytes_per_time_unit
+        return {
+            **super().statistics(end_time),
+            "compactions": self.compactions,
+            "compaction_bytes_moved": self.bytes_moved,
+            "compaction_time": compaction_time,
+            "compaction_overhead": compaction_time / end_time if end_time else 0.0,
+            "compaction_stall_time": self.stall_time,
+            "unblocked_jobs": self.unblocked_jobs
+        }
+
+
+def next_fit(job, memory_blocks):
+    """
+    Allocates memory to a job using the Next-Fit algorithm.
+
+    Only variable partitions keep a roving pointer; on fixed partitions this
+    behaves like First-Fit.
+    """
+    if not isinstance(memory_blocks, VariablePartitionMemory):
+        return first_fit(job, memory_blocks)
+    block = memory_blocks.find_next_fit(job.size)
+    if block is None:
+        return False
+    allocate_block(job, block)
+    return True
+
+
+def parse_compaction(text):
+    """
+    Parses compaction triggers such as "failure", "threshold=0.5" or
+    "failure,period=20,charge" into CompactingMemory keyword arguments.
+    """
+    triggers = {}
+    for item in text.split(","):
+        name, _, value = item.partition("=")
+        if name == "failure":
+            triggers["on_failure"] = True
+        elif name == "threshold":
+            triggers["threshold"] = float(value)
+        elif name == "period":
+            triggers["period"] = int(value)
+        elif name == "bandwidth":
+            triggers["bytes_per_time_unit"] = float(value)
+        elif name == "charge":
+            triggers["charge_cost"] = True
+        else:
+            raise ValueError(f"Unknown compaction trigger {name!r}, "
+                             f"expected failure, threshold, period, bandwidth or charge")
+    return triggers
+
+
+def total_memory_size():
+    """
+    Returns the combined size of the fixed partitions, so both modes manage the same memory.
+    """
+    return sum(block.size for block in initialize_memory_blocks())
+
+
+if __name__ == "__main__":
+    # Pass --event-driven to jump between arrivals and completions instead of ticking
+    # and --compact TRIGGERS (see parse_compaction) to choose when compaction runs
+    event_driven = "--event-driven" in sys.argv
+    triggers = parse_compaction(sys.argv[sys.argv.index("--compact") + 1] if "--compact" in sys.argv else "failure")
+
+    configurations = [
+        {"jobs": initialize_jobs(), "memory_blocks": initialize_memory_blocks(), "allocation_strategy": strategy,
+         "event_driven": event_driven, "label": "Fixed " + strategy.__name__.replace('_', ' ').title()}
+        for strategy in (first_fit, best_fit, worst_fit)
+    ]
+    configurations += [
+        {"jobs": initialize_jobs(), "memory_blocks": VariablePartitionMemory(total_memory_size()),
+         "allocation_strategy": strategy, "event_driven": event_driven,
+         "label": "Var " + strategy.__name__.replace('_', ' ').title()}
+        for strategy in (first_fit, best_fit, worst_fit, next_fit)
+    ]
+    configurations += [
+        {"jobs": initialize_jobs(), "memory_blocks": CompactingMemory(total_memory_size(), **triggers),
+         "allocation_strategy": strategy, "event_driven": event_driven,
+         "label": "Compact " + strategy.__name__.replace('_', ' ').title()}
+        for strategy in (first_fit, best_fit, worst_fit, next_fit)
+    ]
+    # The same compactions again with their cost charged in simulated time
+    configurations += [
+        {"jobs": initialize_jobs(),
+         "memory_blocks": CompactingMemory(total_memory_size(), **{**triggers, "charge_cost": True}),
+         "allocation_strategy": strategy, "event_driven": event_driven,
+         "label": "Charged " + strategy.__name__.replace('_', ' ').title()}
+        for strategy in (first_fit, best_fit, worst_fit, next_fit)
+    ]
+    results = run_parallel(configurations)
+    variable_results = results[3:7]
+    compacting_results = results[7:11]
+    charged_results = results[11:]
+
+    # Compare fixed and variable partitioning
+    compare_strategies(results)
+
+    print("\n" + "="*60)
+    print("External Fragmentation (variable partitions)")
+    print("="*60)
+    print(f"{'Strategy':<15} {'Avg Frag':<10} {'Peak Frag':<10} {'Largest Hole':<13} {'Utilisation':<12} "
+          f"{'Throughput':<12}")
+    print("-"*60)
+    for result in variable_results:
+        if result:
+            print(f"{result['strategy']:<15} {result['avg_fragmentation_index']:<10.4f} "
+                  f"{result['peak_fragmentation_index']:<10.4f} {result['avg_largest_free_block']:<13.1f} "
+                  f"{1 - result['avg_free_memory'] / total_memory_size():<12.4f} {result['throughput']:<12.4f}")
+
+    print("\n" + "="*90)
+    print("Compaction (" + ", ".join(f"{name}={value}" for name, value in triggers.items()) + ")")
+    print("="*90)
+    print(f"{'Strategy':<20} {'Runs':<6} {'Bytes Moved':<12} {'Cost':<8} {'Unblocked':<10} {'Throughput':<11} "
+          f"{'Charged':<8} {'Stalled':<8} {'Without':<10}")
+    print("-"*90)
+    # Throughput has compaction for free, Charged stalls the memory for its cost, Without never compacts
+    for result, charged, plain in zip(compacting_results, charged_results, variable_results):
+        if result:
+            print(f"{result['strategy']:<20} {result['compactions']:<6} {result['compaction_bytes_moved']:<12} "
+                  f"{result['compaction_time']:<8.2f} {result['unblocked_jobs']:<10} {result['throughput']:<11.4f} "
+                  f"{charged['throughput'] if charged else 0:<8.4f} "
+                  f"{charged['compaction_stall_time'] if charged else 0:<8} "
+                  f"{plain['throughput'] if plain else 0:<10.4f}")
@@ -0,0 +1,152 @@
+import random
+
+import pytest
+
+from mp3 import (REJECTED_SAMPLE_SIZE, BlockTable, Job, MaxSegmentTree, MemoryBlock, MemorySimulation, OrderedMaxTree,
+                 WaitingQueue, allocate_block, initialize_jobs, initialize_memory_blocks, first_fit, best_fit, worst_fit,
+                 release_block, run_simulation)
+from mp3_log import SILENT
+from mp3_variable import VariablePartitionMemory
+
+
+def random_jobs(seed, count=40):
+    rng = random.Random(seed)
+    arrival = 0
+    jobs = []
+    for i in range(count):
+        arrival += rng.choice((0, 0, 1, 3))
+        jobs.append(Job(i + 1, arrival, rng.randint(100, 10000), rng.randint(1, 10)))
+    return jobs
+
+
+def run(jobs, strategy, event_driven, policy):
+    result = run_simulation(jobs, initialize_memory_blocks(), strategy, event_driven, policy, log=SILENT)
+    # The time-weighted averages are summed in a different order in each mode
+    rounded = {name: round(value, 9) if isinstance(value, float) else value for name, value in result.items()}
+    return rounded, sorted((job.id, job.start_time, job.finish_time, job.waiting_time) for job in jobs)
+
+
+@pytest.mark.parametrize("policy", WaitingQueue.POLICIES)
+@pytest.mark.parametrize("strategy", [first_fit, best_fit, worst_fit])
+def test_tick_and_event_runs_agree(strategy, policy):
+    assert run(initialize_jobs(), strategy, False, policy) == run(initialize_jobs(), strategy, True, policy)
+    for seed in range(5):
+        assert run(random_jobs(seed), strategy, False, policy) == run(random_jobs(seed), strategy, True, policy)
+
+
+def start_order(jobs, make_memory, policy):
+    # (start time, job id) in start order, the same in both modes
+    orders = []
+    for event_driven in (False, True):
+        started = [Job(*job) for job in jobs]
+        run_simulation(started, make_memory(), first_fit, event_driven, policy, log=SILENT)
+        orders.append(sorted((job.start_time, job.id) for job in started))
+    assert orders[0] == orders[1]
+    return orders[0]
+
+
+# Job 1 holds the only partition for one tick; the rest then run one at a time
+MIXED_SIZES = [(1, 0, 100, 1), (2, 0, 3000, 1), (3, 0, 500, 1), (4, 0, 8000, 1), (5, 0, 500, 1), (6, 0, 2000, 1)]
+
+
+@pytest.mark.parametrize("policy, order", [
+    ("fifo", [1, 2, 3, 4, 5, 6]),
+    # Equal sizes keep queue order
+    ("smallest", [1, 3, 5, 6, 2, 4]),
+    ("largest", [1, 4, 2, 6, 3, 5]),
+])
+def test_queue_policy_dispatch_order(policy, order):
+    assert start_order(MIXED_SIZES, lambda: [MemoryBlock(1, 10000)], policy) == list(enumerate(order))
+
+
+def test_sjf_orders_by_execution_time():
+    jobs = [(1, 0, 100, 1), (2, 0, 100, 5), (3, 0, 100, 2), (4, 0, 100, 3), (5, 0, 100, 2)]
+    assert start_order(jobs, lambda: [MemoryBlock(1, 10000)], "fifo") == [(0, 1), (1, 2), (6, 3), (8, 4), (11, 5)]
+    # Shortest first, equal times in queue order
+    assert start_order(jobs, lambda: [MemoryBlock(1, 10000)], "sjf") == [(0, 1), (1, 3), (3, 5), (5, 4), (8, 2)]
+
+
+# Job 2 needs 8000 of 10000 bytes and is reserved the time job 1 ends, 10.
+# Job 3 finishes by then and jumps ahead; job 4 would still be running and
+# holding the bytes above job 3's hole, so under backfilling it waits.
+BACKFILL_JOBS = [(1, 0, 4000, 10), (2, 0, 8000, 3), (3, 1, 3000, 4), (4, 2, 3000, 20)]
+
+
+def test_backfill_never_delays_the_head_reservation():
+    assert start_order(BACKFILL_JOBS, lambda: VariablePartitionMemory(10000), "fifo") == \
+        [(0, 1), (1, 3), (2, 4), (22, 2)]
+    assert start_order(BACKFILL_JOBS, lambda: VariablePartitionMemory(10000), "backfill") == [(0, 1), (1, 3), (10, 2), (13, 4)]
+
+
+def test_block_table_lookups_match_linear_scans():
+    rng = random.Random(0)
+    for _ in range(20):
+        # Few distinct sizes, so ties between equal blocks are common
+        table = BlockTable([MemoryBlock(i + 1, rng.choice((100, 250, 250, 600, 1000, 1000, 4000)))
+                            for i in range(rng.randint(1, 70))])
+        for step in range(300):
+            allocated = [block for block in table if block.is_allocated]
+            if allocated and rng.random() < 0.45:
+                release_block(rng.choice(allocated))
+            elif len(allocated) < len(table):
+                allocate_block(Job(step, 0, 1, 1), rng.choice([block for block in table if not block.is_allocated]))
+            size = rng.randint(1, 4500)
+            fitting = [block for block in table if not block.is_allocated and block.size >= size]
+            largest = max((block.size for block in fitting), default=None)
+            assert table.find_first_fit(size) is (fitting[0] if fitting else None)
+            assert table.find_best_fit(size) is min(fitting, key=lambda block: block.size, default=None)
+            assert table.find_worst_fit(size) is next((block for block in fitting if block.size == largest), None)
+            assert table.largest_free_size() == max((block.size for block in table if not block.is_allocated),
+                                                    default=0)
+
+
+def test_max_segment_tree_matches_a_linear_scan():
+    rng = random.Random(0)
+    for _ in range(20):
+        values = [rng.randint(-1, 50) for _ in range(rng.randint(1, 40))]
+        tree = MaxSegmentTree(values)
+        for _ in range(200):
+            index = rng.randrange(len(values))
+            values[index] = rng.randint(-1, 50)
+            tree.update(index, values[index])
+            threshold, start = rng.randint(0, 55), rng.randrange(len(values) + 2)
+            assert tree.max() == max(values)
+            assert tree.find_first(threshold, start) == \
+                next((i for i in range(start, len(values)) if values[i] >= threshold), None)
+
+
+def test_ordered_max_tree_matches_a_sorted_list():
+    rng = random.Random(0)
+    tree = OrderedMaxTree()
+    entries = {}  # key -> value
+    for step in range(3000):
+        if entries and rng.random() < 0.45:
+            key = rng.choice(list(entries))
+            del entries[key]
+            tree.remove(key)
+        else:
+            key = (rng.randint(1, 12), step)
+            entries[key] = -rng.randint(100, 10000)
+            tree.insert(key, entries[key])
+        assert tree.max() == max(entries.values(), default=float('-inf'))
+        threshold = -rng.randint(100, 10000)
+        after = rng.choice([None, *entries]) if entries else None
+        assert tree.find_first(threshold, after) == next(
+            (key for key in sorted(entries) if (after is None or key > after) and entries[key] >= threshold), None)
+
+
+def test_streamed_runs_keep_a_sample_of_the_rejected_jobs():
+    def jobs():
+        for i in range(1000):
+            # Every other job is larger than any partition
+            yield Job(i + 1, i // 10, 20000 if i % 2 else 500, 1)
+
+    simulation = MemorySimulation(jobs(), initialize_memory_blocks(), first_fit, log=SILENT)
+    result = simulation.run()
+    assert result["jobs_completed"] == 500
+    assert len(simulation.never_allocated_jobs) == 500
+    assert [job.id for job in simulation.never_allocated_jobs] == list(range(2, 2 * REJECTED_SAMPLE_SIZE + 1, 2))
+
+    listed = MemorySimulation(list(jobs()), initialize_memory_blocks(), first_fit, log=SILENT)
+    listed.run()
+    assert len(list(listed.never_allocated_jobs)) == 500
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from mp3 import first_fit
+from mp3_bench import (ARRIVAL_PATTERNS, MAX_EXECUTION_TIME, MAX_JOB_SIZE, MIN_JOB_SIZE, SIZE_DISTRIBUTIONS,
+                       arrival_times, benchmark, generate_jobs, generate_partitions, job_size)
+
+
+@pytest.mark.parametrize("distribution", SIZE_DISTRIBUTIONS)
+def test_job_sizes_stay_in_range(distribution):
+    rng = random.Random(0)
+    sizes = [job_size(distribution, rng) for _ in range(5000)]
+    assert all(MIN_JOB_SIZE <= size <= MAX_JOB_SIZE for size in sizes)
+    assert len(set(sizes)) > 100
+
+
+@pytest.mark.parametrize("pattern", ARRIVAL_PATTERNS)
+def test_arrival_times_are_sorted(pattern):
+    arrivals = list(arrival_times(pattern, 1000, 2.5, random.Random(0)))
+    assert len(arrivals) == 1000
+    assert arrivals == sorted(arrivals)
+    assert arrivals[0] >= 0
+
+
+def test_unknown_names_raise():
+    with pytest.raises(ValueError):
+        job_size("normal", random.Random(0))
+    with pytest.raises(ValueError):
+        list(arrival_times("steady", 1, 1.0, random.Random(0)))
+
+
+@pytest.mark.parametrize("distribution", SIZE_DISTRIBUTIONS)
+@pytest.mark.parametrize("pattern", ARRIVAL_PATTERNS)
+def test_workloads_are_reproducible_from_the_seed(distribution, pattern):
+    jobs = generate_jobs(500, 50, distribution, pattern, seed=7)
+    assert generate_jobs(500, 50, distribution, pattern, seed=7) == jobs
+    assert generate_jobs(500, 50, distribution, pattern, seed=8) != jobs
+    assert [job[0] for job in jobs] == list(range(1, 501))
+    assert all(1 <= job[3] <= MAX_EXECUTION_TIME for job in jobs)
+    assert generate_partitions(50, seed=7) == generate_partitions(50, seed=7)
+
+
+def test_benchmark_records_are_reproducible():
+    first = benchmark(first_fit, 20, 200, "bimodal", "burst", seed=3, measure_memory=False)
+    second = benchmark(first_fit, 20, 200, "bimodal", "burst", seed=3, measure_memory=False)
+    timing = ("seconds", "allocations_per_second")
+    assert {k: v for k, v in first.items() if k not in timing} == {k: v for k, v in second.items() if k not in timing}
+    assert first["allocations"] >= first["jobs_completed"] > 0
+    assert first["peak_memory_bytes"] is None
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from mp3 import BlockTable, Job, release_block
+from mp3_buddy import BuddyMemory, buddy_system
+
+
+def check_invariants(memory):
+    address = 0
+    for block in memory:
+        # The blocks tile the region, each a power of two aligned to its size
+        assert block.position == address
+        assert block.size & (block.size - 1) == 0 and block.position % block.size == 0
+        address += block.size
+        order = block.size.bit_length() - 1
+        if block.is_allocated:
+            assert block.position not in memory.free_lists[order]
+            assert block.size == 1 << memory.order_for(block.allocated_job.size)
+        else:
+            assert memory.free_lists[order][block.position] is block
+            # A free block never sits next to its free buddy
+            if order < memory.max_order:
+                assert block.position ^ block.size not in memory.free_lists[order]
+    assert address == memory.total_size
+    free = [block.size for block in memory if not block.is_allocated]
+    assert sum(len(free_list) for free_list in memory.free_lists) == len(free)
+    assert memory.metrics.total_free == sum(free)
+    assert memory.largest_free_size() == max(free, default=0)
+
+
+@pytest.mark.parametrize("total_size", [1 << 16, 50000, 100000])
+def test_splits_and_merges_keep_the_invariants(total_size):
+    rng = random.Random(total_size)
+    memory = BuddyMemory(total_size)
+    initial = [(block.position, block.size) for block in memory]
+    running = []
+    for job_id in range(2000):
+        if running and rng.random() < 0.45:
+            release_block(running.pop(rng.randrange(len(running))).allocated_block)
+        else:
+            job = Job(job_id, 0, rng.choice((rng.randint(1, 200), rng.randint(200, 9000))), 1)
+            if buddy_system(job, memory):
+                running.append(job)
+        check_invariants(memory)
+
+    for job in running:
+        release_block(job.allocated_block)
+    check_invariants(memory)
+    assert [(block.position, block.size) for block in memory] == initial
+    assert memory.splits == memory.merges
+
+
+def test_initialised_as_a_block_table():
+    memory = BuddyMemory(10000)
+    # Everything BlockTable.__init__ sets up, over blocks the buddy system tracks itself
+    assert set(vars(BlockTable())) <= set(vars(memory))
+    assert [block.size for block in memory] == [8192, 1024, 512, 256]
+    assert memory.metrics.total_free == memory.total_size == 9984
+    assert memory.largest_block_size == 8192
@@ -0,0 +1,80 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from mp3 import first_fit
+from mp3_cluster import Placement, node_capacity, simulate_cluster
+
+
+def place_all(placement, jobs):
+    return [placement.place(*job) for job in jobs]
+
+
+@pytest.mark.parametrize("policy, sizes, nodes, free", [
+    # No node holds the last job, so it falls back to the least-loaded node and fills it
+    ("first-fit", [60, 50, 30, 45, 80, 90], [0, 1, 0, 1, 2, 2], [10, 5, 0]),
+    ("best-fit", [60, 30, 50, 50, 20, 95], [0, 0, 1, 1, 2, 2], [10, 0, 0]),
+    ("least-loaded", [60, 10, 10, 10, 95], [0, 1, 2, 1, 2], [40, 80, 0]),
+])
+def test_placement_policies(policy, sizes, nodes, free):
+    placement = Placement(policy, 3, 100)
+    assert place_all(placement, [(0, size, 10) for size in sizes]) == nodes
+    assert placement.free == free
+    assert placement.overflows == 1
+
+
+def test_two_choices_takes_the_roomier_node():
+    placement = Placement("two-choices", 4, 100, seed=3)
+    rng = random.Random(3)
+    free = [100] * 4
+    for size in [70, 40, 40, 90, 20, 60, 30]:
+        a, b = rng.randrange(4), rng.randrange(4)
+        expected = a if free[a] >= free[b] else b
+        assert placement.place(0, size, 10) == expected
+        free[expected] -= min(size, free[expected])
+        assert placement.free == free
+
+
+@pytest.mark.parametrize("policy", ["first-fit", "best-fit", "least-loaded", "two-choices"])
+def test_free_memory_stays_within_the_node(policy):
+    placement = Placement(policy, 5, 100, seed=1)
+    rng = random.Random(1)
+    for arrival in range(300):
+        placement.place(arrival // 4, rng.randint(1, 150), rng.randint(1, 8))
+        assert all(0 <= free <= 100 for free in placement.free)
+    placement.release_until(10 ** 6)
+    assert placement.free == [100] * 5
+    if policy != "two-choices":
+        assert sorted(placement.by_room or []) == (placement.by_room or [])
+
+
+def test_placement_frees_finished_jobs():
+    placement = Placement("first-fit", 2, 100)
+    assert place_all(placement, [(0, 80, 5), (0, 80, 5), (5, 80, 5)]) == [0, 1, 0]
+    assert placement.overflows == 0
+
+
+def cluster_jobs(count, size):
+    return [(i + 1, i // 4, size, 3 + i % 5) for i in range(count)]
+
+
+def test_simulate_cluster_runs_every_job():
+    jobs = cluster_jobs(40, 2000)
+    result = simulate_cluster(jobs, 3, "least-loaded")
+    assert result["jobs_completed"] == len(jobs)
+    assert sum(s["jobs"] for s in result["node_summaries"]) == len(jobs)
+    assert result["overflow_placements"] == 0
+    assert 0.0 < result["avg_utilisation"] <= 1.0
+
+
+@pytest.mark.parametrize("kind", ["fixed", "variable", "buddy"])
+def test_simulate_cluster_with_an_executor_matches_without(kind):
+    jobs = cluster_jobs(60, node_capacity(1) // 6)
+    serial = simulate_cluster(jobs, 4, "best-fit", kind, strategy=first_fit)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = simulate_cluster(jobs, 4, "best-fit", kind, strategy=first_fit, executor=executor)
+    serial.pop("placement_us")
+    parallel.pop("placement_us")
+    assert parallel == serial
+    assert serial["jobs_completed"] == len(jobs)
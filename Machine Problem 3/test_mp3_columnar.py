@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from mp3 import Job, MemoryBlock, WaitingQueue, first_fit, best_fit, worst_fit, run_simulation
+from mp3_columnar import JobColumns, run_columnar, synthetic_workload
+from mp3_log import SILENT
+
+
+def random_workload(seed):
+    rng = random.Random(seed)
+    blocks = [(i + 1, rng.randint(500, 10000)) for i in range(rng.randint(1, 12))]
+    arrival = 0
+    jobs = []
+    for i in range(rng.randint(1, 80)):
+        arrival += rng.choice((0, 0, 1, 4))
+        jobs.append((i + 1, arrival, rng.randint(100, 11000), rng.randint(1, 10)))
+    return jobs, blocks
+
+
+def job_times(jobs):
+    return [(job.id, job.start_time, job.finish_time, job.waiting_time) for job in jobs]
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+@pytest.mark.parametrize("policy", WaitingQueue.POLICIES)
+@pytest.mark.parametrize("strategy", [first_fit, best_fit, worst_fit])
+def test_columnar_run_matches_run_simulation(strategy, policy, event_driven):
+    for jobs, blocks in [synthetic_workload(20, 200, 50)] + [random_workload(seed) for seed in range(5)]:
+        objects = [Job(*job) for job in jobs]
+        expected = run_simulation(objects, [MemoryBlock(*block) for block in blocks], strategy, event_driven,
+                                  policy, log=SILENT)
+        columns = JobColumns(jobs)
+        assert run_columnar(columns, blocks, strategy, event_driven, policy, log=SILENT) == expected
+        assert job_times(columns[i] for i in range(len(columns))) == job_times(objects)
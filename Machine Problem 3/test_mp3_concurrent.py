@@ -0,0 +1,83 @@
+import sys
+import threading
+
+import pytest
+
+from mp3 import first_fit, best_fit, worst_fit
+from mp3_concurrent import make_allocator, stress, stress_blocks, worker
+
+
+@pytest.fixture
+def frequent_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize("scheme", ["global", "striped", "size-class"])
+@pytest.mark.parametrize("strategy", [first_fit, best_fit, worst_fit])
+def test_no_block_is_handed_to_two_jobs(scheme, strategy, frequent_switches):
+    threads = 4
+    memory_blocks = stress_blocks(3)
+    allocator = make_allocator(scheme, memory_blocks, threads)
+    owners = {}  # Block id -> job holding it
+    guard = threading.Lock()
+    calls = []
+
+    def checked_strategy(job, table):
+        # Runs under the table's lock
+        calls.append(None)
+        if not strategy(job, table):
+            return False
+        with guard:
+            assert job.allocated_block.id not in owners
+            owners[job.allocated_block.id] = job
+        return True
+
+    release = allocator.release
+
+    def checked_release(block):
+        with guard:
+            assert owners.pop(block.id).allocated_block is block
+        release(block)
+
+    allocator.release = checked_release
+    barrier = threading.Barrier(threads)
+    counts = []
+    workers = [threading.Thread(target=worker, args=(allocator, checked_strategy, 500, i, i, 4, barrier, counts))
+               for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert len(counts) == threads
+    assert owners == {}
+    assert all(not block.is_allocated for block in memory_blocks)
+    for table in allocator.tables:
+        assert len(table.free_blocks) == len(table)
+    allocated = sum(a for a, f in counts)
+    assert sum(a + f for a, f in counts) == threads * 500
+    # One acquisition per strategy call and one per release
+    acquisitions, contended, _ = allocator.lock_statistics()
+    assert acquisitions == len(calls) + allocated
+    assert contended <= acquisitions
+
+
+def test_stress_reports_every_operation():
+    result = stress("striped", first_fit, 3, copies=2, operations=300)
+    assert result["allocations"] + result["failed_allocations"] == 3 * 300
+    assert result["lock_acquisitions"] >= 2 * result["allocations"]
+    assert 0.0 <= result["contention_rate"] <= 1.0
+
+
+@pytest.mark.parametrize("threads", [1, 2, 3, 4, 8])
+def test_striped_homes_are_spread_over_all_stripes(threads):
+    allocator = make_allocator("striped", stress_blocks(10), threads)
+    stripes = len(allocator.tables)
+    assert stripes == 2 * threads
+    homes = [allocator.home(i, threads) for i in range(threads)]
+    assert len(set(homes)) == threads
+    # Every other stripe, from the first to the second last
+    assert homes == list(range(0, stripes, 2))
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from mp3 import first_fit, initialize_memory_blocks
+from mp3_layout import LayoutOptimizer
+
+HAND_PICKED = tuple(block.size for block in initialize_memory_blocks())
+
+
+class CountingExecutor:
+    """
+    Runs map() in this process and counts the layouts it simulates.
+    """
+    def __init__(self):
+        self.simulated = []
+
+    def map(self, function, layouts, *arguments):
+        layouts = list(layouts)
+        self.simulated.extend(layouts)
+        return map(function, layouts, *arguments)
+
+
+@pytest.mark.parametrize("granularity", [300, 500, 1000])
+def test_snapped_layouts_are_on_the_grid_and_within_budget(granularity):
+    optimizer = LayoutOptimizer(first_fit, None, granularity=granularity)
+    layout = optimizer.snap(HAND_PICKED)
+    assert len(layout) == len(HAND_PICKED)
+    assert all(size % granularity == 0 and size > 0 for size in layout)
+    assert sum(layout) <= optimizer.budget
+    assert optimizer.snap(layout) == layout
+
+
+def test_snap_fits_a_tight_budget():
+    optimizer = LayoutOptimizer(first_fit, None, budget=1000, granularity=300)
+    assert optimizer.snap((400, 400, 400)) == (300, 300, 300)
+    assert optimizer.snap((400, 400, 400, 400)) == (300, 300, 300)
+
+
+@pytest.mark.parametrize("granularity", [300, 500])
+def test_neighbours_stay_on_the_grid_and_within_budget(granularity):
+    optimizer = LayoutOptimizer(first_fit, None, granularity=granularity)
+    rng = random.Random(0)
+    layout = optimizer.snap(HAND_PICKED)
+    for _ in range(50):
+        moves = optimizer.neighbours(layout)
+        assert moves
+        for move in moves:
+            assert all(size % granularity == 0 and size > 0 for size in move)
+            assert sum(move) <= optimizer.budget
+        layout = rng.choice(moves)
+
+
+def test_cache_prevents_resimulation():
+    executor = CountingExecutor()
+    optimizer = LayoutOptimizer(first_fit, executor, granularity=1000)
+    start = optimizer.snap(HAND_PICKED)
+    first = optimizer.local_search(start, max_steps=2)
+    simulated = len(executor.simulated)
+    assert simulated == len(set(executor.simulated)) == len(optimizer.results)
+
+    assert optimizer.local_search(start, max_steps=2) == first
+    assert optimizer.evaluate([start, start]) == [optimizer.evaluate([start])[0]] * 2
+    assert len(executor.simulated) == simulated
@@ -0,0 +1,25 @@
+import io
+
+import pytest
+
+from mp3 import initialize_jobs, initialize_memory_blocks, first_fit, run_simulation
+from mp3_log import EventLog, SUMMARY, STATUS, JsonlSink, read_event_log
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_jsonl_sink_skips_status_below_status_level(tmp_path, event_driven):
+    filename = str(tmp_path / "run.jsonl")
+    result = run_simulation(initialize_jobs(), initialize_memory_blocks(), first_fit, event_driven,
+                            log=EventLog(SUMMARY, sink=JsonlSink(filename), stream=io.StringIO()))
+    records = list(read_event_log(filename))
+    kinds = {record["event"] for record in records}
+    assert "status" not in kinds
+    assert "allocated" in kinds or "arrived_allocated" in kinds
+    assert records[-1] == {"event": "summary", **result}
+
+
+def test_jsonl_sink_records_status_at_status_level(tmp_path):
+    filename = str(tmp_path / "run.jsonl")
+    run_simulation(initialize_jobs(), initialize_memory_blocks(), first_fit,
+                   log=EventLog(STATUS, sink=JsonlSink(filename), stream=io.StringIO()))
+    assert any(record["event"] == "status" for record in read_event_log(filename))
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from mp3_metrics import FreeSpaceMetrics
+
+
+def test_largest_free_matches_the_free_sizes_and_the_heap_stays_small():
+    rng = random.Random(0)
+    metrics = FreeSpaceMetrics()
+    free = []
+    for _ in range(20000):
+        if free and rng.random() < 0.5:
+            metrics.remove(free.pop(rng.randrange(len(free))))
+        else:
+            size = rng.randint(1, 10 ** 6)
+            free.append(size)
+            metrics.add(size)
+        if rng.random() < 0.1:
+            assert metrics.largest_free() == max(free, default=0)
+        assert len(metrics.largest_sizes) <= 2 * len(metrics.size_counts) + 1
+        assert metrics.in_heap == {-size for size in metrics.largest_sizes}
+    assert metrics.total_free == sum(free)
+
+
+def test_statistics_report_the_histogram_from_the_fragmentation_peak():
+    metrics = FreeSpaceMetrics()
+    metrics.add(1000)
+    metrics.sample(0)
+    # 100 and 900 free: index 0.1 from 1 to 3
+    metrics.remove(1000)
+    metrics.add(100)
+    metrics.add(900)
+    metrics.sample(1)
+    # Less fragmented again, so the peak keeps the histogram from time 1
+    metrics.remove(100)
+    metrics.sample(3)
+    statistics = metrics.statistics(4)
+    assert statistics["peak_fragmentation_index"] == pytest.approx(0.1)
+    assert statistics["avg_fragmentation_index"] == pytest.approx(0.1 * 2 / 4)
+    assert statistics["free_blocks_at_peak_fragmentation"] == [
+        {"min_size": 64, "max_size": 127, "count": 1},
+        {"min_size": 512, "max_size": 1023, "count": 1}
+    ]
+    assert metrics.size_histogram() == [{"min_size": 512, "max_size": 1023, "count": 1}]
@@ -0,0 +1,65 @@
+import random
+from collections import OrderedDict
+
+import pytest
+
+from mp3_mrc import (curve_sizes, lru_stack_distances, miss_ratio_curve, next_use_index, opt_miss_ratios, opt_misses,
+                    opt_stack_distances)
+
+
+def lru_misses(pages, frame_count):
+    resident = OrderedDict()
+    misses = 0
+    for page in pages:
+        if page in resident:
+            resident.move_to_end(page)
+        else:
+            misses += 1
+            if len(resident) >= frame_count:
+                resident.popitem(last=False)
+            resident[page] = True
+    return misses
+
+
+def random_pages(seed):
+    rng = random.Random(seed)
+    distinct = rng.randint(1, 30)
+    return [rng.randrange(distinct) for _ in range(rng.randint(1, 400))], distinct
+
+
+@pytest.mark.parametrize("distances, simulate", [(lru_stack_distances, lru_misses),
+                                                 (opt_stack_distances, opt_misses)])
+def test_stack_distances_match_simulation(distances, simulate):
+    for seed in range(30):
+        pages, distinct = random_pages(seed)
+        histogram, cold_misses = distances(pages)
+        assert cold_misses == len(set(pages))
+        curve = miss_ratio_curve(histogram, cold_misses, len(pages))
+        for frames in range(1, distinct + 2):
+            assert round(curve[min(frames, len(curve) - 1)] * len(pages)) == simulate(pages, frames)
+
+
+def test_opt_miss_ratios_match_the_curve():
+    pages, distinct = random_pages(7)
+    histogram, cold_misses = opt_stack_distances(pages)
+    curve = miss_ratio_curve(histogram, cold_misses, len(pages))
+    ratios = opt_miss_ratios(pages, [1, 2, distinct // 2 + 1, distinct + 5])
+    assert ratios == {frames: pytest.approx(curve[min(frames, len(curve) - 1)]) for frames in ratios}
+
+
+def test_traces_without_reuse():
+    pages = list(range(25000))
+    assert opt_misses(pages, 0) == len(pages)
+    histogram, cold_misses = lru_stack_distances(pages)
+    curve = miss_ratio_curve(histogram, cold_misses, len(pages))
+    sizes = curve_sizes(len(curve) - 1)
+    assert sizes == [1]
+    assert opt_miss_ratios(pages, sizes) == {1: 1.0}
+
+
+def test_empty_trace_has_an_all_zero_curve():
+    lru_histogram, cold_misses = lru_stack_distances([])
+    opt_histogram, _ = opt_stack_distances([], next_use_index([]))
+    assert miss_ratio_curve(lru_histogram, cold_misses, 0) == [0.0] * len(lru_histogram)
+    assert miss_ratio_curve(opt_histogram, cold_misses, 0) == [0.0] * len(opt_histogram)
+    assert opt_miss_ratios([], curve_sizes(0)) == {1: 0.0}
@@ -0,0 +1,75 @@
+import pytest
+
+import mp3_paging
+from mp3_paging import PAGE_BITS, POLICIES, PagingSimulator, read_references, write_references
+
+# The textbook reference string; with 3 frames FIFO and LRU fault 9 and 10 times
+REFERENCE_STRING = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+
+def faults(policy, pages, capacity):
+    cache = POLICIES[policy](capacity)
+    return sum(not cache.access(page) for page in pages)
+
+
+@pytest.mark.parametrize("policy, expected", [("FIFO", 9), ("LRU", 10), ("Clock", 9), ("ARC", 10)])
+def test_policies_fault_as_computed_by_hand(policy, expected):
+    assert faults(policy, REFERENCE_STRING, 3) == expected
+
+
+def test_fifo_belady_anomaly():
+    assert faults("FIFO", REFERENCE_STRING, 4) == 10
+
+
+def test_arc_adapts_towards_the_ghost_hit():
+    arc = POLICIES["ARC"](3)
+    for page in REFERENCE_STRING:
+        arc.access(page)
+    # The hit on 5 in B1 grew T1's target and pushed 1 out of T2
+    assert arc.p == 1
+    assert list(arc.t1) == [4] and list(arc.t2) == [2, 5]
+    assert list(arc.b1) == [3] and list(arc.b2) == [1]
+    assert len(arc.t1) + len(arc.t2) <= arc.capacity
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_simulator_counts_match_the_policy(policy):
+    references = [(1, page * mp3_paging.PAGE_SIZE) for page in REFERENCE_STRING]
+    report = PagingSimulator(3, policy).run(references)
+    assert report["references"] == len(REFERENCE_STRING)
+    assert report["page_faults"] == faults(policy, REFERENCE_STRING, 3)
+
+
+def test_eviction_shoots_down_the_tlb_entry():
+    simulator = PagingSimulator(1, "LRU", tlb_size=4, page_size=256)
+    simulator.run([(1, 0), (2, 0)])
+    evicted = (1 << PAGE_BITS) | 0
+    assert evicted not in simulator.tlb
+    assert simulator.page_tables[1].entries == {}
+    assert simulator.page_tables[2].entries == {0: 0}
+    # The evicted page faults again instead of hitting a stale translation
+    report = simulator.run([(1, 0)])
+    assert report["page_faults"] == 3
+    assert report["tlb_hit_ratio"] == 0.0
+    for page in simulator.tlb:
+        assert page & ((1 << PAGE_BITS) - 1) in simulator.page_tables[page >> PAGE_BITS].entries
+
+
+def test_reference_trace_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(mp3_paging, "RECORDS_PER_READ", 3)
+    references = [(job_id, job_id * 1000 + offset) for job_id in range(1, 4) for offset in range(4)]
+    references.append((2 ** 32 - 1, 2 ** 64 - 1))
+    trace = tmp_path / "references.bin"
+    write_references(trace, references)
+    assert list(read_references(trace)) == references
+
+    write_references(trace, [])
+    assert list(read_references(trace)) == []
+
+
+@pytest.mark.parametrize("contents", [b"", b"MP", b"XXXX" + bytes(12)])
+def test_reading_something_else_raises(tmp_path, contents):
+    trace = tmp_path / "other.bin"
+    trace.write_bytes(contents)
+    with pytest.raises(ValueError):
+        list(read_references(trace))
@@ -0,0 +1,101 @@
+import io
+import random
+
+import pytest
+
+from mp3 import Job, run_simulation
+from mp3_log import EventLog, SILENT, SUMMARY
+from mp3_slab import SlabMemory, slab_allocation, slab_layout
+
+
+def test_layout_fits_the_memory():
+    for seed in range(200):
+        rng = random.Random(seed)
+        jobs = [Job(i, 0, rng.choice((rng.randint(1, 100), rng.randint(1000, 20000))), rng.randint(1, 20))
+                for i in range(rng.randint(1, 40))]
+        class_sizes = sorted({job.size for job in jobs})[:rng.randint(1, 5)]
+        total_size = sum(class_sizes) + rng.randint(0, 50000)
+        layout = slab_layout(jobs, total_size, class_sizes=class_sizes)
+        assert [size for size, _ in layout] == class_sizes
+        assert all(count >= 1 for _, count in layout)
+        assert sum(size * count for size, count in layout) <= total_size
+        # Whatever is left is smaller than the smallest class
+        assert total_size - sum(size * count for size, count in layout) < class_sizes[0]
+
+
+def test_layout_rejects_memory_too_small_for_one_slot_each():
+    with pytest.raises(ValueError):
+        slab_layout([Job(1, 0, 500, 5)], 1000, class_sizes=[600, 700])
+
+
+def run_slab(jobs, layout, spill, event_driven):
+    memory = SlabMemory(layout, spill=spill)
+    jobs = [Job(*job) for job in jobs]
+    result = run_simulation(jobs, memory, slab_allocation, event_driven, log=SILENT)
+    rounded = {name: round(value, 9) if isinstance(value, float) else value for name, value in result.items()}
+    return memory, rounded, sorted((job.id, job.start_time, job.finish_time) for job in jobs)
+
+
+# Two 1000-byte slots and one 4000-byte slot.  Job 3 finds its class full:
+# with spilling it takes the 4000-byte slot, which job 4 then waits for;
+# without, it waits for a 1000-byte slot and job 4 starts on arrival.
+SLAB_JOBS = [(1, 0, 800, 5), (2, 0, 900, 5), (3, 0, 700, 3), (4, 1, 3500, 2)]
+
+
+@pytest.mark.parametrize("spill, spilled, wasted, schedule", [
+    (True, 1, [100 + 200, 3300 + 500], [(1, 0, 5), (2, 0, 5), (3, 0, 3), (4, 3, 5)]),
+    (False, 0, [100 + 200 + 300, 500], [(1, 0, 5), (2, 0, 5), (3, 5, 8), (4, 1, 3)]),
+])
+def test_slab_simulation(spill, spilled, wasted, schedule):
+    memory, result, jobs = run_slab(SLAB_JOBS, [(1000, 2), (4000, 1)], spill, False)
+    assert jobs == schedule
+    assert [size_class.in_use for size_class in memory.classes] == [0, 0]
+    assert [size_class.wasted_bytes for size_class in memory.classes] == wasted
+    assert result["spilled_allocations"] == spilled
+
+    event_memory, event_result, event_jobs = run_slab(SLAB_JOBS, [(1000, 2), (4000, 1)], spill, True)
+    assert (event_result, event_jobs) == (result, jobs)
+
+
+@pytest.mark.parametrize("spill", [True, False])
+def test_slab_tick_and_event_runs_agree(spill):
+    for seed in range(10):
+        rng = random.Random(seed)
+        arrival = 0
+        jobs = []
+        for i in range(40):
+            arrival += rng.choice((0, 0, 1, 2))
+            jobs.append((i + 1, arrival, rng.randint(100, 5000), rng.randint(1, 10)))
+        layout = slab_layout([Job(*job) for job in jobs], 20000, class_sizes=[1000, 2500, 5000])
+        memory, result, schedule = run_slab(jobs, layout, spill, False)
+        assert all(size_class.in_use == 0 for size_class in memory.classes)
+        assert run_slab(jobs, layout, spill, True)[1:] == (result, schedule)
+
+
+def test_statistics_report_each_class_without_advancing():
+    memory, result, _ = run_slab(SLAB_JOBS, [(1000, 2), (4000, 1)], True, False)
+    # Every slot is busy from 0 to 5 of a run that ends at 6: job 3 spilled
+    # into the 4000-byte slot at 0 and job 4 held it from 3 to 5
+    assert result["size_classes"] == [
+        {"size": 1000, "slots": 2, "allocations": 2, "peak_in_use": 2, "occupancy": pytest.approx(5 / 6), "avg_waste": 150.0},
+        {"size": 4000, "slots": 1, "allocations": 2, "peak_in_use": 1, "occupancy": pytest.approx(5 / 6), "avg_waste": 1900.0}
+    ]
+    samples = memory.metrics.times[:]
+    areas = [size_class.occupancy_area for size_class in memory.classes]
+    memory.statistics(memory.last_time)
+    memory.statistics(memory.last_time)
+    assert memory.metrics.times == samples
+    assert [size_class.occupancy_area for size_class in memory.classes] == areas
+
+
+def test_summary_prints_one_row_per_class():
+    stream = io.StringIO()
+    run_simulation([Job(*job) for job in SLAB_JOBS], SlabMemory([(1000, 2), (4000, 1)]), slab_allocation,
+                   log=EventLog(SUMMARY, stream=stream))
+    summary = stream.getvalue().splitlines()
+    rows = summary[summary.index("Size classes:") + 1:]
+    assert rows[:2] == [
+        "  size 1000, slots 2, allocations 2, peak in use 2, occupancy 0.8333, avg waste 150.0000",
+        "  size 4000, slots 1, allocations 2, peak in use 1, occupancy 0.8333, avg waste 1900.0000"
+    ]
+    assert not any("[{" in line for line in summary)
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from mp3 import REJECTED_SAMPLE_SIZE, Job, MemoryBlock, MemorySimulation, first_fit, initialize_memory_blocks
+from mp3_log import EventLog, SUMMARY
+from mp3_trace import (JOB_MAGIC, JOB_RECORD, JobTrace, load_jobs, load_memory_blocks, write_jobs,
+                       write_memory_blocks)
+
+JOBS = [Job(1, 0, 500, 3), Job(2, 0, 20000, 1), Job(3, 2, 4000, 7), Job(4, 9, 1, 2 ** 31)]
+BLOCKS = [MemoryBlock(1, 9500), MemoryBlock(2, 7000), MemoryBlock(3, 1)]
+
+
+def job_rows(jobs):
+    return [(job.id, job.arrival_time, job.size, job.execution_time) for job in jobs]
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl", "bin"])
+def test_traces_round_trip(tmp_path, extension):
+    job_file = str(tmp_path / f"jobs.{extension}")
+    block_file = str(tmp_path / f"blocks.{extension}")
+    write_jobs(job_file, JOBS)
+    write_memory_blocks(block_file, BLOCKS)
+    assert job_rows(load_jobs(job_file)) == job_rows(JOBS)
+    assert [(block.id, block.size) for block in load_memory_blocks(block_file)] == [(1, 9500), (2, 7000), (3, 1)]
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl", "bin"])
+def test_out_of_order_arrivals_are_rejected(tmp_path, extension):
+    filename = str(tmp_path / f"jobs.{extension}")
+    write_jobs(filename, [Job(1, 0, 100, 1), Job(2, 5, 100, 1), Job(3, 4, 100, 1)])
+    jobs = load_jobs(filename)
+    # The jobs before the late one are still delivered
+    assert [next(jobs).id, next(jobs).id] == [1, 2]
+    with pytest.raises(ValueError, match="job 3 arrives at 4"):
+        next(jobs)
+
+
+def test_binary_trace_with_a_partial_record(tmp_path):
+    filename = tmp_path / "jobs.bin"
+    filename.write_bytes(JOB_MAGIC + JOB_RECORD.pack(1, 0, 100, 1) + JOB_RECORD.pack(2, 1, 100, 1)[:-3])
+    with pytest.raises(ValueError, match="partial record"):
+        list(load_jobs(str(filename)))
+
+
+def test_binary_trace_with_the_wrong_magic(tmp_path):
+    job_file = str(tmp_path / "jobs.bin")
+    write_jobs(job_file, JOBS)
+    # A job trace is not a partition trace
+    with pytest.raises(ValueError, match="not a MP3B trace"):
+        load_memory_blocks(job_file)
+    (tmp_path / "empty.bin").write_bytes(b"")
+    with pytest.raises(ValueError, match="not a MP3J trace"):
+        list(load_jobs(str(tmp_path / "empty.bin")))
+
+
+def test_job_trace_streams_and_keeps_a_sample_of_the_rejected_jobs(tmp_path):
+    filename = str(tmp_path / "jobs.bin")
+    # Every other job is larger than any partition
+    write_jobs(filename, (Job(i + 1, i // 10, 20000 if i % 2 else 500, 1) for i in range(1000)))
+    trace = JobTrace(filename)
+    # Each iteration reads the file again from the start
+    assert job_rows(trace) == job_rows(trace)
+
+    stream = io.StringIO()
+    simulation = MemorySimulation(trace, initialize_memory_blocks(), first_fit, log=EventLog(SUMMARY, stream=stream))
+    result = simulation.run()
+    assert result["jobs_completed"] == 500
+    assert len(simulation.completed_jobs) == 500
+    assert len(simulation.never_allocated_jobs) == 500
+    shown = list(range(2, 2 * REJECTED_SAMPLE_SIZE + 1, 2))
+    assert [job.id for job in simulation.never_allocated_jobs] == shown
+    simulation.log.flush()
+    assert f"Jobs that could never be allocated: {shown} and {500 - REJECTED_SAMPLE_SIZE} more" in stream.getvalue()
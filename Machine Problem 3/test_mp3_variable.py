@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from mp3 import Job, first_fit, best_fit, worst_fit, release_block, run_simulation
+from mp3_log import SILENT
+from mp3_variable import CompactingMemory, VariablePartitionMemory, next_fit, total_memory_size
+
+
+def random_jobs(seed, count=60):
+    rng = random.Random(seed)
+    arrival = 0
+    jobs = []
+    for i in range(count):
+        arrival += rng.choice((0, 0, 1, 2))
+        jobs.append((i + 1, arrival, rng.randint(200, 9000), rng.randint(1, 12)))
+    return jobs
+
+
+def run(jobs, memory, strategy, event_driven, policy="fifo"):
+    jobs = [Job(*job) for job in jobs]
+    result = run_simulation(jobs, memory, strategy, event_driven, policy, log=SILENT)
+    rounded = {name: round(value, 9) if isinstance(value, float) else value for name, value in result.items()}
+    return rounded, sorted((job.id, job.start_time, job.finish_time, job.waiting_time) for job in jobs)
+
+
+@pytest.mark.parametrize("strategy", [first_fit, best_fit, worst_fit, next_fit])
+def test_variable_partitions_tick_and_event_runs_agree(strategy):
+    for seed in range(4):
+        jobs = random_jobs(seed)
+        assert run(jobs, VariablePartitionMemory(total_memory_size() // 2), strategy, False) == \
+            run(jobs, VariablePartitionMemory(total_memory_size() // 2), strategy, True)
+
+
+@pytest.mark.parametrize("triggers", [{"period": 3}, {"period": 7}, {"threshold": 0.3},
+                                      {"threshold": 0.6, "period": 5}, {"on_failure": True, "period": 4},
+                                      {"on_failure": True, "charge_cost": True},
+                                      {"period": 3, "charge_cost": True, "bytes_per_time_unit": 2000},
+                                      {"threshold": 0.3, "on_failure": True, "charge_cost": True}])
+@pytest.mark.parametrize("policy", ["fifo", "sjf", "backfill"])
+def test_compaction_tick_and_event_runs_agree(triggers, policy):
+    for seed in range(4):
+        jobs = random_jobs(seed)
+        for strategy in (first_fit, best_fit, worst_fit, next_fit):
+            ticks = run(jobs, CompactingMemory(total_memory_size() // 2, **triggers), strategy, False, policy)
+            events = run(jobs, CompactingMemory(total_memory_size() // 2, **triggers), strategy, True, policy)
+            assert ticks == events
+            assert ticks[0]["compactions"] > 0
+
+
+def test_statistics_do_not_compact():
+    memory = CompactingMemory(total_memory_size(), period=1)
+    run_simulation([Job(*job) for job in random_jobs(0)], memory, first_fit, log=SILENT)
+    compactions, moved = memory.compactions, memory.bytes_moved
+    memory.statistics(10 ** 6)
+    assert (memory.compactions, memory.bytes_moved) == (compactions, moved)
+
+
+def test_compaction_leaves_one_hole_at_the_top():
+    memory = CompactingMemory(10000)
+    jobs = [Job(i, 0, 1000, 5) for i in range(1, 9)]
+    for job in jobs:
+        assert first_fit(job, memory)
+    for job in jobs[::2]:
+        release_block(job.allocated_block)
+    assert len(memory.holes) == 5
+
+    memory.compact()
+    assert len(memory.holes) == 1
+    assert memory.free_size == 6000
+    assert [block.position for block in memory if block.is_allocated] == [0, 1000, 2000, 3000]
+    assert memory.bytes_moved == 4000  # Every partition in use sat above a hole
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_charged_compaction_delays_the_job_it_makes_room_for(event_driven):
+    # Jobs 1 and 3 leave two 1000-byte holes at time 2; job 5 needs both, so
+    # compaction moves jobs 2 and 4 (2000 bytes, 2 time units at 1000 per unit)
+    jobs = [(1, 0, 1000, 2), (2, 0, 1000, 10), (3, 0, 1000, 2), (4, 0, 1000, 10), (5, 2, 2000, 3)]
+    free = run(jobs, CompactingMemory(4000, on_failure=True, bytes_per_time_unit=1000), first_fit, event_driven)
+    charged = run(jobs, CompactingMemory(4000, on_failure=True, bytes_per_time_unit=1000, charge_cost=True),
+                  first_fit, event_driven)
+
+    assert free[1][4] == (5, 2, 5, 0)
+    assert charged[1][4] == (5, 4, 7, 2)
+    assert charged[1][:4] == free[1][:4]
+    assert (free[0]["compaction_bytes_moved"], charged[0]["compaction_bytes_moved"]) == (2000, 2000)
+    assert (free[0]["compaction_stall_time"], charged[0]["compaction_stall_time"]) == (0, 2)
+
+
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_jobs_placed_after_a_release_are_not_unblocked_by_compaction(event_driven):
+    # Job 5 only fits once compaction gathers the two holes; job 6 is as large
+    # but arrives after job 5 released the gathered hole, so no compaction made its room
+    jobs = [(1, 0, 1000, 2), (2, 0, 1000, 20), (3, 0, 1000, 2), (4, 0, 1000, 20), (5, 2, 2000, 3),
+            (6, 6, 2000, 3)]
+    result, schedule = run(jobs, CompactingMemory(4000, on_failure=True), first_fit, event_driven)
+    assert schedule[4][:2] == (5, 2) and schedule[5][:2] == (6, 6)
+    assert result["compactions"] == 1
+    assert result["unblocked_jobs"] == 1
+
+
+def test_next_fit_resumes_after_the_last_allocation_and_wraps():
+    memory = VariablePartitionMemory(10000)
+    assert memory.free_blocks == [(10000, 0)]
+    jobs = [Job(1, 0, 1000, 5), Job(2, 0, 1000, 5), Job(3, 0, 2000, 5), Job(4, 0, 500, 5), Job(5, 0, 600, 5)]
+    for job in jobs[:3]:
+        assert next_fit(job, memory)
+    release_block(jobs[0].allocated_block)
+    # The hole at 0 comes before the roving pointer at 4000
+    assert next_fit(jobs[3], memory)
+    assert jobs[3].allocated_block.position == 4000
+    release_block(jobs[1].allocated_block)
+    memory.roving_address = 10000  # As if the last allocation ended at the top
+    assert next_fit(jobs[4], memory)
+    assert jobs[4].allocated_block.position == 0
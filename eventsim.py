@@ -0,0 +1,118 @@
+"""
+Shared discrete-event simulation kernel for the machine problems.
+
+Instead of advancing the clock one unit per loop iteration, simulators put
+timed events on a heap-ordered calendar and the kernel jumps straight from
+one event time to the next.  Events with the same time run in (priority,
+scheduling order), so runs are deterministic.
+
+Every Machine Problem folder has an eventsim.py symbolic link to this file,
+so its scripts and tests import the kernel like a module of their own.
+"""
+import heapq
+import time
+
+
+class Timer:
+    """
+    A scheduled event.  Keep the returned timer to cancel it later.
+    """
+    __slots__ = ("time", "priority", "sequence", "action", "args", "cancelled", "fired")
+
+    def __init__(self, time, priority, sequence, action, args):
+        self.time = time
+        self.priority = priority
+        self.sequence = sequence
+        self.action = action
+        self.args = args
+        self.cancelled = False
+        self.fired = False
+
+
+class EventKernel:
+    """
+    Heap-based event calendar with cancellable timers.
+    """
+    def __init__(self, start_time=0):
+        self.now = start_time
+        self.calendar = []
+        self.sequence = 0
+        self.processed = 0
+        self.cancelled = 0
+        self.elapsed = 0.0
+
+    def schedule(self, time, action, *args, priority=0):
+        """
+        Schedule action(*args) at an absolute time and return its Timer.
+        Lower priority values run first among events at the same time.
+        """
+        if time < self.now:
+            raise ValueError(f"Cannot schedule an event at {time}, the clock is already at {self.now}")
+        timer = Timer(time, priority, self.sequence, action, args)
+        self.sequence += 1
+        heapq.heappush(self.calendar, (time, priority, timer.sequence, timer))
+        return timer
+
+    def schedule_in(self, delay, action, *args, priority=0):
+        """
+        Schedule action(*args) `delay` time units from now.
+        """
+        return self.schedule(self.now + delay, action, *args, priority=priority)
+
+    def cancel(self, timer):
+        """
+        Cancel a pending timer.  It stays on the heap and is skipped when popped.
+        Cancelling a timer that already fired or was cancelled does nothing.
+        """
+        if not timer.cancelled and not timer.fired:
+            timer.cancelled = True
+            self.cancelled += 1
+
+    def peek_time(self):
+        """
+        Return the time of the next live event, or None if the calendar is empty.
+        """
+        calendar = self.calendar
+        while calendar and calendar[0][3].cancelled:
+            heapq.heappop(calendar)
+            self.cancelled -= 1
+        return calendar[0][0] if calendar else None
+
+    def __len__(self):
+        return len(self.calendar) - self.cancelled
+
+    def run(self, until=None, after_instant=None):
+        """
+        Process events in order until the calendar is empty or the next event
+        is later than `until`.  after_instant(now), if given, is called once
+        all events at a time have run, before the clock moves on.
+        """
+        started = time.perf_counter()
+        calendar = self.calendar
+        try:
+            while True:
+                next_time = self.peek_time()
+                if next_time is None or (until is not None and next_time > until):
+                    break
+                self.now = next_time
+                # Drain every event scheduled for this instant, including ones
+                # scheduled by the handlers themselves
+                while calendar and calendar[0][0] == next_time:
+                    timer = heapq.heappop(calendar)[3]
+                    if timer.cancelled:
+                        self.cancelled -= 1
+                        continue
+                    self.processed += 1
+                    timer.fired = True
+                    timer.action(*timer.args)
+                if after_instant is not None:
+                    after_instant(self.now)
+        finally:
+            self.elapsed += time.perf_counter() - started
+        return self.now
+
+    def events_per_second(self):
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self):
+        return f"{self.processed} events in {self.elapsed:.4f} s ({self.events_per_second():,.0f} events/s)"
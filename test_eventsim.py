@@ -0,0 +1,73 @@
+import pytest
+
+from eventsim import EventKernel
+
+
+def test_events_run_in_time_priority_and_scheduling_order():
+    kernel = EventKernel()
+    ran = []
+    kernel.schedule(5, ran.append, "late")
+    kernel.schedule(2, ran.append, "second", priority=1)
+    kernel.schedule(2, ran.append, "first")
+    kernel.schedule(2, ran.append, "third", priority=1)
+    kernel.schedule_in(1, ran.append, "earliest")
+    assert kernel.run() == 5
+    assert ran == ["earliest", "first", "second", "third", "late"]
+    assert kernel.processed == 5
+    with pytest.raises(ValueError):
+        kernel.schedule(4, ran.append, "past")
+
+
+def test_run_stops_before_events_after_until():
+    kernel = EventKernel()
+    ran = []
+    for time in (1, 3, 6):
+        kernel.schedule(time, ran.append, time)
+    assert kernel.run(until=5) == 3
+    assert ran == [1, 3] and len(kernel) == 1
+    kernel.run()
+    assert ran == [1, 3, 6]
+
+
+def test_cancelled_timers_are_skipped():
+    kernel = EventKernel()
+    ran = []
+    kept = kernel.schedule(1, ran.append, "kept")
+    dropped = kernel.schedule(1, ran.append, "dropped")
+    kernel.cancel(dropped)
+    assert len(kernel) == 1
+    assert kernel.peek_time() == 1
+    kernel.run()
+    assert ran == ["kept"]
+    assert kernel.cancelled == 0 and len(kernel) == 0
+    assert kept.fired and not dropped.fired
+
+
+def test_cancel_after_firing_or_cancelling_does_nothing():
+    kernel = EventKernel()
+    fired = kernel.schedule(1, lambda: None)
+    pending = kernel.schedule(2, lambda: None)
+    kernel.run(until=1)
+    kernel.cancel(fired)
+    assert kernel.cancelled == 0 and len(kernel) == 1
+
+    kernel.cancel(pending)
+    kernel.cancel(pending)
+    assert kernel.cancelled == 1 and len(kernel) == 0
+    assert kernel.peek_time() is None and kernel.cancelled == 0
+
+
+def test_after_instant_runs_once_per_time_after_every_event_at_it():
+    kernel = EventKernel()
+    log = []
+
+    def chain(name):
+        log.append(name)
+        if name == "a":
+            # Scheduled for the current instant, so it runs before after_instant
+            kernel.schedule(kernel.now, chain, "b")
+
+    kernel.schedule(1, chain, "a")
+    kernel.schedule(3, chain, "c")
+    kernel.run(after_instant=lambda now: log.append(("instant", now)))
+    assert log == ["a", "b", ("instant", 1), "c", ("instant", 3)]